@@ -1,329 +1,45 @@
 import os
-import xml.etree.ElementTree as ET
-import pandas as pd
 import json
-from jinja2 import Environment, FileSystemLoader
-import plotly.express as px
-import csv
-from datetime import datetime
-import boto3
+import time
+import hashlib
 import argparse
-from datetime import timedelta
+import traceback
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from jinja2 import Environment
+from src.utils.build_manifest import BuildManifest
+from src.utils.history_store import HistoryStore, file_digest, file_run_id, valid_metrics
+from src.utils.latency_sketch import LatencySketch, load_sketches
+from src.utils.locust_stats import read_stats, summarize_history, summarize_stats
+from src.utils.report_parsers import parse_junit, parse_robot
+
+# The dashboard is built from independent sections, one per source. Each section
+# has a collector (parse its reports, record history, build trend figures) and a
+# template. The runner checks the build manifest, runs I/O (CloudWatch fetches)
+# in a thread per section and hands collection + rendering to a process pool, so
+# the build takes as long as the slowest section rather than the sum of them.
+#
+# pandas, plotly and boto3 are imported only by the collectors that run, so a
+# no-op rebuild does not pay for them.
 
 # Paths
-pytest_xml = "reports/pytest/results.xml"
-robot_report = "reports/robot/report.html"
-robot_log = "reports/robot/log.html"
-robot_output = "reports/robot/output.xml"
-locust_csv = "reports/locust/results_stats.csv"
-cw_json = "reports/cloudwatch/coldstart.json"
-
-# History files
-robot_history_file = "reports/robot_history.csv"
-pytest_history_file = "reports/pytest_history.csv"
-locust_history_file = "reports/locust_history.csv"
-
-# Data containers
-pytest_summary = {}
-robot_summary = {}
-robot_details = []
-locust_summary = {}
-coldstart_summary = {}
-robot_chart_html = ""
-locust_chart_html = ""
-trend_robot_html = ""
-trend_pytest_html = ""
-trend_locust_html = ""
-
-# --- PyTest ---
-if os.path.exists(pytest_xml):
-    try:
-        tree = ET.parse(pytest_xml)
-        root = tree.getroot()
-        testsuite = root.find("testsuite")
-
-        if testsuite is not None:
-            pytest_summary = {
-                "tests": testsuite.attrib.get("tests", "?"),
-                "failures": testsuite.attrib.get("failures", "?"),
-                "errors": testsuite.attrib.get("errors", "?"),
-                "skipped": testsuite.attrib.get("skipped", "?"),
-            }
-
-        # Save to history
-        run_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        row = [run_time,
-               pytest_summary.get("tests", 0),
-               pytest_summary.get("failures", 0),
-               pytest_summary.get("errors", 0),
-               pytest_summary.get("skipped", 0)]
-
-        write_header = not os.path.exists(pytest_history_file)
-        with open(pytest_history_file, "a", newline="") as f:
-            writer = csv.writer(f)
-            if write_header:
-                writer.writerow(["timestamp", "tests", "failures", "errors", "skipped"])
-            writer.writerow(row)
-
-    except Exception as e:
-        pytest_summary = {"error": f"Could not parse XML: {e}"}
-
-# Build PyTest trend
-if os.path.exists(pytest_history_file):
-    df_hist = pd.read_csv(pytest_history_file)
-    if not df_hist.empty:
-        fig = px.line(df_hist, x="timestamp", y=["failures", "errors", "skipped"], markers=True,
-                      title="PyTest Trend (Failures/Errors/Skipped over time)")
-        trend_pytest_html = fig.to_html(full_html=False)
-
-# --- Robot ---
-if os.path.exists(robot_output):
-    try:
-        tree = ET.parse(robot_output)
-        root = tree.getroot()
-
-        suite = root.find(".//suite")
-        stat_el = root.find("statistics/total/stat")
-        if stat_el is not None:
-            robot_summary = {
-                "total": stat_el.attrib.get("total", "?"),
-                "pass": stat_el.attrib.get("pass", "?"),
-                "fail": stat_el.attrib.get("fail", "?")
-            }
-
-        for test in suite.findall(".//test"):
-            status_el = test.find("status")
-            robot_details.append({
-                "name": test.attrib.get("name", "Unknown"),
-                "status": status_el.attrib.get("status", "?") if status_el is not None else "?",
-                "message": (status_el.text or "").strip() if status_el is not None else ""
-            })
-
-        if robot_summary and "pass" in robot_summary and "fail" in robot_summary:
-            df_robot = pd.DataFrame({
-                "Result": ["PASS", "FAIL"],
-                "Count": [int(robot_summary["pass"]), int(robot_summary["fail"])]
-            })
-            fig_robot = px.pie(df_robot, names="Result", values="Count", title="Robot - Pass vs Fail")
-            robot_chart_html = fig_robot.to_html(full_html=False)
-
-        # Save to history
-        if robot_summary:
-            run_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            row = [run_time, robot_summary.get("total", 0),
-                   robot_summary.get("pass", 0),
-                   robot_summary.get("fail", 0)]
-            write_header = not os.path.exists(robot_history_file)
-            with open(robot_history_file, "a", newline="") as f:
-                writer = csv.writer(f)
-                if write_header:
-                    writer.writerow(["timestamp", "total", "pass", "fail"])
-                writer.writerow(row)
-
-    except Exception as e:
-        robot_summary = {"error": f"Could not parse Robot XML: {e}"}
-
-# Build Robot trend
-if os.path.exists(robot_history_file):
-    df_hist = pd.read_csv(robot_history_file)
-    if not df_hist.empty:
-        fig_trend = px.line(df_hist, x="timestamp", y=["pass", "fail"], markers=True,
-                            title="Robot Test Trend (Pass/Fail over time)")
-        trend_robot_html = fig_trend.to_html(full_html=False)
-
-# --- Locust ---
-if os.path.exists(locust_csv):
-    df = pd.read_csv(locust_csv)
-
-    # Handle both new and old Locust CSV formats
-    col_requests = next((c for c in df.columns if "request count" in c.lower() or "requests" in c.lower()), None)
-    col_failures = next((c for c in df.columns if "failure count" in c.lower() or c.lower() == "failures"), None)
-    col_avg_time = next(
-        (c for c in df.columns if "average response time" in c.lower() or "avg response time" in c.lower()), None)
-
-    if col_requests and col_failures and col_avg_time:
-        locust_summary = {
-            "requests": int(df[col_requests].sum()),
-            "failures": int(df[col_failures].sum()),
-            "avg_response_time": round(float(df[col_avg_time].mean()), 2)
-        }
-
-        # Save to history
-        run_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        row = [run_time,
-               locust_summary.get("requests", 0),
-               locust_summary.get("failures", 0),
-               locust_summary.get("avg_response_time", 0)]
-        write_header = not os.path.exists(locust_history_file)
-        with open(locust_history_file, "a", newline="") as f:
-            writer = csv.writer(f)
-            if write_header:
-                writer.writerow(["timestamp", "requests", "failures", "avg_response_time"])
-            writer.writerow(row)
-
-        # Graphs
-        if col_avg_time and "Name" in df.columns:
-            fig = px.bar(df, x="Name", y=col_avg_time, title="Locust - Avg Response Time per Endpoint")
-            locust_chart_html = fig.to_html(full_html=False)
-
-        if col_failures and "Name" in df.columns:
-            fig2 = px.bar(df, x="Name", y=col_failures, title="Locust - Failures per Endpoint")
-            locust_chart_html += fig2.to_html(full_html=False)
-
-    else:
-        locust_summary = {"error": f"Unexpected CSV columns: {list(df.columns)}"}
-
-# Build Locust trend
-if os.path.exists(locust_history_file):
-    df_hist = pd.read_csv(locust_history_file)
-    if not df_hist.empty:
-        fig_trend = px.line(df_hist, x="timestamp", y=["avg_response_time", "failures"], markers=True,
-                            title="Locust Trend (Avg Response Time & Failures over time)")
-        trend_locust_html = fig_trend.to_html(full_html=False)
-
-# --- CloudWatch ---
-cw_history_processed = "reports/cw_processed_history.csv"
-cw_history_coldstart = "reports/cw_coldstart_history.csv"
-trend_cw_processed_html = ""
-trend_cw_cold_html = ""
-
-# CLI argument parser
-parser = argparse.ArgumentParser()
-parser.add_argument("--refresh", action="store_true",
-                    help="Fetch latest metrics from CloudWatch instead of using cached JSON")
-parser.add_argument("--stage", type=str, default="dev",
-                    help="Stage dimension to filter metrics (default: dev)")
-args, _ = parser.parse_known_args()
-
-cw = boto3.client("cloudwatch")
-
-
-def fetch_metric(namespace, metric_name, outfile, stage=None):
-    """Fetch CloudWatch metric and save JSON locally."""
-    end = datetime.utcnow()
-    start = end - timedelta(hours=6)  # last 6 hours
-
-    dimensions = []
-    if stage:
-        dimensions = [
-            {"Name": "Stage", "Value": stage},
-            {"Name": "FunctionName", "Value": "helloLambda"}
-        ]
-
-    response = cw.get_metric_statistics(
-        Namespace=namespace,
-        MetricName=metric_name,
-        Dimensions=dimensions,
-        StartTime=start,
-        EndTime=end,
-        Period=300,
-        Statistics=["Sum"]
-    )
-
-    print(f"Fetched {metric_name} (stage={stage}): {response}")  # DEBUG
-
-    os.makedirs(os.path.dirname(outfile), exist_ok=True)
-    with open(outfile, "w") as f:
-        json.dump(response, f, default=str)
-
-    return response
-
-
-# --- ColdStartCount ---
-cw_json = "reports/cloudwatch/coldstart.json"
-if args.refresh or not os.path.exists(cw_json):
-    fetch_metric("QAFramework/Serverless", "ColdStartCount", cw_json, stage=args.stage)
-
-if os.path.exists(cw_json):
-    with open(cw_json) as f:
-        data = json.load(f)
-
-    if data.get("Datapoints"):
-        datapoints = sorted(data["Datapoints"], key=lambda d: d["Timestamp"])
-        latest = datapoints[-1]
-
-        coldstart_summary = {
-            "Sum": latest.get("Sum", 0),
-            "Timestamp": latest.get("Timestamp")
-        }
-
-        # Save ColdStart history
-        run_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        row_cold = [run_time, latest.get("Sum", 0)]
-        write_header = not os.path.exists(cw_history_coldstart)
-        with open(cw_history_coldstart, "a", newline="") as f:
-            writer = csv.writer(f)
-            if write_header:
-                writer.writerow(["timestamp", "ColdStartCount"])
-            writer.writerow(row_cold)
-    else:
-        if "coldstart_summary" not in globals():
-            coldstart_summary = {}
-else:
-    coldstart_summary = {}
-
-# --- RequestsProcessed ---
-cw_processed_json = "reports/cloudwatch/requests.json"
-if args.refresh or not os.path.exists(cw_processed_json):
-    fetch_metric("QAFramework/Serverless", "RequestsProcessed", cw_processed_json, stage=args.stage)
-
-if os.path.exists(cw_processed_json):
-    with open(cw_processed_json) as f:
-        data = json.load(f)
-
-    if data.get("Datapoints"):
-        datapoints = sorted(data["Datapoints"], key=lambda d: d["Timestamp"])
-        latest = datapoints[-1]
-
-        requests_summary = {
-            "Sum": latest.get("Sum", 0),
-            "Timestamp": latest.get("Timestamp")
-        }
-
-        # Save RequestsProcessed history
-        run_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        row_proc = [run_time, latest.get("Sum", 0)]
-        write_header = not os.path.exists(cw_history_processed)
-        with open(cw_history_processed, "a", newline="") as f:
-            writer = csv.writer(f)
-            if write_header:
-                writer.writerow(["timestamp", "RequestsProcessed"])
-            writer.writerow(row_proc)
-
-        # Build RequestsProcessed trend
-        if os.path.exists(cw_history_processed):
-            df_hist = pd.read_csv(cw_history_processed)
-            if not df_hist.empty:
-                fig_proc = px.line(df_hist, x="timestamp", y="RequestsProcessed", markers=True,
-                                   title="CloudWatch - RequestsProcessed over time")
-                trend_cw_processed_html = fig_proc.to_html(full_html=False)
-    else:
-        if "requests_summary" not in globals():
-            requests_summary = {}
-else:
-    requests_summary = {}
-
-# Template
-env = Environment(loader=FileSystemLoader("."))
-template = env.from_string("""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Unified QA Dashboard</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; background: #f8f9fa; }
-        h1 { color: #2C3E50; }
-        h2 { color: #34495E; border-bottom: 2px solid #ccc; padding-bottom: 5px; }
-        .section { margin-bottom: 40px; padding: 15px; background: #fff; border-radius: 8px; box-shadow: 0 2px 5px rgba(0,0,0,0.1);}
-        .metric { padding: 5px 10px; margin: 5px 0; background: #ecf0f1; border-radius: 4px; }
-        iframe { width: 100%; height: 600px; border: none; }
-        table { border-collapse: collapse; width: 100%; margin-top: 10px; }
-        th, td { padding: 8px; border: 1px solid #ccc; text-align: left; }
-    </style>
-</head>
-<body>
-    <h1>Unified QA Framework - Dashboard</h1>
-
+PYTEST_XML = "reports/pytest/results.xml"
+LATENCY_JSON = "reports/pytest/latency.json"
+ROBOT_REPORT = "reports/robot/report.html"
+ROBOT_LOG = "reports/robot/log.html"
+ROBOT_OUTPUT = "reports/robot/output.xml"
+LOCUST_CSV = "reports/locust/results_stats.csv"
+LOCUST_HISTORY_CSV = "reports/locust/results_stats_history.csv"
+LOCUST_SKETCHES = "reports/locust/results_sketches.json"
+CW_JSON = "reports/cloudwatch/coldstart.json"
+COLD_START_JSON = "reports/cloudwatch/cold_start.json"
+CW_PROCESSED_JSON = "reports/cloudwatch/requests.json"
+DASHBOARD_HTML = "reports/robot/Dashboard.html"
+
+SECTION_TEMPLATES = {
+    "pytest": """
     <div class="section">
         <h2>PyTest Results</h2>
         {% if pytest %}
@@ -335,12 +51,26 @@ template = env.from_string("""
                 <div class="metric">Errors: {{ pytest.errors }}</div>
                 <div class="metric">Skipped: {{ pytest.skipped }}</div>
                 <div>{{ trend_pytest|safe }}</div>
+                {% if latency_rows %}
+                <h3>Latency Percentiles (ms)</h3>
+                <table>
+                    <tr><th>Test</th><th>Metric</th><th>Samples</th><th>p50</th><th>p90</th><th>p99</th><th>p99 CI low</th><th>Budgets</th></tr>
+                    {% for r in latency_rows %}
+                    <tr>
+                        <td>{{ r.test }}</td><td>{{ r.metric }}</td><td>{{ r.samples }}</td><td>{{ r.p50 }}</td>
+                        <td>{{ r.p90 }}</td><td>{{ r.p99 }}</td><td>{{ r.p99_ci_low }}</td><td>{{ r.budgets }}</td>
+                    </tr>
+                    {% endfor %}
+                </table>
+                <div>{{ trend_latency|safe }}</div>
+                {% endif %}
             {% endif %}
         {% else %}
             <p>No PyTest results found.</p>
         {% endif %}
     </div>
-
+""",
+    "robot": """
     <div class="section">
         <h2>Robot Framework</h2>
         {% if robot_summary %}
@@ -350,14 +80,16 @@ template = env.from_string("""
                 <div class="metric">Total: {{ robot_summary.total }}</div>
                 <div class="metric">Passed: {{ robot_summary.pass }}</div>
                 <div class="metric">Failed: {{ robot_summary.fail }}</div>
+                <div class="metric">Skipped: {{ robot_summary.skip }}</div>
                 <div>{{ robot_chart|safe }}</div>
                 <h3>Test Case Results</h3>
                 <table>
-                    <tr><th>Name</th><th>Status</th><th>Message</th></tr>
+                    <tr><th>Name</th><th>Status</th><th>Elapsed (s)</th><th>Message</th></tr>
                     {% for t in robot_details %}
                     <tr>
                         <td>{{ t.name }}</td>
                         <td style="color: {{ 'green' if t.status == 'PASS' else 'red' }}">{{ t.status }}</td>
+                        <td>{{ '%.3f'|format(t.elapsed_s) if t.elapsed_s is not none else '' }}</td>
                         <td>{{ t.message }}</td>
                     </tr>
                     {% endfor %}
@@ -365,15 +97,16 @@ template = env.from_string("""
                 <h3>Trend Over Time</h3>
                 <div>{{ trend_robot|safe }}</div>
                 <h3>Embedded Report</h3>
-                <iframe src="report.html" width="100%" height="600"></iframe>
+                <iframe src="report.html" width="100%" height="600" loading="lazy"></iframe>
                 <h3>Embedded Log</h3>
-                <iframe src="log.html" width="100%" height="600"></iframe>
+                <iframe src="log.html" width="100%" height="600" loading="lazy"></iframe>
             {% endif %}
         {% else %}
             <p>No Robot report found.</p>
         {% endif %}
     </div>
-
+""",
+    "locust": """
     <div class="section">
         <h2>Locust Results</h2>
         {% if locust %}
@@ -382,16 +115,49 @@ template = env.from_string("""
             {% else %}
                 <div class="metric">Total Requests: {{ locust.requests }}</div>
                 <div class="metric">Failures: {{ locust.failures }}</div>
-                <div class="metric">Avg Response Time: {{ locust.avg_response_time }} ms</div>
+                <div class="metric">Avg Response Time (request-weighted): {{ locust.avg_response_time }} ms</div>
+                <div class="metric">p50 / p95 / p99: {{ locust.p50 }} / {{ locust.p95 }} / {{ locust.p99 }} ms</div>
+                {% if locust.peak_rps is defined %}
+                <div class="metric">Peak throughput: {{ locust.peak_rps }} requests/s at {{ locust.peak_users }} users ({{ locust.mean_rps }} requests/s over {{ locust.duration_s }} s)</div>
+                {% endif %}
+                <table>
+                    <tr><th>Endpoint</th><th>Requests</th><th>Failures</th><th>Avg (ms)</th><th>p50</th><th>p95</th><th>p99</th><th>Max (ms)</th><th>Requests/s</th></tr>
+                    {% for e in locust_endpoints %}
+                    <tr>
+                        <td>{{ e.endpoint }}</td><td>{{ e.requests }}</td><td>{{ e.failures }}</td>
+                        <td>{{ '%.1f'|format(e.avg_ms) if e.avg_ms is not none else '' }}</td>
+                        <td>{{ e.p50 }}</td><td>{{ e.p95 }}</td><td>{{ e.p99 }}</td>
+                        <td>{{ '%.1f'|format(e.max_ms) if e.max_ms is not none else '' }}</td>
+                        <td>{{ '%.2f'|format(e.rps) if e.rps is not none else '' }}</td>
+                    </tr>
+                    {% endfor %}
+                </table>
                 <div>{{ locust_chart|safe }}</div>
+                <div>{{ locust_load|safe }}</div>
+                {% if locust_window %}
+                <h3>Response Time over the History Window (merged latency sketches, ±1%)</h3>
+                <table>
+                    <tr><th>Endpoint</th><th>Runs</th><th>Requests</th><th>Mean (ms)</th><th>p50</th><th>p95</th><th>p99</th><th>p99.9</th></tr>
+                    {% for w in locust_window %}
+                    <tr>
+                        <td>{{ w.endpoint }}</td><td>{{ w.runs }}</td><td>{{ w.requests }}</td>
+                        <td>{{ '%.1f'|format(w.mean) }}</td><td>{{ '%.1f'|format(w.p50) }}</td>
+                        <td>{{ '%.1f'|format(w.p95) }}</td><td>{{ '%.1f'|format(w.p99) }}</td>
+                        <td>{{ '%.1f'|format(w['p99.9']) }}</td>
+                    </tr>
+                    {% endfor %}
+                </table>
+                {% endif %}
                 <h3>Trend Over Time</h3>
                 <div>{{ trend_locust|safe }}</div>
+                <div>{{ trend_locust_p99|safe }}</div>
             {% endif %}
         {% else %}
             <p>No Locust results found.</p>
         {% endif %}
     </div>
-
+""",
+    "cloudwatch": """
     <div class="section">
         <h2>CloudWatch - Metrics</h2>
 
@@ -404,6 +170,22 @@ template = env.from_string("""
             <p>No ColdStartCount metrics found.</p>
         {% endif %}
 
+        <h3>Cold vs Warm Latency</h3>
+        {% if cold_start_bench %}
+            {% if cold_start_bench.error %}
+                <p>{{ cold_start_bench.error }}</p>
+            {% else %}
+                <div class="metric">Run: {{ cold_start_bench.timestamp }} ({{ cold_start_bench.mode }}: {{ cold_start_bench.target }})</div>
+                <div class="metric">Forced cold starts: {{ cold_start_bench.cold_starts }}</div>
+                <div class="metric">Init Duration p50: {{ cold_start_bench.init_p50 }} ms</div>
+                <div class="metric">Cold invocation p50: {{ cold_start_bench.cold_client_p50 }} ms (handler {{ cold_start_bench.cold_duration_p50 }} ms)</div>
+                <div class="metric">Warm invocation p50: {{ cold_start_bench.warm_client_p50 }} ms (handler {{ cold_start_bench.warm_duration_p50 }} ms)</div>
+                <div>{{ trend_cold_start_bench|safe }}</div>
+            {% endif %}
+        {% else %}
+            <p>No cold-start benchmark found (run src/utils/cold_start.py).</p>
+        {% endif %}
+
         <h3>RequestsProcessed</h3>
         {% if requests %}
             <div class="metric">RequestsProcessed: {{ requests.Sum }}</div>
@@ -413,29 +195,549 @@ template = env.from_string("""
             <p>No RequestsProcessed metrics found.</p>
         {% endif %}
     </div>
+""",
+}
+
+PAGE_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Unified QA Dashboard</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background: #f8f9fa; }
+        h1 { color: #2C3E50; }
+        h2 { color: #34495E; border-bottom: 2px solid #ccc; padding-bottom: 5px; }
+        .section { margin-bottom: 40px; padding: 15px; background: #fff; border-radius: 8px; box-shadow: 0 2px 5px rgba(0,0,0,0.1);}
+        .metric { padding: 5px 10px; margin: 5px 0; background: #ecf0f1; border-radius: 4px; }
+        iframe { width: 100%; height: 600px; border: none; }
+        table { border-collapse: collapse; width: 100%; margin-top: 10px; }
+        th, td { padding: 8px; border: 1px solid #ccc; text-align: left; }
+    </style>
+    {% if plotly_js %}
+    <script src="{{ plotly_js }}"></script>
+    <script>
+        var QA_TEMPLATE = {{ plotly_template|safe }};
+        function qaPlot(id, spec) {
+            spec.layout.template = QA_TEMPLATE;
+            Plotly.newPlot(id, spec.data, spec.layout, {responsive: true});
+        }
+    </script>
+    {% endif %}
+</head>
+<body>
+    <h1>Unified QA Framework - Dashboard</h1>
+    {% for html in sections %}{{ html|safe }}{% endfor %}
 </body>
 </html>
-""")
-
-# Render HTML
-html_out = template.render(
-    pytest=pytest_summary,
-    locust=locust_summary,
-    locust_chart=locust_chart_html,
-    coldstart=coldstart_summary,
-    requests=requests_summary,
-    robot_summary=robot_summary,
-    robot_details=robot_details,
-    robot_chart=robot_chart_html,
-    trend_robot=trend_robot_html,
-    trend_pytest=trend_pytest_html,
-    trend_locust=trend_locust_html,
-    trend_cw_cold=trend_cw_cold_html,
-    trend_cw_processed=trend_cw_processed_html
-)
-
-os.makedirs("reports/robot", exist_ok=True)
-with open("reports/robot/Dashboard.html", "w", encoding="utf-8") as f:
-    f.write(html_out)
-
-print("✅ Dashboard generated at reports/robot/Dashboard.html")
+"""
+
+
+# ---------- Figures ----------
+def trend_frame(history, suite, metrics, opts, by=None):
+    """History trend of a suite; with --lite, series longer than --max-points are min/max downsampled."""
+    df_hist = history.trend_frame(suite, metrics, days=opts["history_days"])
+    if opts.get("lite") and len(df_hist) > opts["max_points"]:
+        from src.utils.downsample import downsample_frame
+        df_hist = downsample_frame(df_hist, metrics, opts["max_points"], by=by)
+    return df_hist
+
+
+def figure_html(fig, opts):
+    """
+    A figure as an HTML fragment. By default it is self-contained (plotly.js inlined).
+    With --lite it is a div plus the figure's compact JSON without its template; the page
+    loads plotly.js and the template once and draws it with qaPlot().
+    """
+    if not opts.get("lite"):
+        return fig.to_html(full_html=False)
+    import plotly.io as pio
+    spec = fig.to_plotly_json()
+    spec["layout"].pop("template", None)
+    payload = pio.json.to_json_plotly(spec)  # escapes "</", so it is safe inside <script>
+    div_id = "fig-" + hashlib.sha1(payload.encode()).hexdigest()[:12]
+    return f'<div id="{div_id}" class="figure"></div><script>qaPlot("{div_id}", {payload});</script>'
+
+
+def lite_assets(directory):
+    """Write plotly.js next to the page once per version; return (script file name, template JSON)."""
+    import plotly.io as pio
+    import plotly.offline
+    name = f"plotly-{plotly.offline.get_plotlyjs_version()}.min.js"
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(plotly.offline.get_plotlyjs())
+    return name, pio.json.to_json_plotly(pio.templates[pio.templates.default])
+
+
+# ---------- Collectors ----------
+# collect_<section>(history, opts) -> template context. They run in worker
+# processes: opts is a plain dict and history is the worker's own connection.
+
+def collect_pytest(history, opts):
+    import plotly.express as px
+    pytest_summary = {}
+    latency_rows = []
+    trend_pytest_html = ""
+    trend_latency_html = ""
+
+    if os.path.exists(PYTEST_XML):
+        try:
+            # Streamed, and summed over every testsuite in the file
+            junit_summary, _ = parse_junit(PYTEST_XML)
+            if junit_summary["suites"]:
+                pytest_summary = {key: junit_summary[key] for key in ("tests", "failures", "errors", "skipped")}
+
+            # Save to history (once per results file)
+            history.record("pytest", file_run_id(PYTEST_XML), valid_metrics("pytest", pytest_summary))
+
+        except Exception as e:
+            pytest_summary = {"error": f"Could not parse XML: {e}"}
+
+    # Build PyTest trend
+    df_hist = trend_frame(history, "pytest", ["failures", "errors", "skipped"], opts)
+    if not df_hist.empty:
+        fig = px.line(df_hist, x="timestamp", y=["failures", "errors", "skipped"], markers=True,
+                      title="PyTest Trend (Failures/Errors/Skipped over time)")
+        trend_pytest_html = figure_html(fig, opts)
+
+    # --- PyTest latency percentiles ---
+    if os.path.exists(LATENCY_JSON):
+        try:
+            with open(LATENCY_JSON) as f:
+                latency_data = json.load(f)
+
+            for t in latency_data.get("tests", []):
+                stats = t["summary"][t["metric"]]
+                latency_rows.append({
+                    "test": t["test"],
+                    "metric": t["metric"],
+                    "samples": stats.get("count", 0),
+                    "p50": round(stats["p50"]["value"], 2),
+                    "p90": round(stats["p90"]["value"], 2),
+                    "p99": round(stats["p99"]["value"], 2),
+                    "p99_ci_low": round(stats["p99"]["ci_low"], 2) if stats["p99"]["ci_low"] is not None else "",
+                    "budgets": ", ".join(f"{b['percentile']} {b['budget']} ms: {b['verdict']}" for b in t["budgets"])
+                })
+
+            # Save to history once per pytest run, one label per test
+            run_id = file_run_id(LATENCY_JSON)
+            history.record_many("latency", [
+                (run_id, latency_data.get("timestamp"), r["test"],
+                 {"samples": r["samples"], "p50": r["p50"], "p90": r["p90"], "p99": r["p99"]})
+                for r in latency_rows])
+
+        except Exception as e:
+            latency_rows = [{"test": f"Could not parse latency JSON: {e}"}]
+
+    # Build latency trend
+    df_hist = trend_frame(history, "latency", ["samples", "p50", "p90", "p99"], opts, by="label")
+    if not df_hist.empty:
+        fig = px.line(df_hist.rename(columns={"label": "test"}), x="timestamp", y="p99", color="test", markers=True,
+                      hover_data=["p50", "p90", "samples"], title="PyTest Latency Trend (p99 ms per test)")
+        trend_latency_html = figure_html(fig, opts)
+
+    return {"pytest": pytest_summary, "trend_pytest": trend_pytest_html,
+            "latency_rows": latency_rows, "trend_latency": trend_latency_html}
+
+
+def collect_robot(history, opts):
+    import pandas as pd
+    import plotly.express as px
+    robot_summary = {}
+    robot_details = []
+    robot_chart_html = ""
+    trend_robot_html = ""
+
+    if os.path.exists(ROBOT_OUTPUT):
+        try:
+            # Streamed: keywords and log messages are discarded as they are read
+            robot_summary, robot_details = parse_robot(ROBOT_OUTPUT)
+
+            if robot_summary and "pass" in robot_summary and "fail" in robot_summary:
+                df_robot = pd.DataFrame({
+                    "Result": ["PASS", "FAIL"],
+                    "Count": [int(robot_summary["pass"]), int(robot_summary["fail"])]
+                })
+                fig_robot = px.pie(df_robot, names="Result", values="Count", title="Robot - Pass vs Fail")
+                robot_chart_html = figure_html(fig_robot, opts)
+
+            # Save to history (once per output.xml)
+            if robot_summary:
+                history.record("robot", file_run_id(ROBOT_OUTPUT), valid_metrics("robot", robot_summary))
+
+        except Exception as e:
+            robot_summary = {"error": f"Could not parse Robot XML: {e}"}
+
+    # Build Robot trend
+    df_hist = trend_frame(history, "robot", ["pass", "fail"], opts)
+    if not df_hist.empty:
+        fig_trend = px.line(df_hist, x="timestamp", y=["pass", "fail"], markers=True,
+                            title="Robot Test Trend (Pass/Fail over time)")
+        trend_robot_html = figure_html(fig_trend, opts)
+
+    return {"robot_summary": robot_summary, "robot_details": robot_details,
+            "robot_chart": robot_chart_html, "trend_robot": trend_robot_html}
+
+
+def collect_locust(history, opts):
+    import pandas as pd
+    import plotly.express as px
+    locust_summary = {}
+    locust_endpoints = []
+    locust_window = []
+    locust_chart_html = ""
+    locust_load_html = ""
+    trend_locust_html = ""
+    trend_locust_p99_html = ""
+
+    if os.path.exists(LOCUST_CSV):
+        try:
+            # Request-weighted averages; percentiles from the Aggregated row
+            locust_endpoints, aggregated = read_stats(LOCUST_CSV)
+            locust_summary = summarize_stats(locust_endpoints, aggregated)
+            run_id, run_time = file_run_id(LOCUST_CSV), None
+
+            # Throughput over the run (streamed stats history)
+            if os.path.exists(LOCUST_HISTORY_CSV):
+                load, series = summarize_history(LOCUST_HISTORY_CSV)
+                locust_summary.update(load)
+                if series:
+                    run_time = datetime.fromtimestamp(series[-1]["timestamp"])
+                    df_load = pd.DataFrame(series)
+                    df_load["time"] = pd.to_datetime(df_load["timestamp"], unit="s")
+                    if opts.get("lite") and len(df_load) > opts["max_points"]:
+                        from src.utils.downsample import downsample_frame
+                        df_load = downsample_frame(df_load, ["rps", "users", "p95", "p99"], opts["max_points"])
+                    fig = px.line(df_load, x="time", y=["rps", "users"],
+                                  title="Locust - Throughput over the Run (requests/s, users)")
+                    locust_load_html = figure_html(fig, opts)
+                    fig2 = px.line(df_load, x="time", y=["p50", "p95", "p99"],
+                                   title="Locust - Response Time Percentiles over the Run (ms, recent window)")
+                    locust_load_html += figure_html(fig2, opts)
+
+            # Save to history (once per stats CSV), run summary plus one label per endpoint
+            history.record("locust", run_id, valid_metrics("locust", locust_summary), timestamp=run_time)
+            history.record_many("locust_endpoint", [
+                (run_id, run_time, e["endpoint"], valid_metrics("locust_endpoint", {
+                    "requests": e["requests"], "failures": e["failures"], "avg_response_time": e["avg_ms"],
+                    "p95": e["p95"], "p99": e["p99"]}))
+                for e in locust_endpoints])
+
+            # Latency sketches of this run, kept per endpoint so any window can be merged later
+            if os.path.exists(LOCUST_SKETCHES):
+                history.record_sketches("locust_endpoint", run_id, {
+                    endpoint: sketch.to_bytes() for endpoint, sketch in load_sketches(LOCUST_SKETCHES).items()},
+                    timestamp=run_time)
+
+            # Graphs
+            if locust_endpoints:
+                df = pd.DataFrame(locust_endpoints)
+                fig = px.bar(df, x="endpoint", y=["avg_ms", "p95", "p99"], barmode="group",
+                             title="Locust - Response Time per Endpoint (ms)")
+                locust_chart_html = figure_html(fig, opts)
+                fig2 = px.bar(df, x="endpoint", y="failures", title="Locust - Failures per Endpoint")
+                locust_chart_html += figure_html(fig2, opts)
+
+        except Exception as e:
+            locust_summary = {"error": f"Could not parse Locust CSV: {e}"}
+
+    # Percentiles over the whole window: every run's sketches merged, per endpoint and overall
+    merged, runs, overall = {}, {}, LatencySketch()
+    for _, run_id, endpoint, data in history.sketches("locust_endpoint", days=opts["history_days"]):
+        sketch = LatencySketch.from_bytes(data)
+        merged.setdefault(endpoint, LatencySketch()).merge(sketch)
+        runs.setdefault(endpoint, set()).add(run_id)
+        overall.merge(sketch)
+    rows = [(endpoint, merged[endpoint], runs[endpoint]) for endpoint in sorted(merged)]
+    if merged:
+        rows.append(("All endpoints", overall, set().union(*runs.values())))
+    for endpoint, sketch, run_ids in rows:
+        locust_window.append({"endpoint": endpoint, "runs": len(run_ids), "requests": sketch.count,
+                              "mean": sketch.mean, **sketch.percentiles((50, 95, 99, 99.9))})
+
+    # Build Locust trend
+    df_hist = trend_frame(history, "locust", ["avg_response_time", "p95", "p99", "failures"], opts)
+    if not df_hist.empty:
+        fig_trend = px.line(df_hist, x="timestamp", y=["avg_response_time", "p95", "p99", "failures"], markers=True,
+                            title="Locust Trend (Avg/p95/p99 Response Time & Failures over time)")
+        trend_locust_html = figure_html(fig_trend, opts)
+
+    # p99 per endpoint across runs: capacity regressions
+    df_hist = trend_frame(history, "locust_endpoint", ["p99", "p95", "requests"], opts, by="label")
+    if not df_hist.empty:
+        fig_p99 = px.line(df_hist.rename(columns={"label": "endpoint"}), x="timestamp", y="p99", color="endpoint",
+                          markers=True, hover_data=["p95", "requests"], title="Locust p99 per Endpoint (ms per run)")
+        trend_locust_p99_html = figure_html(fig_p99, opts)
+
+    return {"locust": locust_summary, "locust_endpoints": locust_endpoints, "locust_window": locust_window,
+            "locust_chart": locust_chart_html,
+            "locust_load": locust_load_html, "trend_locust": trend_locust_html,
+            "trend_locust_p99": trend_locust_p99_html}
+
+
+def latest_datapoint(path):
+    """{"Sum", "Timestamp"} of the newest datapoint in a get_metric_statistics JSON dump, or {}."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        data = json.load(f)
+    if not data.get("Datapoints"):
+        return {}
+    latest = sorted(data["Datapoints"], key=lambda d: d["Timestamp"])[-1]
+    return {"Sum": latest.get("Sum", 0), "Timestamp": latest.get("Timestamp")}
+
+
+def collect_cloudwatch(history, opts):
+    import plotly.express as px
+    trend_cw_processed_html = ""
+    trend_cw_cold_html = ""
+
+    # --- ColdStartCount ---
+    coldstart_summary = latest_datapoint(CW_JSON)
+    if coldstart_summary:
+        # Save ColdStart history (one run per period; a period still open when first read is updated later)
+        history.record("cloudwatch", f"datapoint:{coldstart_summary['Timestamp']}",
+                       {"ColdStartCount": coldstart_summary["Sum"]}, replace=True)
+
+    # Build ColdStartCount trend
+    df_hist = trend_frame(history, "cloudwatch", ["ColdStartCount"], opts)
+    if not df_hist.empty:
+        fig_cold = px.line(df_hist, x="timestamp", y="ColdStartCount", markers=True,
+                           title="CloudWatch - ColdStartCount over time")
+        trend_cw_cold_html = figure_html(fig_cold, opts)
+
+    # --- Cold-start benchmark (src/utils/cold_start.py) ---
+    cold_start_bench = {}
+    trend_cold_start_bench_html = ""
+    if os.path.exists(COLD_START_JSON):
+        try:
+            with open(COLD_START_JSON) as f:
+                bench = json.load(f)
+            summary = bench["summary"]
+
+            def p50(series):
+                return round(series["p50"]["value"], 2) if series.get("count") else ""
+
+            cold_start_bench = {
+                "mode": bench.get("mode"),
+                "target": bench.get("target"),
+                "timestamp": bench.get("timestamp"),
+                "cold_starts": summary["cold"]["count"],
+                "init_p50": p50(summary["cold"]["init_ms"]),
+                "cold_client_p50": p50(summary["cold"]["client_ms"]),
+                "warm_client_p50": p50(summary["warm"]["client_ms"]),
+                "cold_duration_p50": p50(summary["cold"]["duration_ms"]),
+                "warm_duration_p50": p50(summary["warm"]["duration_ms"])
+            }
+
+            # Save to history once per benchmark run
+            history.record("cold_start", file_run_id(COLD_START_JSON), valid_metrics("cold_start", cold_start_bench),
+                           timestamp=cold_start_bench["timestamp"], label=cold_start_bench["mode"])
+
+        except Exception as e:
+            cold_start_bench = {"error": f"Could not parse cold-start results: {e}"}
+
+    df_hist = trend_frame(history, "cold_start", ["cold_starts", "init_p50", "cold_client_p50", "warm_client_p50"],
+                          opts)
+    if not df_hist.empty:
+        fig_cold = px.line(df_hist.rename(columns={"label": "mode"}), x="timestamp",
+                           y=["init_p50", "cold_client_p50", "warm_client_p50"],
+                           markers=True, hover_data=["mode", "cold_starts"],
+                           title="Cold vs Warm Latency over time (p50 ms)")
+        trend_cold_start_bench_html = figure_html(fig_cold, opts)
+
+    # --- RequestsProcessed ---
+    requests_summary = latest_datapoint(CW_PROCESSED_JSON)
+    if requests_summary:
+        # Save RequestsProcessed history (one run per period, updated like ColdStartCount)
+        history.record("cloudwatch", f"datapoint:{requests_summary['Timestamp']}",
+                       {"RequestsProcessed": requests_summary["Sum"]}, replace=True)
+
+        # Build RequestsProcessed trend
+        df_hist = trend_frame(history, "cloudwatch", ["RequestsProcessed"], opts)
+        if not df_hist.empty:
+            fig_proc = px.line(df_hist, x="timestamp", y="RequestsProcessed", markers=True,
+                               title="CloudWatch - RequestsProcessed over time")
+            trend_cw_processed_html = figure_html(fig_proc, opts)
+
+    return {"coldstart": coldstart_summary, "trend_cw_cold": trend_cw_cold_html,
+            "cold_start_bench": cold_start_bench, "trend_cold_start_bench": trend_cold_start_bench_html,
+            "requests": requests_summary, "trend_cw_processed": trend_cw_processed_html}
+
+
+# ---------- CloudWatch fetch (I/O, runs in the section's thread) ----------
+def fetch_cloudwatch(opts):
+    """Fetch the metric JSON files if missing (or with --refresh) in one batched GetMetricData request."""
+    if not opts["refresh"] and os.path.exists(CW_JSON) and os.path.exists(CW_PROCESSED_JSON):
+        return
+    from src.utils.cloudwatch_metrics import MetricCache, fetch, metric_specs, write_legacy_json
+    specs = metric_specs(["ColdStartCount", "RequestsProcessed"], stages=[opts["stage"]])
+    end = datetime.now(timezone.utc)
+    results, calls = fetch(specs, end - timedelta(hours=6), end, cache=MetricCache())  # last 6 hours
+    write_legacy_json(specs, results, {"ColdStartCount": CW_JSON, "RequestsProcessed": CW_PROCESSED_JSON})
+    print(f"Fetched CloudWatch metrics (stage={opts['stage']}): {calls} GetMetricData call(s)")
+
+
+# ---------- Sections ----------
+# inputs and suites key the build manifest; fetch (optional) runs before the key is taken
+SECTIONS = {
+    "pytest": {"inputs": [PYTEST_XML, LATENCY_JSON], "suites": ["pytest", "latency"], "collect": collect_pytest},
+    "robot": {"inputs": [ROBOT_OUTPUT], "suites": ["robot"], "collect": collect_robot},
+    "locust": {"inputs": [LOCUST_CSV, LOCUST_HISTORY_CSV, LOCUST_SKETCHES], "suites": ["locust", "locust_endpoint"],
+               "collect": collect_locust},
+    "cloudwatch": {"inputs": [CW_JSON, COLD_START_JSON, CW_PROCESSED_JSON], "suites": ["cloudwatch", "cold_start"],
+                   "collect": collect_cloudwatch, "fetch": fetch_cloudwatch},
+}
+
+
+# Serializes builds in this process: plotly is not thread-safe on first import or first use
+BUILD_LOCK = threading.Lock()
+
+
+def build_section(name, opts):
+    """Collect and render one section; runs in a worker process. Returns (html, seconds)."""
+    start = time.perf_counter()
+    with HistoryStore(opts["history_db"]) as history:
+        context = SECTIONS[name]["collect"](history, opts)
+    html = Environment().from_string(SECTION_TEMPLATES[name]).render(**context)
+    return html, time.perf_counter() - start
+
+
+def error_section(name, error):
+    return f'\n    <div class="section">\n        <h2>{name}</h2>\n        <p>Error: {error}</p>\n    </div>\n'
+
+
+def render_mode(opts):
+    """How figures are embedded; fragments are only combined on a page when this matches."""
+    return {"lite": bool(opts.get("lite")), "max_points": opts.get("max_points") if opts.get("lite") else None}
+
+
+def run_sections(names, opts, manifest, workers=None, force=False):
+    """
+    Build the selected sections concurrently: one thread per section for the manifest
+    check and any fetch, and a process pool for collecting and rendering.
+    :param workers: worker processes (default: one per CPU, at most one per section);
+                    with 0 or 1 sections are built in this process, one at a time
+    :return: ({section: html}, [(section, status, seconds)]) with status cached/built/failed
+    """
+    lock = threading.Lock()
+    mode = render_mode(opts)
+    options = {"history_days": opts["history_days"],
+               "as_of": datetime.now().strftime("%Y-%m-%d") if opts["history_days"] else None, **mode}
+
+    def key(name):
+        with HistoryStore(opts["history_db"]) as history:
+            state = history.state(*SECTIONS[name]["suites"])
+        with lock:
+            return manifest.key(SECTIONS[name]["inputs"], history=state, **options)
+
+    def run(name):
+        start = time.perf_counter()
+        section = SECTIONS[name]
+        try:
+            if section.get("fetch"):
+                section["fetch"](opts)
+            html = None if force else manifest.get(name, key(name))
+            if html is not None:
+                return name, html, "cached", time.perf_counter() - start
+            if pool is None:
+                with BUILD_LOCK:
+                    html, _ = build_section(name, opts)
+            else:
+                html, _ = pool.submit(build_section, name, opts).result()
+            after = key(name)  # history now includes this build's runs
+            with lock:
+                manifest.put(name, after, html, mode)
+            return name, html, "built", time.perf_counter() - start
+        except Exception as e:
+            traceback.print_exc()
+            return name, error_section(name, e), "failed", time.perf_counter() - start
+
+    if workers is None:
+        workers = min(len(names), os.cpu_count() or 1)
+    # spawn: forking a process that is running threads can copy held locks
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) if workers > 1 else None
+    try:
+        with ThreadPoolExecutor(max(len(names), 1)) as threads:
+            results = list(threads.map(run, names))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return ({name: html for name, html, _, _ in results},
+            [(name, status, seconds) for name, _, status, seconds in results])
+
+
+def main(argv=None):
+    # CLI argument parser
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--refresh", action="store_true",
+                        help="Fetch latest metrics from CloudWatch instead of using cached JSON")
+    parser.add_argument("--stage", type=str, default="dev",
+                        help="Stage dimension to filter metrics (default: dev)")
+    parser.add_argument("--history-db", default="reports/history.sqlite3",
+                        help="SQLite metrics history (legacy *_history.csv files are imported once)")
+    parser.add_argument("--history-days", type=int, default=30,
+                        help="Days of history to plot in trends (0 = all)")
+    parser.add_argument("--cache-dir", default="reports/.dashboard_cache",
+                        help="Build manifest and cached section HTML")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild every section even if its inputs are unchanged")
+    parser.add_argument("--sections", nargs="+", choices=list(SECTIONS), default=list(SECTIONS),
+                        help="Sections to build; the others keep their last cached HTML")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for building sections (default: CPUs; 0 = in this process)")
+    parser.add_argument("--lite", action="store_true",
+                        help="Load plotly.js once from a file next to the page and downsample long trends")
+    parser.add_argument("--max-points", type=int, default=2000,
+                        help="With --lite: points per trend series before min/max downsampling")
+    args, _ = parser.parse_known_args(argv)
+    started = time.perf_counter()
+
+    # History store
+    with HistoryStore(args.history_db) as history:
+        for path, (rows, skipped) in history.migrate_csvs().items():
+            print(f"Migrated {path} into {args.history_db}: {rows} values, {skipped} invalid values skipped")
+
+    # Build manifest: a section is re-parsed and re-rendered only when its input files,
+    # its history rows, the trend window or this script changed
+    manifest = BuildManifest(args.cache_dir, version=file_digest(os.path.abspath(__file__)))
+    opts = {"history_db": args.history_db, "history_days": args.history_days or None,
+            "refresh": args.refresh, "stage": args.stage, "lite": args.lite, "max_points": args.max_points}
+    # Unselected sections keep their last HTML, unless it was rendered for the other --lite mode
+    mode = render_mode(opts)
+    names = [name for name in SECTIONS if name in args.sections
+             or (manifest.built(name) and manifest.last(name, mode) is None)]
+    sections, timings = run_sections(names, opts, manifest, workers=args.workers, force=args.force)
+    for name in SECTIONS:
+        if name not in sections and manifest.last(name, mode) is not None:
+            sections[name] = manifest.last(name, mode)
+
+    print(f"{'section':<12}{'status':<8}{'seconds':>9}")
+    for name, status, seconds in timings:
+        print(f"{name:<12}{status:<8}{seconds:9.2f}")
+
+    # Nothing changed and the page on disk is the one we last wrote
+    if manifest.output_current(DASHBOARD_HTML) and all(status == "cached" for _, status, _ in timings):
+        manifest.save()
+        print(f"✅ Dashboard up to date at {DASHBOARD_HTML} ({time.perf_counter() - started:.2f} s)")
+        return timings
+
+    # Render HTML
+    os.makedirs(os.path.dirname(DASHBOARD_HTML), exist_ok=True)
+    plotly_js, plotly_template = lite_assets(os.path.dirname(DASHBOARD_HTML)) if args.lite else (None, None)
+    html_out = Environment().from_string(PAGE_TEMPLATE).render(
+        sections=[sections[name] for name in SECTIONS if name in sections],
+        plotly_js=plotly_js, plotly_template=plotly_template)
+
+    with open(DASHBOARD_HTML, "w", encoding="utf-8") as f:
+        f.write(html_out)
+    manifest.wrote_output(DASHBOARD_HTML)
+    manifest.save()
+
+    print(f"✅ Dashboard generated at {DASHBOARD_HTML} ({time.perf_counter() - started:.2f} s)")
+    return timings
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,507 @@
+import base64
+import functools
 import json
 import logging
-import boto3
 import os
+import random
+import time
+from collections import OrderedDict
+from decimal import Decimal
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# CloudWatch client
-cloudwatch = boto3.client("cloudwatch")
 NAMESPACE = "QAFramework/Serverless"
 STAGE = os.getenv("STAGE", "dev")
 
+# Metrics emission: "emf" writes Embedded Metric Format log lines (no API call),
+# "api" sends one batched put_metric_data per flush.
+METRICS_MODE = os.getenv("METRICS_MODE", "emf").lower()
+# Seconds to keep buffering across warm invocations (0 = flush every invocation)
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "0"))
+METRIC_DIMENSIONS = {"FunctionName": "helloLambda", "Stage": STAGE}
+PUT_METRIC_DATA_MAX_DATUMS = 1000  # PutMetricData per-call limit
+EMF_MAX_METRICS = 100              # EMF per-directive limit
+
 # DynamoDB table
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.getenv("TABLE_NAME", "ItemsTable"))
+TABLE_NAME = os.getenv("TABLE_NAME", "ItemsTable")
+
+# Batch limits
+BATCH_WRITE_LIMIT = 25     # BatchWriteItem requests per call
+BATCH_GET_LIMIT = 100      # BatchGetItem keys per call
+BATCH_MAX_ITEMS = 1000     # items per /items/batch request
+BATCH_MAX_RETRIES = 5      # retries for UnprocessedItems / UnprocessedKeys, per chunk
+BATCH_BACKOFF_BASE = 0.05  # seconds, doubled per retry (full jitter)
+# The retry budget is per chunk: a 1000-item write is 40 chunks of up to ~1.55 s of
+# backoff each under sustained throttling, more than API Gateway waits. So retries
+# also stop at a per-invocation deadline (the sooner of API Gateway's 29 s and the
+# function's remaining time, less a margin for the response), and whatever is still
+# pending then is returned as "unprocessed" for the client to retry.
+API_GATEWAY_TIMEOUT = 29.0    # seconds
+BATCH_DEADLINE_MARGIN = 2.0   # seconds
+
+# Read-through item cache for GET /items (per warm container, off by default)
+ITEM_CACHE_ENABLED = os.getenv("ITEM_CACHE_ENABLED", "false").lower() == "true"
+ITEM_CACHE_TTL = float(os.getenv("ITEM_CACHE_TTL", "30"))
+ITEM_CACHE_MAX_ENTRIES = int(os.getenv("ITEM_CACHE_MAX_ENTRIES", "1000"))
+ITEM_CACHE_MAX_BYTES = int(os.getenv("ITEM_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+
+# List/scan paging
+LIST_DEFAULT_LIMIT = 100
+LIST_MAX_LIMIT = 1000
 
 # Global flag to detect first invocation (cold start)
 IS_COLD_START = True
 
-def publish_metric(metric_name):
-    """Publish a custom CloudWatch metric with Stage and FunctionName dimensions."""
+# time.monotonic() by which batch retries give up, set per invocation (None: no limit)
+request_deadline = None
+
+
+# ---------- AWS clients ----------
+# boto3 is imported and clients are created on first use rather than at import time,
+# so cold starts only pay for what the request needs (emf metrics need no client at all).
+clients = {}
+
+
+@functools.lru_cache(maxsize=None)
+def boto3_session():
+    import boto3
+    return boto3.session.Session()
+
+
+def get_client(service):
+    """Memoized low-level client; all clients share one botocore session."""
+    client = clients.get(service)
+    if client is None:
+        client = clients[service] = boto3_session().client(service)
+    return client
+
+
+@functools.lru_cache(maxsize=None)
+def dynamodb_types():
+    from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+    return TypeSerializer(), TypeDeserializer()
+
+
+def serialize_item(item):
+    serializer = dynamodb_types()[0]
+    return {k: serializer.serialize(v) for k, v in item.items()}
+
+
+def deserialize_item(attributes):
+    deserializer = dynamodb_types()[1]
+    return {k: deserializer.deserialize(v) for k, v in attributes.items()}
+
+
+def item_key(item_id):
+    return {"id": {"S": str(item_id)}}
+
+class MetricsBuffer:
+    """Buffer Count metrics in memory and write them out in one go on flush()."""
+
+    def __init__(self, mode=METRICS_MODE, flush_interval=METRICS_FLUSH_INTERVAL,
+                 max_datums=PUT_METRIC_DATA_MAX_DATUMS):
+        self.mode = mode
+        self.flush_interval = flush_interval
+        self.max_datums = max_datums
+        self.counters = {}
+        self.last_flush = time.monotonic()
+
+    def record(self, metric_name, value=1):
+        self.counters[metric_name] = self.counters.get(metric_name, 0) + value
+        if len(self.counters) >= self.max_datums:
+            self.flush()
+
+    def due(self):
+        return bool(self.counters) and time.monotonic() - self.last_flush >= self.flush_interval
+
+    def flush(self):
+        """Write all buffered counters; failures are logged, never raised."""
+        counters, self.counters = self.counters, {}
+        self.last_flush = time.monotonic()
+        if not counters:
+            return
+        try:
+            if self.mode == "api":
+                self._put_metric_data(counters)
+            else:
+                self._emit_emf(counters)
+        except Exception as e:
+            logger.error(f"Failed to publish {sorted(counters)}: {e}")
+
+    def _emit_emf(self, counters):
+        names = list(counters)
+        for i in range(0, len(names), EMF_MAX_METRICS):
+            chunk = names[i:i + EMF_MAX_METRICS]
+            record = {
+                "_aws": {
+                    "Timestamp": int(time.time() * 1000),
+                    "CloudWatchMetrics": [{
+                        "Namespace": NAMESPACE,
+                        "Dimensions": [list(METRIC_DIMENSIONS)],
+                        "Metrics": [{"Name": name, "Unit": "Count"} for name in chunk]
+                    }]
+                },
+                **METRIC_DIMENSIONS,
+                **{name: counters[name] for name in chunk}
+            }
+            # EMF must be the whole log line, so bypass the logging formatter
+            print(json.dumps(record), flush=True)
+
+    def _put_metric_data(self, counters):
+        dimensions = [{"Name": k, "Value": v} for k, v in METRIC_DIMENSIONS.items()]
+        datums = [
+            {"MetricName": name, "Dimensions": dimensions, "Value": value, "Unit": "Count"}
+            for name, value in counters.items()
+        ]
+        for i in range(0, len(datums), self.max_datums):
+            get_client("cloudwatch").put_metric_data(Namespace=NAMESPACE, MetricData=datums[i:i + self.max_datums])
+        logger.info(f"Published metrics: {counters}")
+
+
+metrics = MetricsBuffer()
+
+
+def publish_metric(metric_name, value=1):
+    """Record a custom CloudWatch metric; it is written out when the buffer is flushed."""
+    metrics.record(metric_name, value)
+
+
+# ---------- Item cache ----------
+class ItemCache:
+    """LRU + TTL cache of serialized GET /items bodies, bounded by entry count and bytes.
+
+    Only lives as long as the container, so PUT/DELETE invalidate it here but writes
+    made through other containers are only seen once the TTL expires.
+    """
+
+    def __init__(self, ttl=ITEM_CACHE_TTL, max_entries=ITEM_CACHE_MAX_ENTRIES,
+                 max_bytes=ITEM_CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # id -> (expires_at, body)
+        self.size = 0
+
+    def get(self, item_id):
+        entry = self.entries.get(item_id)
+        if entry is not None and entry[0] <= time.monotonic():
+            self.invalidate(item_id)
+            entry = None
+        if entry is None:
+            publish_metric("ItemCacheMisses")
+            return None
+        self.entries.move_to_end(item_id)
+        publish_metric("ItemCacheHits")
+        return entry[1]
+
+    def put(self, item_id, body):
+        self.invalidate(item_id)
+        if len(body) > self.max_bytes:
+            return
+        self.entries[item_id] = (time.monotonic() + self.ttl, body)
+        self.size += len(body)
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+            publish_metric("ItemCacheEvictions")
+
+    def invalidate(self, item_id):
+        entry = self.entries.pop(item_id, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+
+item_cache = ItemCache() if ITEM_CACHE_ENABLED else None
+
+
+def invalidate_cached(*item_ids):
+    if item_cache is not None:
+        for item_id in item_ids:
+            if item_id is not None:
+                item_cache.invalidate(str(item_id))
+
+
+# ---------- Routing ----------
+# Everything a request needs that does not depend on the event is built once here.
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type,Authorization"
+}
+JSON_HEADERS = {**CORS_HEADERS, "Content-Type": "application/json"}
+ROOT_PATHS = frozenset(["", "/", f"/{STAGE}", f"/{STAGE}/"])
+ITEMS_PATH = f"/{STAGE}/items"
+BATCH_PATH = f"/{STAGE}/items/batch"
+LIST_PATH = f"/{STAGE}/items/list"
+
+OPTIONS_RESPONSE = {"statusCode": 200, "headers": CORS_HEADERS, "body": ""}
+ROOT_RESPONSE = {"statusCode": 200, "headers": JSON_HEADERS,
+                 "body": '{"message": "Hello from Lambda CRUD API!"}'}
+NOT_FOUND_RESPONSE = {"statusCode": 404, "headers": CORS_HEADERS, "body": '{"error": "Not Found"}'}
+
+
+def fixed_response(template):
+    """A fresh copy of a response template: its headers dict is copied too, so callers may add to it."""
+    return {**template, "headers": dict(template["headers"])}
+
+
+def json_default(value):
+    """DynamoDB returns numbers as Decimal, which json.dumps cannot encode."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_response(payload, status_code=200):
+    return {"statusCode": status_code, "headers": dict(CORS_HEADERS),
+            "body": json.dumps(payload, default=json_default)}
+
+
+def parse_body(event):
+    # DynamoDB rejects floats, so keep JSON numbers exact
+    return json.loads(event["body"], parse_float=Decimal)
+
+
+def with_str_id(item):
+    """The table key and the query-string id are strings, so store a JSON number id as one too."""
+    if "id" in item:
+        item["id"] = str(item["id"])
+    return item
+
+
+def create_item(event):
+    body = with_str_id(parse_body(event))
+    get_client("dynamodb").put_item(TableName=TABLE_NAME, Item=serialize_item(body))
+    invalidate_cached(body.get("id"))
+    return json_response({"message": "Item created", "item": body})
+
+
+def get_item(event):
+    """GET /items?id=...; add &consistent=true to bypass the item cache with a strongly consistent read."""
+    query = event["queryStringParameters"]
+    item_id = query["id"]
+    consistent = query.get("consistent", "").lower() == "true"
+    if item_cache is not None and not consistent:
+        cached = item_cache.get(item_id)
+        if cached is not None:
+            return {"statusCode": 200, "headers": dict(CORS_HEADERS), "body": cached}
+
+    response = get_client("dynamodb").get_item(TableName=TABLE_NAME, Key=item_key(item_id),
+                                               ConsistentRead=consistent)
+    result = json_response(deserialize_item(response.get("Item", {})))
+    if item_cache is not None and "Item" in response:
+        item_cache.put(item_id, result["body"])
+    return result
+
+
+def update_item(event):
+    body = with_str_id(parse_body(event))
+    get_client("dynamodb").put_item(TableName=TABLE_NAME, Item=serialize_item(body))
+    invalidate_cached(body.get("id"))
+    return json_response({"message": "Item updated", "item": body})
+
+
+def delete_item(event):
+    item_id = event["queryStringParameters"]["id"]
+    get_client("dynamodb").delete_item(TableName=TABLE_NAME, Key=item_key(item_id))
+    invalidate_cached(item_id)
+    return json_response({"message": f"Item {item_id} deleted"})
+
+
+# ---------- Batch endpoints ----------
+def chunked(values, size):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def out_of_time(seconds=0.0):
+    """True if `seconds` from now is past this invocation's batch deadline."""
+    return request_deadline is not None and time.monotonic() + seconds >= request_deadline
+
+
+def backoff(attempt):
+    """Sleep before retry `attempt`; False without sleeping if that would run past the deadline."""
+    delay = random.uniform(0, BATCH_BACKOFF_BASE * (2 ** attempt))
+    if out_of_time(delay):
+        return False
+    time.sleep(delay)
+    return True
+
+
+def write_request_id(request):
+    if "PutRequest" in request:
+        key = request["PutRequest"]["Item"]["id"]
+    else:
+        key = request["DeleteRequest"]["Key"]["id"]
+    return dynamodb_types()[1].deserialize(key)
+
+
+def batch_write(requests):
+    """
+    Send write requests in BatchWriteItem-sized chunks; return the ids still unprocessed.
+    Chunks not sent before the deadline count as unprocessed.
+    """
+    unprocessed = set()
+    for chunk in chunked(requests, BATCH_WRITE_LIMIT):
+        pending = chunk
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            if out_of_time():
+                break
+            response = get_client("dynamodb").batch_write_item(RequestItems={TABLE_NAME: pending})
+            pending = response.get("UnprocessedItems", {}).get(TABLE_NAME, [])
+            if not pending or attempt == BATCH_MAX_RETRIES or not backoff(attempt):
+                break
+        unprocessed.update(write_request_id(r) for r in pending)
+    return unprocessed
+
+
+def batch_get(item_ids):
+    """
+    Fetch ids in BatchGetItem-sized chunks; return ({id: item}, ids still unprocessed).
+    Chunks not fetched before the deadline count as unprocessed.
+    """
+    found, unprocessed = {}, set()
+    for chunk in chunked(item_ids, BATCH_GET_LIMIT):
+        keys = [item_key(item_id) for item_id in chunk]
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            if out_of_time():
+                break
+            response = get_client("dynamodb").batch_get_item(RequestItems={TABLE_NAME: {"Keys": keys}})
+            for attributes in response.get("Responses", {}).get(TABLE_NAME, []):
+                item = deserialize_item(attributes)
+                found[item["id"]] = item
+            keys = response.get("UnprocessedKeys", {}).get(TABLE_NAME, {}).get("Keys", [])
+            if not keys or attempt == BATCH_MAX_RETRIES or not backoff(attempt):
+                break
+        unprocessed.update(key["id"]["S"] for key in keys)
+    return found, unprocessed
+
+
+def batch_ids(event):
+    """Ids from ?ids=a,b,c or a JSON body {"ids": [...]}, de-duplicated in order."""
+    query = event.get("queryStringParameters") or {}
+    if query.get("ids"):
+        ids = query["ids"].split(",")
+    else:
+        ids = json.loads(event.get("body") or "{}").get("ids", [])
+    return list(dict.fromkeys(str(item_id).strip() for item_id in ids if str(item_id).strip()))
+
+
+def too_many(count):
+    return json_response({"error": f"At most {BATCH_MAX_ITEMS} items per batch request, got {count}"}, 400)
+
+
+def batch_create_items(event):
+    body = parse_body(event)
+    items = body.get("items", []) if isinstance(body, dict) else body
+    if len(items) > BATCH_MAX_ITEMS:
+        return too_many(len(items))
+
+    results, valid = [], {}
+    for item in items:
+        if not isinstance(item, dict) or "id" not in item:
+            results.append({"id": None, "status": "error", "error": "Item must be an object with an id"})
+        else:
+            valid[with_str_id(item)["id"]] = item  # BatchWriteItem rejects duplicate keys; last one wins
+
+    unprocessed = batch_write([{"PutRequest": {"Item": serialize_item(item)}} for item in valid.values()])
+    invalidate_cached(*valid)
+    results += [{"id": item_id, "status": "unprocessed" if item_id in unprocessed else "created"}
+                for item_id in valid]
+    return json_response({"message": f"{len(valid) - len(unprocessed)} items created", "results": results})
+
+
+def batch_get_items(event):
+    ids = batch_ids(event)
+    if len(ids) > BATCH_MAX_ITEMS:
+        return too_many(len(ids))
+
+    found, unprocessed = batch_get(ids)
+    results = []
+    for item_id in ids:
+        if item_id in found:
+            results.append({"id": item_id, "status": "found", "item": found[item_id]})
+        else:
+            results.append({"id": item_id, "status": "unprocessed" if item_id in unprocessed else "not_found"})
+    return json_response({"results": results})
+
+
+def batch_delete_items(event):
+    ids = batch_ids(event)
+    if len(ids) > BATCH_MAX_ITEMS:
+        return too_many(len(ids))
+
+    unprocessed = batch_write([{"DeleteRequest": {"Key": item_key(item_id)}} for item_id in ids])
+    invalidate_cached(*ids)
+    results = [{"id": item_id, "status": "unprocessed" if item_id in unprocessed else "deleted"}
+               for item_id in ids]
+    return json_response({"message": f"{len(ids) - len(unprocessed)} items deleted", "results": results})
+
+
+# ---------- List endpoint ----------
+def encode_cursor(last_evaluated_key):
+    raw = json.dumps(last_evaluated_key, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+
+def list_items(event):
+    """One page of a table scan: ?limit=&cursor= and optionally ?segment=&total_segments=.
+
+    Only the requested page is held in memory; pass next_cursor back to continue.
+    For a parallel scan each caller scans its own segment with the same total_segments.
+    """
+    query = event.get("queryStringParameters") or {}
     try:
-        cloudwatch.put_metric_data(
-            Namespace=NAMESPACE,
-            MetricData=[
-                {
-                    "MetricName": metric_name,
-                    "Dimensions": [
-                        {"Name": "FunctionName", "Value": "helloLambda"},
-                        {"Name": "Stage", "Value": STAGE}
-                    ],
-                    "Value": 1,
-                    "Unit": "Count"
-                }
-            ]
-        )
-        logger.info(f"Published metric: {metric_name}=1")
-    except Exception as e:
-        logger.error(f"Failed to publish {metric_name}: {e}")
+        limit = int(query.get("limit", LIST_DEFAULT_LIMIT))
+        scan_kwargs = {"TableName": TABLE_NAME, "Limit": max(1, min(limit, LIST_MAX_LIMIT))}
+        if query.get("cursor"):
+            scan_kwargs["ExclusiveStartKey"] = decode_cursor(query["cursor"])
+        if "total_segments" in query:
+            scan_kwargs["TotalSegments"] = int(query["total_segments"])
+            scan_kwargs["Segment"] = int(query.get("segment", 0))
+            if not 0 <= scan_kwargs["Segment"] < scan_kwargs["TotalSegments"]:
+                raise ValueError("segment must be between 0 and total_segments - 1")
+    except ValueError as e:
+        return json_response({"error": f"Invalid list parameters: {e}"}, 400)
 
-def lambda_handler(event, context):
-    global IS_COLD_START
+    response = get_client("dynamodb").scan(**scan_kwargs)
+    items = [deserialize_item(attributes) for attributes in response.get("Items", [])]
+    last_key = response.get("LastEvaluatedKey")
+    return json_response({
+        "items": items,
+        "count": len(items),
+        "next_cursor": encode_cursor(last_key) if last_key else None
+    })
 
-    logger.info("Received event: %s", json.dumps(event))
+
+# (method, path) -> handler; lookups cost the same however many routes are added
+ROUTES = {
+    ("POST", ITEMS_PATH): create_item,
+    ("GET", ITEMS_PATH): get_item,
+    ("PUT", ITEMS_PATH): update_item,
+    ("DELETE", ITEMS_PATH): delete_item,
+    ("POST", BATCH_PATH): batch_create_items,
+    ("GET", BATCH_PATH): batch_get_items,
+    ("DELETE", BATCH_PATH): batch_delete_items,
+    ("GET", LIST_PATH): list_items,
+}
+
+
+def resolve_request(event):
+    """Return (method, path) for HTTP API v2, REST API v1 and direct-invoke test events."""
+    request_context = event.get("requestContext")
+    if request_context and "http" in request_context:  # HTTP API v2
+        return request_context["http"].get("method"), event.get("rawPath", "/")
+    return event.get("httpMethod"), event.get("path", "/")  # REST API v1 or test event
+
+
+def lambda_handler(event, context):
+    global IS_COLD_START, request_deadline
 
     # Cold start detection (fires once per container lifecycle)
     if IS_COLD_START:
@@ -52,63 +511,36 @@ def lambda_handler(event, context):
     # Always track requests
     publish_metric("RequestsProcessed")
 
-    # Detect method + path
-    if "requestContext" in event and "http" in event["requestContext"]:  # HTTP API v2
-        method = event["requestContext"]["http"].get("method")
-        path = event.get("rawPath", "/")
-    else:  # REST API v1 or test event
-        method = event.get("httpMethod")
-        path = event.get("path", "/")
-
-    cors_headers = {
-        "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type,Authorization"
-    }
-
-    if method == "OPTIONS":
-        return {"statusCode": 200, "headers": cors_headers, "body": ""}
+    budget = API_GATEWAY_TIMEOUT
+    if context is not None:
+        budget = min(budget, context.get_remaining_time_in_millis() / 1000)
+    request_deadline = time.monotonic() + budget - BATCH_DEADLINE_MARGIN
 
     try:
-        # Root endpoint
-        if path in ["", "/", f"/{STAGE}", f"/{STAGE}/"]:
-            return {
-                "statusCode": 200,
-                "headers": {**cors_headers, "Content-Type": "application/json"},
-                "body": '{"message": "Hello from Lambda CRUD API!"}'
-            }
+        return handle_request(event)
+    finally:
+        request_deadline = None
+        if metrics.due():
+            metrics.flush()
 
-        # POST /items
-        elif path == f"/{STAGE}/items" and method == "POST":
-            body = json.loads(event["body"])
-            table.put_item(Item=body)
-            return {"statusCode": 200, "headers": cors_headers,
-                    "body": json.dumps({"message": "Item created", "item": body})}
-
-        # GET /items?id=123
-        elif path == f"/{STAGE}/items" and method == "GET":
-            item_id = event["queryStringParameters"]["id"]
-            response = table.get_item(Key={"id": item_id})
-            return {"statusCode": 200, "headers": cors_headers,
-                    "body": json.dumps(response.get("Item", {}))}
-
-        # PUT /items
-        elif path == f"/{STAGE}/items" and method == "PUT":
-            body = json.loads(event["body"])
-            table.put_item(Item=body)
-            return {"statusCode": 200, "headers": cors_headers,
-                    "body": json.dumps({"message": "Item updated", "item": body})}
-
-        # DELETE /items?id=123
-        elif path == f"/{STAGE}/items" and method == "DELETE":
-            item_id = event["queryStringParameters"]["id"]
-            table.delete_item(Key={"id": item_id})
-            return {"statusCode": 200, "headers": cors_headers,
-                    "body": json.dumps({"message": f"Item {item_id} deleted"})}
 
-        else:
-            return {"statusCode": 404, "headers": cors_headers, "body": '{"error": "Not Found"}'}
+def handle_request(event):
+    method, path = resolve_request(event)
+    logger.info("Received %s %s", method, path)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received event: %s", json.dumps(event))
 
+    # Fast paths: fixed responses, no JSON work
+    if method == "OPTIONS":
+        return fixed_response(OPTIONS_RESPONSE)
+    if path in ROOT_PATHS:
+        return fixed_response(ROOT_RESPONSE)
+    handler = ROUTES.get((method, path))
+    if handler is None:
+        return fixed_response(NOT_FOUND_RESPONSE)
+
+    try:
+        return handler(event)
     except Exception as e:
         logger.error(f"Error: {str(e)}")
-        return {"statusCode": 500, "headers": cors_headers, "body": json.dumps({"error": str(e)})}
+        return json_response({"error": str(e)}, 500)
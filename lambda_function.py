@@ -1,13 +1,10 @@
 import json
 import logging
-import boto3
 import os
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# CloudWatch client
-cloudwatch = boto3.client("cloudwatch")
 NAMESPACE = "QAFramework/Serverless"
 METRIC_NAME = "RequestsProcessed"
 STAGE = os.getenv("STAGE", "dev")
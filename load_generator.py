@@ -1,14 +1,350 @@
-import requests
+import argparse
+import asyncio
+import base64
+import json
+import math
+import os
+import random
+import ssl
+import sys
 import time
+from collections import Counter
+from urllib.parse import urlsplit
 
-URL = "http://127.0.0.1:5050/"
+# ---------- Open-loop load generator ----------
+# Sends requests on a fixed schedule of intended send times (constant rate, or
+# linear ramps between rates), whatever the server's response time. Latency is
+# measured from each request's intended send time, so when the server stalls,
+# the requests that should have gone out during the stall count the wait. A
+# closed loop (send, wait for the response, send again) would simply not send
+# them, which is coordinated omission. The time from the actual send is recorded
+# too ("uncorrected") for comparison.
+#
+# One asyncio process with a pool of keep-alive HTTP/1.1 connections on asyncio
+# streams (no client library per request). Latencies go into mergeable 1%
+# sketches (src/utils/latency_sketch.py), printed as an HdrHistogram-style
+# percentile spectrum.
+#
+#   python load_generator.py --stage 1000:10 --stage 1000-10000:30 --stage 10000:30
+#   python load_generator.py --url http://127.0.0.1:5050/ --stage 200:60 --output reports/load.json
 
-print("🚀 Sending continuous requests to Flask app...")
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from src.utils.latency_sketch import LatencySketch  # noqa: E402
+
+DEFAULT_URL = "http://127.0.0.1:5050/"
+SPECTRUM_TICKS_PER_HALF = 5
+
+
+# ---------- Rate profiles ----------
+def parse_stage(text):
+    """'RATE:SECONDS' (constant) or 'FROM-TO:SECONDS' (linear ramp) -> (from_rate, to_rate, seconds)."""
+    rates, _, seconds = text.partition(":")
+    low, _, high = rates.partition("-")
+    stage = (float(low), float(high or low), float(seconds))
+    if min(stage) < 0 or not stage[2] or not (stage[0] or stage[1]):
+        raise ValueError(f"Invalid stage {text!r}: expected RATE:SECONDS or FROM-TO:SECONDS")
+    return stage
+
+
+def schedule(stages, poisson=False, rng=None):
+    """
+    Intended send offsets (seconds from the start) for a list of (from_rate, to_rate, seconds) stages.
+    Within a stage the rate changes linearly; the i-th request of a stage is sent when the expected
+    count r0*t + (r1 - r0)*t^2 / (2*d) reaches i. With poisson=True the count advances by
+    exponential steps instead of 1, giving Poisson arrivals at the same rate.
+    """
+    rng = rng or random.Random()
+    offset = 0.0
+    for r0, r1, d in stages:
+        slope = (r1 - r0) / d
+        total = (r0 + r1) / 2 * d
+        n = rng.expovariate(1.0) if poisson else 0.0
+        while n < total:
+            # Solve r0*t + slope*t^2/2 = n for t in [0, d]
+            t = n / r0 if slope == 0 else (-r0 + math.sqrt(r0 * r0 + 2 * slope * n)) / slope
+            yield offset + t
+            n += rng.expovariate(1.0) if poisson else 1.0
+        offset += d
+
+
+# ---------- HTTP/1.1 connections ----------
+class Connection:
+    """One keep-alive HTTP/1.1 connection; request() returns the status code."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    @classmethod
+    async def open(cls, host, port, ssl_context=None):
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        return cls(reader, writer)
+
+    async def request(self, payload, head_request=False):
+        """:param head_request: the request is a HEAD, so the response has no body whatever its headers say"""
+        self.writer.write(payload)
+        while True:
+            head = await self.reader.readuntil(b"\r\n\r\n")
+            lines = head.split(b"\r\n")
+            status = int(lines[0][9:12])
+            if not 100 <= status < 200 or status == 101:
+                break  # interim responses (100 Continue, 103 Early Hints) precede the real one
+        length, chunked = None, False
+        keep_alive = lines[0].startswith(b"HTTP/1.1")
+        for line in lines[1:]:
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"content-length":
+                length = int(value)
+            elif name == b"transfer-encoding":
+                chunked = b"chunked" in value.lower()
+            elif name == b"connection":
+                keep_alive = value.strip().lower() == b"keep-alive"
+        if head_request or 100 <= status < 200 or status in (204, 304):
+            pass  # no body by definition; Content-Length, if any, describes the GET body
+        elif chunked:
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                await self.reader.readexactly(size + 2)
+                if not size:
+                    break
+        elif length is not None:
+            await self.reader.readexactly(length)
+        else:
+            await self.reader.read()  # body ends when the server closes
+            keep_alive = False
+        self.reusable = keep_alive and status != 101  # 101: no longer speaking HTTP
+        return status
+
+    def close(self):
+        self.reusable = False
+        self.writer.close()
+
+
+# ---------- Generator ----------
+class OpenLoopGenerator:
+    """
+    Fires requests at the scheduled times over a pool of `connections` keep-alive connections.
+    A request that finds every connection busy waits for one; that wait is part of its
+    (corrected) latency. More than `max_in_flight` outstanding requests means the target is
+    not keeping up: further requests are counted as dropped instead of queued without bound.
+    """
+
+    def __init__(self, url, connections=64, max_in_flight=20000, timeout=10.0, method="GET", body=None,
+                 headers=None, report_interval=1.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl_context = ssl.create_default_context() if parts.scheme == "https" else None
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        body = body.encode() if isinstance(body, str) else (body or b"")
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc}", "Connection: keep-alive",
+                 *(f"{k}: {v}" for k, v in (headers or {}).items())]
+        if body or method in ("POST", "PUT", "PATCH"):
+            lines.append(f"Content-Length: {len(body)}")
+        self.payload = ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+        self.head_request = method.upper() == "HEAD"
+        self.connections = connections
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.report_interval = report_interval
+
+        self.corrected = LatencySketch()
+        self.uncorrected = LatencySketch()
+        self.interval = LatencySketch()
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.sent = self.completed = self.dropped = self.in_flight = 0
+        self.timeline = []
+
+    async def fire(self, due):
+        loop = asyncio.get_running_loop()
+        conn = await self.idle.get()
+        sent = loop.time()
+        try:
+            async with asyncio.timeout(self.timeout):
+                if conn is None:
+                    conn = await Connection.open(self.host, self.port, self.ssl_context)
+                status = await conn.request(self.payload, self.head_request)
+            self.statuses[status] += 1
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, TimeoutError, ValueError) as e:
+            self.errors[type(e).__name__] += 1
+            if conn is not None:
+                conn.close()
+        finally:
+            done = loop.time()
+            # A dead connection leaves a placeholder: the next request opens a new one
+            self.idle.put_nowait(conn if conn is not None and conn.reusable else None)
+            self.in_flight -= 1
+            self.completed += 1
+        latency_ms = (done - due) * 1000
+        self.corrected.add(latency_ms)
+        self.interval.add(latency_ms)
+        self.uncorrected.add((done - sent) * 1000)
+
+    async def report(self, start, stages):
+        loop = asyncio.get_running_loop()
+        last_sent = last_completed = 0
+        while True:
+            await asyncio.sleep(self.report_interval)
+            elapsed = loop.time() - start
+            target = target_rate(stages, elapsed)
+            point = {"t": round(elapsed, 1), "target_rps": round(target, 1),
+                     "sent_rps": round((self.sent - last_sent) / self.report_interval, 1),
+                     "completed_rps": round((self.completed - last_completed) / self.report_interval, 1),
+                     "in_flight": self.in_flight, "errors": sum(self.errors.values()), "dropped": self.dropped,
+                     **{k: round(v, 2) if v is not None else None
+                        for k, v in self.interval.percentiles((50, 99)).items()}}
+            self.timeline.append(point)
+            print(f"t={point['t']:6.1f}s target={point['target_rps']:8.1f}/s sent={point['sent_rps']:8.1f}/s "
+                  f"done={point['completed_rps']:8.1f}/s in-flight={point['in_flight']:5d} "
+                  f"p50={point['p50']} p99={point['p99']} ms errors={point['errors']} dropped={point['dropped']}",
+                  flush=True)
+            last_sent, last_completed = self.sent, self.completed
+            self.interval = LatencySketch()
+
+    async def run(self, stages, poisson=False, quiet=False):
+        """Run the rate profile, then wait for outstanding requests; returns results()."""
+        loop = asyncio.get_running_loop()
+        self.idle = asyncio.Queue()
+        for _ in range(self.connections):
+            self.idle.put_nowait(None)
+        tasks = set()
+        start = loop.time()
+        reporter = None if quiet else loop.create_task(self.report(start, stages))
+        fired = 0
+        for offset in schedule(stages, poisson):
+            due = start + offset
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif fired % 64 == 0:
+                await asyncio.sleep(0)  # behind schedule: still let responses in
+            fired += 1
+            if self.in_flight >= self.max_in_flight:
+                self.dropped += 1
+                continue
+            self.in_flight += 1
+            self.sent += 1
+            task = loop.create_task(self.fire(due))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        self.duration = loop.time() - start
+        if tasks:
+            await asyncio.wait(tasks)
+        self.drained = loop.time() - start
+        if reporter:
+            reporter.cancel()
+        while not self.idle.empty():
+            conn = self.idle.get_nowait()
+            if conn is not None:
+                conn.close()
+        return self.results(stages)
+
+    def results(self, stages):
+        spectrum_percentiles = (50, 75, 90, 99, 99.9, 99.99, 99.999)
+        return {
+            "url": f"{self.host}:{self.port}",
+            "stages": [{"from_rps": a, "to_rps": b, "seconds": d} for a, b, d in stages],
+            "duration_s": round(self.duration, 3),
+            "sent": self.sent, "completed": self.completed, "dropped": self.dropped,
+            "achieved_rps": round(self.sent / self.duration, 1) if self.duration else None,
+            # Until the last response: below the target rate when the server falls behind
+            "completed_rps": round(self.completed / self.drained, 1) if self.drained else None,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+            "latency_ms": {k: round(v, 3) if v is not None else None
+                           for k, v in self.corrected.percentiles(spectrum_percentiles).items()},
+            "uncorrected_latency_ms": {k: round(v, 3) if v is not None else None
+                                       for k, v in self.uncorrected.percentiles(spectrum_percentiles).items()},
+            "max_ms": self.corrected.max if self.corrected.count else None,
+            "sketch": base64.b64encode(self.corrected.to_bytes()).decode("ascii"),
+            "uncorrected_sketch": base64.b64encode(self.uncorrected.to_bytes()).decode("ascii"),
+            "timeline": self.timeline,
+        }
+
+
+def target_rate(stages, elapsed):
+    for r0, r1, d in stages:
+        if elapsed < d:
+            return r0 + (r1 - r0) * elapsed / d
+        elapsed -= d
+    return 0.0
+
+
+# ---------- Output ----------
+def percentile_spectrum(sketch, ticks_per_half=SPECTRUM_TICKS_PER_HALF):
+    """
+    HdrHistogram-style percentile distribution: rows (value_ms, quantile, count at or below, 1/(1-q)),
+    with `ticks_per_half` rows per halving of the remaining distance to 100%.
+    """
+    rows = []
+    if not sketch.count:
+        return rows
+    q, halving = 0.0, 0
+    while q < 1.0 - 1.0 / sketch.count:
+        for tick in range(ticks_per_half):
+            q = 1.0 - 0.5 ** (halving + tick / ticks_per_half)
+            rows.append((sketch.quantile(q), q, round(q * sketch.count), 1.0 / (1.0 - q)))
+        halving += 1
+    rows.append((sketch.max, 1.0, sketch.count, math.inf))
+    return rows
+
+
+def format_results(results, corrected):
+    lines = [f"{results['sent']} requests in {results['duration_s']} s: {results['achieved_rps']} req/s sent, "
+             f"{results['completed_rps']} req/s completed, {results['dropped']} dropped, statuses {results['statuses']}, errors {results['errors']}",
+             "Latency from intended send time (coordinated-omission corrected), ms:"]
+    lines += [f"  {name:>7} {value}" for name, value in results["latency_ms"].items()]
+    lines.append("Uncorrected (from actual send), ms: "
+                 + " ".join(f"{k}={v}" for k, v in results["uncorrected_latency_ms"].items()))
+    lines.append(f"{'Value (ms)':>12} {'Percentile':>14} {'TotalCount':>11} {'1/(1-Percentile)':>17}")
+    for value, q, count, inverse in percentile_spectrum(corrected):
+        lines.append(f"{value:12.3f} {q:14.12f} {count:11d} {inverse:17.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop, constant-arrival-rate HTTP load generator")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--stage", action="append", type=parse_stage, metavar="RATE:SECONDS|FROM-TO:SECONDS",
+                        help="Rate profile stage, repeatable (default: 100:10)")
+    parser.add_argument("--connections", type=int, default=64, help="Keep-alive connection pool size")
+    parser.add_argument("--max-in-flight", type=int, default=20000)
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout (s)")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--body", help="Request body (e.g. JSON)")
+    parser.add_argument("--header", action="append", default=[], metavar="NAME:VALUE")
+    parser.add_argument("--poisson", action="store_true", help="Poisson arrivals instead of evenly spaced")
+    parser.add_argument("--output", help="Write results (with serialized latency sketches) as JSON")
+    args = parser.parse_args(argv)
 
-while True:
     try:
-        response = requests.get(URL)
-        print(f"Response: {response.status_code}")
-    except Exception as e:
-        print(f"Error: {e}")
-    time.sleep(0.2)  # adjust to send ~5 requests/second
+        import uvloop  # optional: a faster event loop
+        uvloop.install()
+    except ImportError:
+        pass
+    headers = dict(h.split(":", 1) for h in args.header)
+    stages = args.stage or [parse_stage("100:10")]
+    generator = OpenLoopGenerator(args.url, args.connections, args.max_in_flight, args.timeout, args.method,
+                                  args.body, {k.strip(): v.strip() for k, v in headers.items()})
+    print(f"🚀 Open-loop load on {args.url}: " + ", ".join(
+        f"{a:g}/s for {d:g}s" if a == b else f"{a:g}->{b:g}/s over {d:g}s" for a, b, d in stages))
+    start = time.perf_counter()
+    results = asyncio.run(generator.run(stages, args.poisson))
+    results["wall_s"] = round(time.perf_counter() - start, 3)
+    print(format_results(results, generator.corrected))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Dashboard build time with a long metrics history: the per-suite *_history.csv
+files (appended and fully re-read with pd.read_csv on every build) versus the
+SQLite history store (dedup by run id, indexed "last N days" trend reads).
+
+Each variant runs generate_dashboard.py end to end in a scratch copy of
+reports/ seeded with N synthetic runs per suite (pytest, robot, locust) spread
+over two years; the CSV variant uses generate_dashboard.py from --baseline-rev.
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_dashboard_history.py --runs 100000
+"""
+import argparse
+import csv
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from src.utils.history_store import HistoryStore, TIMESTAMP_FORMAT  # noqa: E402
+
+SUITES = {
+    "pytest": ["tests", "failures", "errors", "skipped"],
+    "robot": ["total", "pass", "fail"],
+    "locust": ["requests", "failures", "avg_response_time"],
+}
+
+
+def synthetic_runs(runs, seed=1):
+    """(timestamp, {suite: metrics}) for `runs` CI runs ending now, oldest first."""
+    rng = random.Random(seed)
+    end = datetime.now()
+    step = timedelta(days=730) / runs
+    for i in range(runs):
+        failures = int(rng.random() < 0.1)
+        yield (end - step * (runs - i)).strftime(TIMESTAMP_FORMAT), {
+            "pytest": {"tests": 12, "failures": failures, "errors": 0, "skipped": int(rng.random() < 0.3)},
+            "robot": {"total": 5, "pass": 5 - failures, "fail": failures},
+            "locust": {"requests": rng.randint(500, 700), "failures": rng.randint(0, 5),
+                       "avg_response_time": round(rng.lognormvariate(5.5, 0.3), 2)},
+        }
+
+
+def seed_csvs(reports, runs):
+    files = {suite: open(os.path.join(reports, f"{suite}_history.csv"), "w", newline="") for suite in SUITES}
+    writers = {suite: csv.writer(f) for suite, f in files.items()}
+    for suite, columns in SUITES.items():
+        writers[suite].writerow(["timestamp"] + columns)
+    for timestamp, metrics in synthetic_runs(runs):
+        for suite, columns in SUITES.items():
+            writers[suite].writerow([timestamp] + [metrics[suite][c] for c in columns])
+    for f in files.values():
+        f.close()
+
+
+def seed_store(reports, runs):
+    with HistoryStore(os.path.join(reports, "history.sqlite3")) as store:
+        history = list(synthetic_runs(runs))
+        for suite in SUITES:
+            store.record_many(suite, ((f"synthetic:{i}", timestamp, "", metrics[suite])
+                                      for i, (timestamp, metrics) in enumerate(history)))
+        # Nothing left to migrate from the checked-in CSVs
+        for path in ("reports/pytest_history.csv", "reports/robot_history.csv", "reports/locust_history.csv",
+                     "reports/cw_coldstart_history.csv", "reports/cw_processed_history.csv"):
+            store.db.execute("INSERT OR IGNORE INTO migrations VALUES (?, ?, 0, 0)",
+                             (os.path.normpath(path), datetime.now().strftime(TIMESTAMP_FORMAT)))
+        store.db.commit()
+
+
+def scratch_copy(script_source):
+    workdir = tempfile.mkdtemp(prefix="qa_dashboard_bench_")
+    shutil.copytree(os.path.join(REPO_ROOT, "reports"), os.path.join(workdir, "reports"),
+                    ignore=shutil.ignore_patterns("*_history.csv", "history.sqlite3*"))
+    with open(os.path.join(workdir, "generate_dashboard.py"), "w", encoding="utf-8") as f:
+        f.write(script_source)
+    return workdir
+
+
+def build(workdir, extra_args=()):
+    env = {**os.environ, "AWS_DEFAULT_REGION": "us-east-1",
+           "PYTHONPATH": os.pathsep.join(filter(None, [REPO_ROOT, os.getenv("PYTHONPATH")]))}
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "generate_dashboard.py", *extra_args], cwd=workdir, env=env,
+                   check=True, capture_output=True)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(os.path.join(workdir, "reports", "robot", "Dashboard.html"))
+    return elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=100000, help="Synthetic history runs per suite")
+    parser.add_argument("--baseline-rev", default=None,
+                        help="git revision with the CSV-based generate_dashboard.py (default: root commit)")
+    parser.add_argument("--builds", type=int, default=3)
+    args = parser.parse_args()
+
+    rev = args.baseline_rev or subprocess.run(
+        ["git", "rev-list", "--max-parents=0", "HEAD"], cwd=REPO_ROOT,
+        capture_output=True, text=True, check=True).stdout.split()[0]
+    baseline = subprocess.run(["git", "show", f"{rev}:generate_dashboard.py"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout
+    with open(os.path.join(REPO_ROOT, "generate_dashboard.py"), encoding="utf-8") as f:
+        current = f.read()
+
+    variants = [
+        ("csv (baseline)", baseline, seed_csvs, ()),
+        # --force: every build re-parses and re-renders instead of reusing the cached sections
+        ("sqlite, last 30 days", current, seed_store, ("--history-days", "30", "--force")),
+        ("sqlite, all history", current, seed_store, ("--history-days", "0", "--force")),
+    ]
+    print(f"{args.runs} synthetic runs per suite, median of {args.builds} builds")
+    for label, source, seed, extra in variants:
+        workdir = scratch_copy(source)
+        try:
+            start = time.perf_counter()
+            seed(os.path.join(workdir, "reports"), args.runs)
+            seeded = time.perf_counter() - start
+            results = sorted(build(workdir, extra) for _ in range(args.builds))
+            elapsed, size = results[len(results) // 2]
+            print(f"{label:<22} build={elapsed:7.2f} s  dashboard={size / 1e6:7.1f} MB  (seeding {seeded:.1f} s)")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Dashboard page weight and build time: the default output (every figure inlines
+plotly.js, full-resolution trends) versus --lite (plotly.js loaded once from a
+file next to the page, figures as compact JSON without their template, trends
+min/max downsampled to --max-points per series).
+
+Each variant builds generate_dashboard.py with --force in a scratch copy of
+reports/ seeded with N synthetic runs per suite (see bench_dashboard_history.py)
+and plots all of it (--history-days 0). Sizes are reported raw and gzipped, as
+GitHub Pages serves them; the shared plotly.js is counted once.
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_dashboard_size.py --runs 100000
+"""
+import argparse
+import gzip
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_dashboard_history import REPO_ROOT, scratch_copy, seed_store  # noqa: E402
+
+
+def build(workdir, extra_args):
+    env = {**os.environ, "AWS_DEFAULT_REGION": "us-east-1",
+           "PYTHONPATH": os.pathsep.join(filter(None, [REPO_ROOT, os.getenv("PYTHONPATH")]))}
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "generate_dashboard.py", "--force", "--workers", "0", "--history-days", "0",
+                    *extra_args], cwd=workdir, env=env, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def page_weight(workdir):
+    """(page bytes, page gzipped, shared script bytes, shared script gzipped)"""
+    page_dir = os.path.join(workdir, "reports", "robot")
+    with open(os.path.join(page_dir, "Dashboard.html"), "rb") as f:
+        page = f.read()
+    shared = b""
+    for name in re.findall(rb'<script src="([^"]+)"', page):
+        with open(os.path.join(page_dir, name.decode()), "rb") as f:
+            shared += f.read()
+    return len(page), len(gzip.compress(page, 6)), len(shared), len(gzip.compress(shared, 6)) if shared else 0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=100000, help="Synthetic history runs per suite")
+    parser.add_argument("--max-points", type=int, default=2000)
+    parser.add_argument("--builds", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(os.path.join(REPO_ROOT, "generate_dashboard.py"), encoding="utf-8") as f:
+        source = f.read()
+    workdir = scratch_copy(source)
+    try:
+        seed_store(os.path.join(workdir, "reports"), args.runs)
+        print(f"{args.runs} synthetic runs per suite, all history plotted, median of {args.builds} builds")
+        for label, extra in (("default", ()), ("--lite", ("--lite", "--max-points", str(args.max_points)))):
+            seconds = sorted(build(workdir, extra) for _ in range(args.builds))[args.builds // 2]
+            page, page_gz, shared, shared_gz = page_weight(workdir)
+            print(f"{label:<8} build={seconds:6.2f} s  page={page / 1e6:7.2f} MB (gzip {page_gz / 1e6:6.2f} MB)"
+                  f"  shared plotly.js={shared / 1e6:5.2f} MB (gzip {shared_gz / 1e6:5.2f} MB)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Items/s for loading, verifying and deleting N items through the single-item
+CRUD routes versus the /items/batch routes of lambda_crud_function, against the
+in-memory DynamoDB stand-in with a simulated round-trip per DynamoDB call and
+per API request (API Gateway + Lambda invoke).
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_lambda_batch.py --items 500
+"""
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from lambda_crud import lambda_crud_function as crud  # noqa: E402
+from src.utils.local_aws import LocalDynamoDB  # noqa: E402
+
+
+def make_invoke(request_ms):
+    def invoke(method, path, body=None, query=None):
+        if request_ms:
+            time.sleep(request_ms / 1000.0)
+        event = {"httpMethod": method, "path": f"/{crud.STAGE}{path}",
+                 "body": json.dumps(body) if body is not None else None,
+                 "queryStringParameters": query}
+        return crud.handle_request(event)
+    return invoke
+
+
+def single_item(invoke, items):
+    for item in items:
+        invoke("POST", "/items", item)
+    for item in items:
+        invoke("GET", "/items", query={"id": item["id"]})
+    for item in items:
+        invoke("DELETE", "/items", query={"id": item["id"]})
+
+
+def batch(invoke, items):
+    for i in range(0, len(items), crud.BATCH_MAX_ITEMS):
+        chunk = items[i:i + crud.BATCH_MAX_ITEMS]
+        ids = ",".join(item["id"] for item in chunk)
+        invoke("POST", "/items/batch", {"items": chunk})
+        invoke("GET", "/items/batch", query={"ids": ids})
+        invoke("DELETE", "/items/batch", query={"ids": ids})
+
+
+def run(label, scenario, items, args):
+    dynamodb = LocalDynamoDB(latency_ms=args.dynamodb_ms)
+    crud.clients["dynamodb"] = dynamodb
+    start = time.perf_counter()
+    scenario(make_invoke(args.request_ms), items)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {elapsed:8.2f} s  {3 * len(items) / elapsed:10.1f} item-ops/s  "
+          f"DynamoDB calls={dynamodb.calls}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--dynamodb-ms", type=float, default=5, help="Simulated DynamoDB round-trip")
+    parser.add_argument("--request-ms", type=float, default=30, help="Simulated API Gateway + invoke overhead")
+    args = parser.parse_args()
+
+    items = [{"id": f"bench{i}", "name": f"Item {i}"} for i in range(args.items)]
+    run("single-item", single_item, items, args)
+    run("batch", batch, items, args)
+
+
+if __name__ == "__main__":
+    main()
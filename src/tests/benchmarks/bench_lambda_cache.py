@@ -0,0 +1,53 @@
+"""
+GET /items latency in lambda_crud_function with and without the in-container
+ItemCache, replaying Locust's pattern of reading the same few ids in a tight
+loop against a stubbed table with artificial latency.
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_lambda_cache.py --dynamodb-ms 8
+"""
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from lambda_crud import lambda_crud_function as crud  # noqa: E402
+from src.utils.local_aws import LocalDynamoDB  # noqa: E402
+
+
+def run(label, cache, args):
+    dynamodb = crud.clients["dynamodb"] = LocalDynamoDB(latency_ms=args.dynamodb_ms)
+    for i in range(args.ids):
+        dynamodb.Table(crud.TABLE_NAME)._put({"id": f"loadtest{i}", "name": "Locust Item"})
+    crud.item_cache = cache
+    crud.metrics = crud.MetricsBuffer()
+
+    timings = []
+    for n in range(args.reads):
+        event = {"httpMethod": "GET", "path": crud.ITEMS_PATH,
+                 "queryStringParameters": {"id": f"loadtest{n % args.ids}"}}
+        start = time.perf_counter()
+        crud.handle_request(event)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    counters = crud.metrics.counters
+    print(f"{label:<10} mean={statistics.mean(timings):7.3f} ms  p50={statistics.median(timings):7.3f} ms  "
+          f"DynamoDB calls={dynamodb.calls:<5} hits={counters.get('ItemCacheHits', 0):<5} "
+          f"misses={counters.get('ItemCacheMisses', 0):<5} evictions={counters.get('ItemCacheEvictions', 0)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reads", type=int, default=500)
+    parser.add_argument("--ids", type=int, default=5, help="Distinct ids read in rotation")
+    parser.add_argument("--dynamodb-ms", type=float, default=8, help="Simulated get_item round-trip")
+    args = parser.parse_args()
+
+    run("no cache", None, args)
+    run("cache", crud.ItemCache(ttl=30), args)
+
+
+if __name__ == "__main__":
+    main()
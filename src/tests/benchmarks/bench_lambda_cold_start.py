@@ -0,0 +1,79 @@
+"""
+Cold-start cost of the Lambda handler modules: module import time and
+first/second invocation latency, each run in a fresh interpreter with the AWS
+clients replaced by the local stand-ins, followed by an -X importtime report.
+
+Run from the repo root:
+    python src/tests/benchmarks/bench_lambda_cold_start.py --runs 10
+    python src/tests/benchmarks/bench_lambda_cold_start.py --root /path/to/old/checkout
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from src.utils.importtime import format_report, profile_imports  # noqa: E402
+
+DRIVER = """
+import contextlib, importlib, io, json, sys, time
+start = time.perf_counter()
+handler = importlib.import_module(sys.argv[1])
+imported = time.perf_counter()
+
+from src.utils.local_aws import LocalCloudWatch, LocalDynamoDB
+if hasattr(handler, "clients"):
+    handler.clients.update(cloudwatch=LocalCloudWatch(), dynamodb=LocalDynamoDB())
+elif hasattr(handler, "cloudwatch"):  # handlers that still create clients at import time
+    handler.cloudwatch = LocalCloudWatch()
+
+event = json.loads(sys.argv[2])
+timings = []
+with contextlib.redirect_stdout(io.StringIO()):
+    for _ in range(2):
+        t = time.perf_counter()
+        handler.lambda_handler(event, None)
+        timings.append(time.perf_counter() - t)
+print(json.dumps({"import_ms": (imported - start) * 1000,
+                  "first_ms": timings[0] * 1000, "second_ms": timings[1] * 1000}))
+"""
+
+EVENTS = {
+    "root": {"httpMethod": "GET", "path": "/dev/"},
+    "read": {"httpMethod": "GET", "path": "/dev/items", "queryStringParameters": {"id": "cold1"}},
+}
+AWS_ENV = {"AWS_DEFAULT_REGION": "us-east-1"}
+
+
+def run_fresh(module, root, event):
+    env = {**os.environ, **AWS_ENV, "PYTHONPATH": os.pathsep.join([os.path.abspath(root), REPO_ROOT])}
+    result = subprocess.run([sys.executable, "-c", DRIVER, module, json.dumps(event)],
+                            cwd=root, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--root", default=REPO_ROOT, help="Checkout to import the handlers from")
+    parser.add_argument("--modules", nargs="+", default=["lambda_crud.lambda_crud_function", "lambda_function"])
+    args = parser.parse_args()
+
+    for module in args.modules:
+        print(f"{module}: median of {args.runs} fresh interpreters")
+        for name, event in EVENTS.items():
+            runs = [run_fresh(module, args.root, event) for _ in range(args.runs)]
+            print(f"  {name:<5} " + "  ".join(
+                f"{key}={statistics.median(r[key] for r in runs):8.2f} ms"
+                for key in ("import_ms", "first_ms", "second_ms")))
+        print()
+        print(format_report(profile_imports(module, cwd=args.root, env=AWS_ENV), top=8))
+        print()
+
+
+if __name__ == "__main__":
+    main()
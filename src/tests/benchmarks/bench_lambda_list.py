@@ -0,0 +1,77 @@
+"""
+Per-page latency and peak memory of GET /items/list in lambda_crud_function
+when paging through a large table held in the in-memory DynamoDB stand-in,
+in single-scan and parallel-scan (Segment/TotalSegments) modes.
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_lambda_list.py --items 100000
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from lambda_crud import lambda_crud_function as crud  # noqa: E402
+from src.utils.local_aws import LocalDynamoDB  # noqa: E402
+
+
+def page_through(query):
+    timings, count = [], 0
+    while True:
+        start = time.perf_counter()
+        response = crud.handle_request({"httpMethod": "GET", "path": crud.LIST_PATH,
+                                        "queryStringParameters": query})
+        body = json.loads(response["body"])
+        timings.append((time.perf_counter() - start) * 1000)
+        count += body["count"]
+        if not body["next_cursor"]:
+            return timings, count
+        query = {**query, "cursor": body["next_cursor"]}
+
+
+def report(label, timings, count, peak):
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{label:<24} items={count:<7} pages={len(timings):<5} "
+          f"p50={statistics.median(timings):7.2f} ms  p99={p99:7.2f} ms  "
+          f"total={sum(timings) / 1000:6.2f} s  peak={peak / 1e6:6.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--segments", type=int, default=4)
+    args = parser.parse_args()
+
+    dynamodb = crud.clients["dynamodb"] = LocalDynamoDB()
+    table = dynamodb.Table(crud.TABLE_NAME)
+    for i in range(args.items):
+        table._put({"id": f"item{i:07d}", "name": f"Item {i}", "payload": "x" * 64})
+    table._scan(limit=1)  # build the stand-in's scan index outside the timings
+    table._scan(limit=1, total_segments=args.segments)
+
+    for limit in (100, 1000):
+        tracemalloc.start()
+        timings, count = page_through({"limit": str(limit)})
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        report(f"scan limit={limit}", timings, count, peak)
+
+    tracemalloc.start()
+    all_timings, total = [], 0
+    for segment in range(args.segments):
+        timings, count = page_through({"limit": "1000", "segment": str(segment),
+                                       "total_segments": str(args.segments)})
+        all_timings += timings
+        total += count
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    report(f"parallel {args.segments} segments", all_timings, total, peak)
+
+
+if __name__ == "__main__":
+    main()
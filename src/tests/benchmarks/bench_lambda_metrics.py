@@ -0,0 +1,84 @@
+"""
+Per-invocation latency of lambda_crud_function with the old synchronous
+put_metric_data-per-metric path versus the buffered MetricsBuffer.
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_lambda_metrics.py --latency-ms 15
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from lambda_crud import lambda_crud_function as crud  # noqa: E402
+from src.utils.local_aws import LocalCloudWatch, LocalDynamoDB  # noqa: E402
+
+
+class SyncMetrics:
+    """The previous behaviour: one blocking put_metric_data per recorded metric."""
+
+    def record(self, metric_name, value=1):
+        crud.get_client("cloudwatch").put_metric_data(
+            Namespace=crud.NAMESPACE,
+            MetricData=[{
+                "MetricName": metric_name,
+                "Dimensions": [{"Name": k, "Value": v} for k, v in crud.METRIC_DIMENSIONS.items()],
+                "Value": value,
+                "Unit": "Count"
+            }]
+        )
+
+    def due(self):
+        return False
+
+    def flush(self):
+        pass
+
+
+def load_events(path="event.json"):
+    with open(path) as f:
+        return list(json.load(f).values())
+
+
+def run(label, sink, events, iterations):
+    crud.metrics = sink
+    crud.IS_COLD_START = True
+    cloudwatch = crud.get_client("cloudwatch")
+    calls_before = cloudwatch.calls
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(iterations):
+            event = events[i % len(events)]
+            start = time.perf_counter()
+            crud.lambda_handler(event, None)
+            timings.append((time.perf_counter() - start) * 1000)
+    api_calls = cloudwatch.calls - calls_before
+    print(f"{label:<28} mean={statistics.mean(timings):8.3f} ms  "
+          f"p50={statistics.median(timings):8.3f} ms  "
+          f"max={max(timings):8.3f} ms  put_metric_data calls={api_calls}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=15,
+                        help="Simulated put_metric_data round-trip")
+    args = parser.parse_args()
+
+    crud.clients["cloudwatch"] = LocalCloudWatch(latency_ms=args.latency_ms)
+    crud.clients["dynamodb"] = LocalDynamoDB()
+    events = load_events()
+
+    run("before: sync per metric", SyncMetrics(), events, args.iterations)
+    run("after: emf", crud.MetricsBuffer(mode="emf"), events, args.iterations)
+    run("after: api, per invocation", crud.MetricsBuffer(mode="api"), events, args.iterations)
+    run("after: api, 60s interval", crud.MetricsBuffer(mode="api", flush_interval=60), events, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
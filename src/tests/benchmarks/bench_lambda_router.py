@@ -0,0 +1,140 @@
+"""
+Dispatch cost of lambda_crud_function.handle_request (ROUTES table with
+precomputed headers/responses) versus the previous if/elif chain, replaying
+event.json-style REST v1 events plus HTTP API v2, OPTIONS and 404 events.
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_lambda_router.py
+"""
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from lambda_crud import lambda_crud_function as crud  # noqa: E402
+from src.utils.local_aws import LocalDynamoDB  # noqa: E402
+
+
+def legacy_handle_request(event):
+    """The if/elif dispatch that lambda_handler used before the ROUTES table."""
+    STAGE, table = crud.STAGE, ResourceTable()
+    crud.logger.info("Received event: %s", json.dumps(event))
+
+    # Detect method + path
+    if "requestContext" in event and "http" in event["requestContext"]:  # HTTP API v2
+        method = event["requestContext"]["http"].get("method")
+        path = event.get("rawPath", "/")
+    else:  # REST API v1 or test event
+        method = event.get("httpMethod")
+        path = event.get("path", "/")
+
+    cors_headers = {
+        "Access-Control-Allow-Origin": "*",
+        "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
+        "Access-Control-Allow-Headers": "Content-Type,Authorization"
+    }
+
+    if method == "OPTIONS":
+        return {"statusCode": 200, "headers": cors_headers, "body": ""}
+
+    try:
+        # Root endpoint
+        if path in ["", "/", f"/{STAGE}", f"/{STAGE}/"]:
+            return {
+                "statusCode": 200,
+                "headers": {**cors_headers, "Content-Type": "application/json"},
+                "body": '{"message": "Hello from Lambda CRUD API!"}'
+            }
+
+        # POST /items
+        elif path == f"/{STAGE}/items" and method == "POST":
+            body = json.loads(event["body"])
+            table.put_item(Item=body)
+            return {"statusCode": 200, "headers": cors_headers,
+                    "body": json.dumps({"message": "Item created", "item": body})}
+
+        # GET /items?id=123
+        elif path == f"/{STAGE}/items" and method == "GET":
+            item_id = event["queryStringParameters"]["id"]
+            response = table.get_item(Key={"id": item_id})
+            return {"statusCode": 200, "headers": cors_headers,
+                    "body": json.dumps(response.get("Item", {}))}
+
+        # PUT /items
+        elif path == f"/{STAGE}/items" and method == "PUT":
+            body = json.loads(event["body"])
+            table.put_item(Item=body)
+            return {"statusCode": 200, "headers": cors_headers,
+                    "body": json.dumps({"message": "Item updated", "item": body})}
+
+        # DELETE /items?id=123
+        elif path == f"/{STAGE}/items" and method == "DELETE":
+            item_id = event["queryStringParameters"]["id"]
+            table.delete_item(Key={"id": item_id})
+            return {"statusCode": 200, "headers": cors_headers,
+                    "body": json.dumps({"message": f"Item {item_id} deleted"})}
+
+        else:
+            return {"statusCode": 404, "headers": cors_headers, "body": '{"error": "Not Found"}'}
+
+    except Exception as e:
+        return {"statusCode": 500, "headers": cors_headers, "body": json.dumps({"error": str(e)})}
+
+
+class ResourceTable:
+    """The boto3 Table resource calls the old dispatch made, on top of the client stand-in."""
+
+    def put_item(self, Item):
+        return crud.get_client("dynamodb").put_item(TableName=crud.TABLE_NAME, Item=crud.serialize_item(Item))
+
+    def get_item(self, Key):
+        response = crud.get_client("dynamodb").get_item(TableName=crud.TABLE_NAME, Key=crud.serialize_item(Key))
+        return {"Item": crud.deserialize_item(response["Item"])} if "Item" in response else {}
+
+    def delete_item(self, Key):
+        return crud.get_client("dynamodb").delete_item(TableName=crud.TABLE_NAME, Key=crud.serialize_item(Key))
+
+
+def build_events(path="event.json"):
+    with open(path) as f:
+        events = json.load(f)
+    events["options"] = {"httpMethod": "OPTIONS", "path": "/dev/items"}
+    events["not_found"] = {"httpMethod": "GET", "path": "/dev/this-does-not-exist"}
+    events["v2_read"] = {
+        "rawPath": "/dev/items",
+        "requestContext": {"http": {"method": "GET"}},
+        "queryStringParameters": {"id": "localtest1"}
+    }
+    return events
+
+
+def time_dispatch(dispatch, event, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        dispatch(event)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    crud.clients["dynamodb"] = LocalDynamoDB()
+    events = build_events()
+    for event in events.values():
+        legacy = legacy_handle_request(event)
+        new = crud.handle_request(event)
+        assert (legacy["statusCode"], legacy["body"]) == (new["statusCode"], new["body"]), event
+
+    print(f"{'event':<12}{'if/elif (us)':>14}{'ROUTES (us)':>14}{'speedup':>10}")
+    for name, event in events.items():
+        old_us = time_dispatch(legacy_handle_request, event, args.iterations)
+        new_us = time_dispatch(crud.handle_request, event, args.iterations)
+        print(f"{name:<12}{old_us:>14.2f}{new_us:>14.2f}{old_us / new_us:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
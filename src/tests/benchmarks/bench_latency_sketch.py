@@ -0,0 +1,80 @@
+"""
+Memory and merge speed of the per-endpoint latency sketch (src/utils/latency_sketch.py)
+against keeping raw samples, for 10M synthetic latencies (lognormal, median 150 ms,
+with a 2% slow mode around 1.5 s, like a Lambda API with cold starts).
+
+Reported:
+- ingest time: add_many() in chunks, and add() per value on a prefix (the locustfile
+  listener path);
+- sketch size in memory (buckets) and serialized, versus raw float64 samples;
+- merge time for 1000 per-run sketches, and p50/p95/p99/p99.9 of the merged sketch
+  versus exact numpy percentiles over every sample (relative error).
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_latency_sketch.py --samples 10000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.utils.latency_sketch import LatencySketch, merge_all
+
+
+def samples(rng, size):
+    fast = rng.lognormal(np.log(150), 0.5, size)
+    slow = rng.lognormal(np.log(1500), 0.3, size)
+    return np.where(rng.random(size) < 0.02, slow, fast)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=10_000_000)
+    parser.add_argument("--runs", type=int, default=1000, help="Per-run sketches the samples are split into")
+    parser.add_argument("--per-value", type=int, default=1_000_000, help="Values timed through add() one by one")
+    args = parser.parse_args()
+
+    values = samples(np.random.default_rng(7), args.samples)
+    print(f"{args.samples} samples, raw float64: {values.nbytes / 1e6:.1f} MB")
+
+    start = time.perf_counter()
+    per_run = []
+    for chunk in np.array_split(values, args.runs):
+        sketch = LatencySketch()
+        sketch.add_many(chunk)
+        per_run.append(sketch)
+    print(f"add_many:  {args.samples / (time.perf_counter() - start) / 1e6:.1f} M values/s into {args.runs} sketches")
+
+    one = LatencySketch()
+    prefix = values[:args.per_value].tolist()
+    start = time.perf_counter()
+    for value in prefix:
+        one.add(value)
+    elapsed = time.perf_counter() - start
+    print(f"add:       {elapsed / len(prefix) * 1e9:.0f} ns per value ({len(prefix) / elapsed / 1e6:.2f} M values/s)")
+
+    blobs = [s.to_bytes() for s in per_run]
+    start = time.perf_counter()
+    restored = [LatencySketch.from_bytes(blob) for blob in blobs]
+    decode = time.perf_counter() - start
+    start = time.perf_counter()
+    merged = merge_all(restored)
+    merge = time.perf_counter() - start
+    print(f"merge:     {args.runs} sketches in {merge * 1e3:.1f} ms (+{decode * 1e3:.1f} ms to deserialize)")
+
+    blob = merged.to_bytes()
+    print(f"size:      {len(merged.bins)} buckets, {len(blob)} bytes serialized "
+          f"(per-run sketches: median {sorted(map(len, blobs))[len(blobs) // 2]} bytes); "
+          f"{values.nbytes / len(blob):,.0f}x smaller than raw samples")
+
+    start = time.perf_counter()
+    exact = np.percentile(values, [50, 95, 99, 99.9])
+    exact_time = time.perf_counter() - start
+    estimate = merged.percentiles((50, 95, 99, 99.9))
+    print(f"accuracy:  exact percentiles over raw samples took {exact_time * 1e3:.0f} ms")
+    for (name, value), truth in zip(estimate.items(), exact):
+        print(f"  {name:<6} sketch={value:9.2f} ms  exact={truth:9.2f} ms  error={abs(value - truth) / truth:6.3%}")
+
+
+if __name__ == "__main__":
+    main()
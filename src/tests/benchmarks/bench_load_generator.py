@@ -0,0 +1,96 @@
+"""
+Load-generator capacity: the previous load_generator.py loop (python-requests,
+closed loop) versus the open-loop generator at increasing target rates.
+
+The target is a minimal keep-alive HTTP server in a separate process, so that the
+server is not what limits the numbers. Each row reports the rate actually sent and
+completed, corrected p99, and the generator's own CPU time per request
+(time.process_time of this process). "req/CPU-s" is the most one generator core
+can sustain, even when the server shares the machine. The previous loop also
+slept 0.2 s per request, capping it at 5 req/s. Its row drops the sleep to show
+the per-request cost of requests.get.
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_load_generator.py --rates 1000 5000 10000 --seconds 5
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import requests
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from load_generator import OpenLoopGenerator  # noqa: E402
+
+SERVER = '''
+import asyncio, sys
+
+RESPONSE = b"HTTP/1.1 200 OK\\r\\nContent-Type: text/plain\\r\\nContent-Length: 31\\r\\n\\r\\nHello, QA Framework Monitoring!"
+
+async def handle(reader, writer):
+    try:
+        while await reader.readuntil(b"\\r\\n\\r\\n"):
+            writer.write(RESPONSE)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        writer.close()
+
+async def main():
+    server = await asyncio.start_server(handle, "127.0.0.1", int(sys.argv[1]), backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+asyncio.run(main())
+'''
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def closed_loop(url, seconds):
+    """The previous generator's loop without its sleep: requests.get, one connection per call."""
+    count, start, cpu = 0, time.perf_counter(), time.process_time()
+    while time.perf_counter() - start < seconds:
+        requests.get(url)
+        count += 1
+    return count, time.perf_counter() - start, time.process_time() - cpu
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rates", type=float, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--connections", type=int, default=64)
+    args = parser.parse_args()
+
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/"
+    server = subprocess.Popen([sys.executable, "-c", SERVER, str(port)])
+    try:
+        time.sleep(1)
+        print(f"{'generator':<24} {'sent/s':>9} {'done/s':>9} {'p99 ms':>9} {'req/CPU-s':>10}")
+        count, wall, cpu = closed_loop(url, args.seconds)
+        print(f"{'requests loop, no sleep':<24} {count / wall:9.1f} {count / wall:9.1f} {'-':>9} {count / cpu:10.1f}")
+        for rate in args.rates:
+            generator = OpenLoopGenerator(url, connections=args.connections)
+            cpu = time.process_time()
+            results = asyncio.run(generator.run([(rate, rate, args.seconds)], quiet=True))
+            cpu = time.process_time() - cpu
+            print(f"{f'open loop @ {rate:g}/s':<24} {results['achieved_rps']:9.1f} "
+                  f"{results['completed'] / results['duration_s']:9.1f} {results['latency_ms']['p99']:9.2f} "
+                  f"{results['completed'] / cpu:10.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Per-request cost of the locustfile's request listeners, and what it means at 5k+
+requests/s on one load-generator core.
+
+Every variant fires Locust's request event with Locust's own stats listener
+(RequestStats.log_request, what every runner does) registered, over a mix of
+endpoints and lognormal response times:
+- stats only: Locust's own accounting, the floor;
+- previous: plus the old track_request listener (Counter and default-bucket
+  Histogram label lookups per request) and the latency sketch;
+- current: plus the locustfile's track_latency (latency sketch only). Prometheus
+  metrics come from LocustStatsCollector at scrape time, timed separately.
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_locust_listeners.py --requests 500000
+"""
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+from locust.event import Events
+from locust.stats import RequestStats
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src", "tests", "locust"))
+
+import locustfile  # noqa: E402
+from src.utils.latency_sketch import LatencySketch  # noqa: E402
+from src.utils.locust_prometheus import LocustStatsCollector  # noqa: E402
+
+ENDPOINTS = [("GET", "/"), ("POST", "/items"), ("GET", "/items?id=[id]"), ("PUT", "/items"),
+             ("DELETE", "/items?id=[id]"), ("GET", "/this-does-not-exist")]
+
+
+def previous_listener():
+    """The listener the locustfile had before: prometheus_client updates plus the sketch."""
+    registry = CollectorRegistry()
+    count = Counter("locust_requests_total", "Total number of requests", ["method", "endpoint", "status"],
+                    registry=registry)
+    latency = Histogram("locust_request_latency_seconds", "Request latency", ["method", "endpoint"],
+                        registry=registry)
+    sketches = {}
+
+    def track_request(request_type, name, response_time, response_length, exception, **kwargs):
+        status = "ok" if exception is None else "fail"
+        count.labels(request_type, name, status).inc()
+        latency.labels(request_type, name).observe(response_time / 1000.0)
+        if exception is None:
+            endpoint = f"{request_type} {name}"
+            sketch = sketches.get(endpoint)
+            if sketch is None:
+                sketch = sketches[endpoint] = LatencySketch()
+            sketch.add(response_time)
+    return track_request
+
+
+def run(listener, requests, response_times):
+    events = Events()
+    stats = RequestStats()
+
+    def on_request(request_type, name, response_time, response_length, exception=None, **kwargs):
+        stats.log_request(request_type, name, response_time, response_length)
+        if exception:
+            stats.log_error(request_type, name, exception)
+
+    events.request.add_listener(on_request)
+    if listener:
+        events.request.add_listener(listener)
+    fire = events.request.fire
+    start = time.perf_counter()
+    for i in range(requests):
+        method, name = ENDPOINTS[i % len(ENDPOINTS)]
+        fire(request_type=method, name=name, response_time=response_times[i], response_length=128,
+             exception=None, context={})
+    return (time.perf_counter() - start) / requests, stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500_000)
+    parser.add_argument("--scrapes", type=int, default=200)
+    args = parser.parse_args()
+
+    response_times = np.random.default_rng(5).lognormal(np.log(150), 0.6, args.requests).tolist()
+    floor, stats = run(None, args.requests, response_times)
+    print(f"{args.requests} request events, {len(ENDPOINTS)} endpoints")
+    print(f"{'variant':<12} {'ns/request':>10} {'listener ns':>12} {'core at 5k rps':>15} {'at 10k rps':>11}")
+    for label, listener in (("stats only", None), ("previous", previous_listener()),
+                            ("current", locustfile.track_latency)):
+        per_request = floor if listener is None else run(listener, args.requests, response_times)[0]
+        extra = per_request - floor
+        print(f"{label:<12} {per_request * 1e9:10.0f} {extra * 1e9:12.0f} {per_request * 5000:15.1%} "
+              f"{per_request * 10000:11.1%}")
+
+    registry = CollectorRegistry()
+    registry.register(LocustStatsCollector(SimpleNamespace(runner=SimpleNamespace(stats=stats, user_count=0))))
+    start = time.perf_counter()
+    for _ in range(args.scrapes):
+        generate_latest(registry)
+    scrape = (time.perf_counter() - start) / args.scrapes
+    print(f"scrape of {len(stats.entries)} endpoints: {scrape * 1e3:.2f} ms "
+          f"({scrape / 5 * 100:.3f}% of a core at a 5 s scrape interval)")
+
+
+if __name__ == "__main__":
+    main()
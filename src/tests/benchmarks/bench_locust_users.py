@@ -0,0 +1,111 @@
+"""
+Requests per second per load-generator core: the previous CrudApiUser (HttpUser /
+python-requests, every user on the one "loadtest123" item) versus the current one
+in src/tests/locust/locustfile.py (FastHttpUser, per-user ids, grouped names).
+
+Both run headless without think time against the local API emulator
+(src/utils/local_api.py) with the same metric listeners. Locust's CPU time is read
+from the child's rusage, so "req/CPU-s" is throughput per fully used core even when
+the emulator shares the machine. The local DynamoDB stand-in serializes writes, so
+the old profile's hot-key failures only show against the real table.
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_locust_users.py --users 20 --seconds 20
+"""
+import argparse
+import csv
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+LOCUSTFILE = os.path.join(REPO_ROOT, "src", "tests", "locust", "locustfile.py")
+
+# The previous user class; importing locustfile registers the same request listeners
+LEGACY_LOCUSTFILE = '''
+import os, sys
+sys.path.insert(0, os.path.join({repo_root!r}, "src", "tests", "locust"))
+from locust import HttpUser, task, constant
+from locustfile import NEGATIVE_TESTS  # noqa: F401
+
+
+class LegacyCrudApiUser(HttpUser):
+    wait_time = constant(0)
+
+    @task
+    def call_health(self):
+        self.client.get("/")
+
+    @task
+    def crud_cycle(self):
+        payload = {{"id": "loadtest123", "name": "Locust Item"}}
+        self.client.post("/items", json=payload)
+        self.client.get("/items?id=loadtest123")
+        self.client.put("/items", json={{"id": "loadtest123", "name": "Updated Locust Item"}})
+        self.client.delete("/items?id=loadtest123")
+'''
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_locust(locustfile, host, users, seconds, workdir, label):
+    """Run locust headless; return (requests, failures, wall seconds, CPU seconds of the locust process)."""
+    prefix = os.path.join(workdir, label)
+    env = {**os.environ, "NEGATIVE_TESTS": "false", "TASK_RATE": "0",
+           "LATENCY_SKETCH_FILE": os.path.join(workdir, f"{label}_sketches.json")}
+    start = time.perf_counter()
+    process = subprocess.Popen(["locust", "-f", locustfile, "--headless", "-u", str(users), "-r", str(users),
+                                "-t", f"{seconds}s", "--host", host, "--csv", prefix, "--only-summary",
+                                "--loglevel", "WARNING"], env=env, cwd=workdir,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    with open(f"{prefix}_stats.csv", newline="") as f:
+        total = next(row for row in csv.DictReader(f) if row["Name"] == "Aggregated")
+    return int(total["Request Count"]), int(total["Failure Count"]), wall, usage.ru_utime + usage.ru_stime
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--seconds", type=int, default=20)
+    parser.add_argument("--server-workers", type=int, default=2, help="local_api.py worker processes")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_locust_")
+    port = free_port()
+    server = subprocess.Popen([sys.executable, os.path.join(REPO_ROOT, "src", "utils", "local_api.py"),
+                               "--port", str(port), "--workers", str(args.server_workers),
+                               "--db", os.path.join(workdir, "items.sqlite3")],
+                              env={**os.environ, "PYTHONPATH": REPO_ROOT},
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        time.sleep(2)
+        legacy = os.path.join(workdir, "legacy_locustfile.py")
+        with open(legacy, "w") as f:
+            f.write(LEGACY_LOCUSTFILE.format(repo_root=REPO_ROOT))
+        host = f"http://127.0.0.1:{port}/dev"
+        print(f"{args.users} users, no think time, {args.seconds} s each, local API with "
+              f"{args.server_workers} worker(s)")
+        for label, locustfile in (("HttpUser (previous)", legacy), ("FastHttpUser", LOCUSTFILE)):
+            requests, failures, wall, cpu = run_locust(locustfile, host, args.users, args.seconds, workdir,
+                                                       label.split()[0])
+            print(f"{label:<20} {requests:7d} requests  {failures:5d} failures  {requests / wall:8.1f} req/s  "
+                  f"{requests / cpu:8.1f} req/CPU-s")
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
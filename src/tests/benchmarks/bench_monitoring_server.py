@@ -0,0 +1,115 @@
+"""
+Throughput and p99 of the monitoring app (src/utils/monitoring/app.py) on
+Flask's development server versus gunicorn (src/utils/monitoring/serve.py),
+under the open-loop load generator (load_generator.py).
+
+Each server gets the same stepped target rates, after a warm-up. Each row
+reports the rate completed (up to the last response), p99 measured from the
+intended send time, and errors. Above capacity, p99 grows with the length of
+the step instead of staying flat. The last line per server is the highest rate
+whose p99 stayed within --slo-ms. The generator runs in this process and shares
+the machine with the server, so compare servers against each other and not
+against the absolute numbers.
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_monitoring_server.py --rates 250 500 1000 2000 --seconds 5
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from load_generator import OpenLoopGenerator  # noqa: E402
+
+DEV_SERVER = ("import sys; sys.path.insert(0, {root!r}); from src.utils.monitoring.app import app; "
+              "app.run(port={port})")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url, timeout=15):
+    """Until the app answers: gunicorn binds the port before its workers have imported it."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url, timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not start")
+
+
+def start_server(kind, port, workers, threads, metrics_dir):
+    env = {key: value for key, value in os.environ.items() if key != "PROMETHEUS_MULTIPROC_DIR"}
+    if kind == "dev":
+        command = [sys.executable, "-c", DEV_SERVER.format(root=REPO_ROOT, port=port)]
+    else:
+        command = [sys.executable, os.path.join(REPO_ROOT, "src", "utils", "monitoring", "serve.py"),
+                   "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+                   "--threads", str(threads), "--metrics-dir", metrics_dir]
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rates", type=float, nargs="+", default=[250, 500, 1000, 2000])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--workers", type=int, default=(os.cpu_count() or 1) * 2 + 1)
+    parser.add_argument("--threads", type=int, default=4, help="Threads per worker for the gthread variant")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--slo-ms", type=float, default=50, help="p99 bound for the sustainable rate")
+    args = parser.parse_args()
+
+    variants = [("Flask dev server", "dev", 1, 1),
+                (f"gunicorn sync x{args.workers}", "gunicorn", args.workers, 1),
+                (f"gunicorn gthread x{args.workers}x{args.threads}", "gunicorn", args.workers, args.threads)]
+    metrics_dir = tempfile.mkdtemp(prefix="bench_monitoring_")
+    print(f"{os.cpu_count()} CPU(s), {args.seconds:g} s per rate, {args.connections} connections, "
+          f"p99 SLO {args.slo_ms:g} ms")
+    print(f"{'server':<28} {'target/s':>9} {'done/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    try:
+        for label, kind, workers, threads in variants:
+            port = free_port()
+            server = start_server(kind, port, workers, threads, metrics_dir)
+            sustained = None
+            try:
+                url = f"http://127.0.0.1:{port}/"
+                wait_for(url)
+                # Warm every worker and the connection pool at the lowest rate; not reported
+                asyncio.run(OpenLoopGenerator(url, connections=args.connections).run(
+                    [(args.rates[0], args.rates[0], 2)], quiet=True))
+                for rate in args.rates:
+                    generator = OpenLoopGenerator(url, connections=args.connections)
+                    results = asyncio.run(generator.run([(rate, rate, args.seconds)], quiet=True))
+                    latency = results["latency_ms"]
+                    errors = sum(results["errors"].values()) + results["dropped"]
+                    print(f"{label:<28} {rate:9g} {results['completed_rps']:9.1f} "
+                          f"{latency['p50']:9.2f} {latency['p99']:9.2f} {errors:7d}")
+                    if latency["p99"] <= args.slo_ms and not errors:
+                        sustained = rate
+                    time.sleep(1)  # let the backlog drain before the next step
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{label:<28} sustains {sustained or 0:g} req/s with p99 <= {args.slo_ms:g} ms")
+    finally:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Time to run the performance regression gate (src/utils/perf_regression.py) over
+thousands of series: the vectorized NumPy check versus the same median/MAD and
+Mann-Whitney logic looped per series in Python.
+
+A scratch history store is seeded with --series locust_endpoint series (one label
+per endpoint, metric p99) of --runs runs each; 1% of them regress on the last run.
+Reported: history read + reshape, the vectorized evaluate(), and the per-series loop.
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_perf_regression.py --series 5000 --runs 30
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.utils.history_store import HistoryStore
+from src.utils.perf_regression import (MAD_TO_SIGMA, _u_distribution, evaluate, load_history, window_matrix)
+
+
+def seed(history, series, runs, rng):
+    now = datetime.now()
+    values = 300 + rng.normal(0, 15, (series, runs))
+    values[::100, -1] *= 2
+    history.record_many("locust_endpoint", [
+        (f"run-{j}", now - timedelta(hours=runs - j), f"GET /endpoint-{i}", {"p99": float(values[i, j])})
+        for j in range(runs) for i in range(series)])
+
+
+def loop_evaluate(matrix, recent=3, min_baseline=5, z_threshold=3.5, min_change=0.2, alpha=0.01):
+    """Reference: the gate's logic one series at a time, plain Python."""
+    statuses = []
+    for row in matrix:
+        values = [v for v in row.tolist() if v == v]
+        window, baseline = values[:recent], values[recent:]
+        if len(baseline) < min_baseline:
+            statuses.append("insufficient")
+            continue
+        median = statistics.median(baseline)
+        mad = MAD_TO_SIGMA * statistics.median(abs(v - median) for v in baseline)
+        z = (values[0] - median) / mad if mad else float("inf")
+        change = (values[0] - median) / median
+        u = sum((r > b) + 0.5 * (r == b) for r in window for b in baseline)
+        counts = _u_distribution(len(window), len(baseline))
+        p = counts[int(u):].sum() / counts.sum()
+        recent_change = (statistics.median(window) - median) / median
+        if (z > z_threshold and change > min_change) or (p < alpha and recent_change > min_change):
+            statuses.append("regression")
+        elif z < -z_threshold and change < -min_change:
+            statuses.append("improvement")
+        else:
+            statuses.append("ok")
+    return statuses
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--series", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_regression_")
+    try:
+        with HistoryStore(os.path.join(workdir, "history.sqlite3")) as history:
+            seed(history, args.series, args.runs, np.random.default_rng(3))
+            start = time.perf_counter()
+            frame = load_history(history, {"locust_endpoint": ["p99"]})
+            _, matrix = window_matrix(frame, 23)
+            load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vectorized = evaluate(matrix)["status"].tolist()
+        fast = time.perf_counter() - start
+        start = time.perf_counter()
+        looped = loop_evaluate(matrix)
+        slow = time.perf_counter() - start
+        assert vectorized == looped
+        print(f"{args.series} series x {args.runs} runs, {vectorized.count('regression')} regressions")
+        print(f"history read + window matrix: {load * 1e3:8.1f} ms")
+        print(f"vectorized evaluate():        {fast * 1e3:8.1f} ms")
+        print(f"per-series Python loop:       {slow * 1e3:8.1f} ms ({slow / fast:.0f}x)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Peak memory and time to read a Robot Framework output.xml: the previous
+ET.parse + findall(".//test") approach versus the streaming iterparse parser in
+src/utils/report_parsers.py, on synthetic files up to 1 GB. Each test carries
+keywords with multi-line log messages, like long Robot runs do.
+
+Each measurement runs in a fresh interpreter so peak RSS is per parser. ET.parse
+needs several times the file size in memory, so it is only run up to
+--baseline-max-mb.
+
+Run from the repo root:
+    PYTHONPATH=. python src/tests/benchmarks/bench_report_parsers.py --sizes-mb 64 256 1024
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+DRIVER = """
+import json, resource, sys, time
+import xml.etree.ElementTree as ET
+from src.utils.report_parsers import parse_robot
+
+start = time.perf_counter()
+if sys.argv[1] == "etree":
+    root = ET.parse(sys.argv[2]).getroot()
+    details = []
+    for test in root.find(".//suite").findall(".//test"):
+        status = test.find("status")
+        details.append({"name": test.attrib.get("name"), "status": status.attrib.get("status"),
+                        "message": (status.text or "").strip()})
+    count = len(details)
+else:
+    summary, details = parse_robot(sys.argv[2])
+    count = summary["total"]
+print(json.dumps({"seconds": time.perf_counter() - start, "tests": count,
+                  "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+MESSAGE = ("GET Response : url=http://127.0.0.1:3000/dev/items status=200, reason=OK "
+           'headers={"Content-Type": "application/json"} body={"message": "ok"}\n') * 8
+
+
+def write_output_xml(path, size_mb, keywords=20):
+    """Synthetic Robot 7 output.xml of about size_mb; returns the number of tests."""
+    target = size_mb * 1024 * 1024
+    tests = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<robot generator="Robot 7.3.2" schemaversion="5">\n')
+        f.write('<suite id="s1" name="Synthetic">\n')
+        while f.tell() < target:
+            tests += 1
+            status = "FAIL" if tests % 50 == 0 else "PASS"
+            f.write(f'<test id="s1-t{tests}" name="Synthetic test {tests}" line="7">\n')
+            for k in range(keywords):
+                f.write(f'<kw name="GET On Session" owner="RequestsLibrary">\n'
+                        f'<msg time="2025-09-11T14:29:26.800958" level="INFO">{MESSAGE}</msg>\n'
+                        f'<arg>session</arg><arg>/items/{k}</arg>\n'
+                        f'<status status="PASS" start="2025-09-11T14:29:26.154433" elapsed="0.0{k:02d}"/>\n</kw>\n')
+            message = "Expected 200 but got 500" if status == "FAIL" else ""
+            f.write(f'<status status="{status}" start="2025-09-11T14:29:26.149276" elapsed="0.660548">'
+                    f'{message}</status>\n</test>\n')
+        f.write('<status status="PASS" start="2025-09-11T14:29:25.823975" elapsed="0.987984"/>\n</suite>\n')
+        f.write('<statistics><total><stat pass="0" fail="0" skip="0">All Tests</stat></total></statistics>\n'
+                '<errors></errors>\n</robot>\n')
+    return tests
+
+
+def measure(parser, path):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [REPO_ROOT, os.getenv("PYTHONPATH")]))}
+    result = subprocess.run([sys.executable, "-c", DRIVER, parser, path], cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[64, 256, 1024])
+    parser.add_argument("--baseline-max-mb", type=int, default=256,
+                        help="Largest file to load with ET.parse (it needs several GB per GB of XML)")
+    parser.add_argument("--dir", default=None, help="Where to write the synthetic files (default: temp dir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir, prefix="qa_robot_xml_") as workdir:
+        for size_mb in args.sizes_mb:
+            path = os.path.join(workdir, f"output_{size_mb}mb.xml")
+            start = time.perf_counter()
+            tests = write_output_xml(path, size_mb)
+            print(f"{os.path.getsize(path) / 2 ** 20:7.0f} MB output.xml, {tests} tests "
+                  f"(written in {time.perf_counter() - start:.1f} s)")
+            for name in ("etree", "iterparse"):
+                if name == "etree" and size_mb > args.baseline_max_mb:
+                    print(f"  {name:<10} skipped (> --baseline-max-mb)")
+                    continue
+                result = measure(name, path)
+                if result is None:
+                    print(f"  {name:<10} failed (out of memory?)")
+                    continue
+                print(f"  {name:<10} {result['seconds']:7.2f} s  peak RSS {result['peak_mb']:8.1f} MB  "
+                      f"tests={result['tests']}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
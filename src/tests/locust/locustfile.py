@@ -1,50 +1,109 @@
-from locust import HttpUser, task, between, events
-from prometheus_client import start_http_server, Counter, Histogram
+from locust import FastHttpUser, task, tag, constant, constant_throughput, events
+from locust.runners import WorkerRunner
 import os
+import sys
+import uuid
 
-# Prometheus metrics
-REQUEST_COUNT = Counter(
-    "locust_requests_total",
-    "Total number of requests",
-    ["method", "endpoint", "status"]
-)
-REQUEST_LATENCY = Histogram(
-    "locust_request_latency_seconds",
-    "Request latency",
-    ["method", "endpoint"]
-)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from src.utils.latency_sketch import LatencySketch, save_sketches  # noqa: E402
+from src.utils.locust_prometheus import DEFAULT_PORT, start_exporter  # noqa: E402
 
-start_http_server(9646)
+# Prometheus metrics: exported from Locust's own (worker-merged) stats at scrape time by
+# the master or a standalone run only; workers bind nothing. PROMETHEUS_PORT=0 disables it.
+PROMETHEUS_PORT = int(os.getenv("PROMETHEUS_PORT", DEFAULT_PORT))
+
+@events.init.add_listener
+def start_metrics(environment, **kwargs):
+    if PROMETHEUS_PORT and not isinstance(environment.runner, WorkerRunner):
+        start_exporter(environment, PROMETHEUS_PORT)
+
+# Mergeable latency sketches per endpoint (successful requests, ms). Workers ship
+# what they counted since their last report to the master, which merges them;
+# the master (or a standalone run) writes one file per run for the dashboard.
+SKETCH_FILE = os.getenv("LATENCY_SKETCH_FILE", "reports/locust/results_sketches.json")
+SKETCHES = {}
+_sketch_for = {}  # (request_type, name) -> SKETCHES entry, so the hot path builds no strings
 
 @events.request.add_listener
-def track_request(request_type, name, response_time, response_length, exception, **kwargs):
-    status = "ok" if exception is None else "fail"
-    REQUEST_COUNT.labels(request_type, name, status).inc()
-    REQUEST_LATENCY.labels(request_type, name).observe(response_time / 1000.0)
+def track_latency(request_type, name, response_time, exception, **kwargs):
+    if exception is None:
+        sketch = _sketch_for.get((request_type, name))
+        if sketch is None:
+            sketch = _sketch_for[(request_type, name)] = SKETCHES.setdefault(f"{request_type} {name}",
+                                                                             LatencySketch())
+        sketch.add(response_time)
+
+@events.report_to_master.add_listener
+def send_sketches(client_id, data, **kwargs):
+    data["latency_sketches"] = {endpoint: s.to_bytes() for endpoint, s in SKETCHES.items()}
+    SKETCHES.clear()
+    _sketch_for.clear()
+
+@events.worker_report.add_listener
+def merge_sketches(client_id, data, **kwargs):
+    for endpoint, blob in data.get("latency_sketches", {}).items():
+        SKETCHES.setdefault(endpoint, LatencySketch()).merge(LatencySketch.from_bytes(blob))
+
+@events.quitting.add_listener
+def write_sketches(environment, **kwargs):
+    if SKETCHES and not isinstance(environment.runner, WorkerRunner):
+        save_sketches(SKETCH_FILE, SKETCHES)
 
 # Read env var (default = true for local, false in CI/CD)
 NEGATIVE_TESTS = os.getenv("NEGATIVE_TESTS", "true").lower() == "true"
+# Task iterations per user per second (pacing, independent of response time); 0 = no wait
+TASK_RATE = float(os.getenv("TASK_RATE", "0.5"))
+
+class CrudApiUser(FastHttpUser):
+    """
+    CRUD load on keys owned by each simulated user. Ids combine a per-user uuid with a
+    counter, so users (and workers under --master/--worker) never touch the same item and
+    the test measures API capacity rather than hot-key contention. Requests carrying an id
+    are grouped under one name ("/items?id=[id]") to keep endpoint cardinality fixed.
+    Tags select parts of the mix: locust --tags read, --exclude-tags write, ...
+    """
+    wait_time = constant_throughput(TASK_RATE) if TASK_RATE > 0 else constant(0)
+
+    def on_start(self):
+        self.prefix = f"lt-{uuid.uuid4().hex[:12]}"
+        self.iteration = 0
+        # One long-lived item per user for the read-only task
+        self.own_id = f"{self.prefix}-own"
+        self.client.post("/items", json={"id": self.own_id, "name": "Locust Item"}, name="/items")
 
-class CrudApiUser(HttpUser):
-    wait_time = between(1, 3)
+    def on_stop(self):
+        self.client.delete(f"/items?id={self.own_id}", name="/items?id=[id]")
 
-    @task
+    def next_id(self):
+        self.iteration += 1
+        return f"{self.prefix}-{self.iteration}"
+
+    @tag("smoke")
+    @task(1)
     def call_health(self):
         self.client.get("/")
 
-    if NEGATIVE_TESTS:
-        @task
-        def call_invalid(self):
-            self.client.get("/this-does-not-exist")
+    @tag("read")
+    @task(4)
+    def read_item(self):
+        self.client.get(f"/items?id={self.own_id}", name="/items?id=[id]")
 
-    @task
+    @tag("crud", "write")
+    @task(3)
     def crud_cycle(self):
-        # POST
-        payload = {"id": "loadtest123", "name": "Locust Item"}
-        self.client.post("/items", json=payload)
-        # GET
-        self.client.get("/items?id=loadtest123")
-        # PUT
-        self.client.put("/items", json={"id": "loadtest123", "name": "Updated Locust Item"})
-        # DELETE
-        self.client.delete("/items?id=loadtest123")
+        item_id = self.next_id()
+        self.client.post("/items", json={"id": item_id, "name": "Locust Item"}, name="/items")
+        self.client.get(f"/items?id={item_id}", name="/items?id=[id]")
+        self.client.put("/items", json={"id": item_id, "name": "Updated Locust Item"}, name="/items")
+        self.client.delete(f"/items?id={item_id}", name="/items?id=[id]")
+
+    if NEGATIVE_TESTS:
+        @tag("negative")
+        @task(1)
+        def call_invalid(self):
+            # API Gateway answers unknown routes with 403 (REST) or 404 (HTTP API): that is the expected result
+            with self.client.get("/this-does-not-exist", catch_response=True) as response:
+                if response.status_code in (403, 404):
+                    response.success()
+                else:
+                    response.failure(f"Expected 403/404 for an unknown route, got {response.status_code}")
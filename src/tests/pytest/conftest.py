@@ -1,5 +1,129 @@
+import json
+import os
+import time
+import uuid
+import warnings
+
 import pytest
 import pytest_html
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.utils.latency_stats import check_budgets, sample_latency, summarize_samples
+
+HTTP_TIMEOUT = float(os.getenv("API_TIMEOUT", "10"))
+HTTP_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))
+
+LATENCY_SAMPLES = int(os.getenv("LATENCY_SAMPLES", "30"))
+LATENCY_CONFIDENCE = float(os.getenv("LATENCY_CONFIDENCE", "0.95"))
+# Per-test budget overrides, e.g. {"test_lambda_response_time": {"p99": 1500}}
+LATENCY_BUDGETS = json.loads(os.getenv("LATENCY_BUDGETS", "{}"))
+LATENCY_REPORT = os.getenv("LATENCY_REPORT", "reports/pytest/latency.json")
+
+# Latency results of every test in the run, collected on the controller
+LATENCY_RESULTS = []
+
+# Requests made / connections opened by this process's pooled session
+CONNECTION_STATS = {"requests": 0, "connections": 0}
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with a default timeout, since requests.Session has none."""
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = HTTP_TIMEOUT
+        return super().send(request, **kwargs)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "xdist_group(name): run these tests on the same xdist worker")
+    LATENCY_RESULTS.clear()
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """One keep-alive connection pool per worker, with retries for throttling and gateway errors."""
+    retry = Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504],
+                  allowed_methods=None, raise_on_status=False)
+    adapter = TimeoutHTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    yield session
+
+    for key in list(adapter.poolmanager.pools.keys()):
+        pool = adapter.poolmanager.pools[key]
+        CONNECTION_STATS["requests"] += pool.num_requests
+        CONNECTION_STATS["connections"] += pool.num_connections
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def crud_item_id():
+    """Item id unique to this run and xdist worker, so parallel CRUD tests never collide."""
+    worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+    return f"pytest-{worker}-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def latency(request):
+    """
+    Sample a URL LATENCY_SAMPLES times and assert on percentile budgets (ms) of total_ms.
+    Budgets fail only when the confidence interval is entirely over budget; LATENCY_BUDGETS
+    overrides them per test. Results are attached to the HTML report and written to LATENCY_REPORT.
+    """
+    def _measure(url, budgets, metric="total_ms", samples=None, **kwargs):
+        results = sample_latency(url, samples=samples or LATENCY_SAMPLES, timeout=HTTP_TIMEOUT, **kwargs)
+        summary = summarize_samples(results, confidence=LATENCY_CONFIDENCE)
+        budgets = {**budgets, **LATENCY_BUDGETS.get(request.node.name, {})}
+        verdicts = check_budgets(summary[metric], budgets)
+        request.node.latency_results = getattr(request.node, "latency_results", []) + [{
+            "test": request.node.name, "url": url, "metric": metric,
+            "new_connection": kwargs.get("new_connection", False),
+            "summary": summary, "budgets": verdicts, "samples": results
+        }]
+
+        for v in verdicts:
+            if v["verdict"] == "inconclusive":
+                warnings.warn(f"{v['percentile']} of {metric} = {v['value']:.1f} ms is over the "
+                              f"{v['budget']} ms budget, but within the {LATENCY_CONFIDENCE:.0%} confidence interval")
+        exceeded = [v for v in verdicts if v["verdict"] == "exceeded"]
+        assert not exceeded, "Latency budget exceeded: " + ", ".join(
+            f"{v['percentile']}={v['value']:.1f} ms (CI low {v['ci_low']:.1f} ms) > {v['budget']} ms" for v in exceeded)
+        return results, summary
+    return _measure
+
+
+def pytest_runtest_logreport(report):
+    # Runs on the xdist controller too, with the attribute carried over from the worker
+    LATENCY_RESULTS.extend(getattr(report, "latency", None) or [])
+
+
+def pytest_sessionfinish(session):
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:  # xdist worker: hand the stats to the controller
+        workeroutput["connection_stats"] = dict(CONNECTION_STATS)
+    elif LATENCY_RESULTS:
+        os.makedirs(os.path.dirname(LATENCY_REPORT) or ".", exist_ok=True)
+        with open(LATENCY_REPORT, "w") as f:
+            json.dump({"timestamp": time.strftime("%Y-%m-%d %H:%M:%S"), "tests": LATENCY_RESULTS}, f, indent=2)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    for key, value in getattr(node, "workeroutput", {}).get("connection_stats", {}).items():
+        CONNECTION_STATS[key] += value
+
+
+def pytest_terminal_summary(terminalreporter):
+    made, opened = CONNECTION_STATS["requests"], CONNECTION_STATS["connections"]
+    if made:
+        reuse = 1 - opened / made
+        terminalreporter.write_line(
+            f"HTTP connection reuse: {made} requests over {opened} connections ({reuse:.0%} reused)")
+
 
 # Hook to add extra information into pytest-html reports
 @pytest.hookimpl(hookwrapper=True)
@@ -16,4 +140,11 @@ def pytest_runtest_makereport(item, call):
             response_data = item.funcargs["response_data"]
             extras.append(pytest_html.extras.text(str(response_data), "Response Data"))
 
+        # Latency samples and percentiles from the latency fixture
+        for result in getattr(item, "latency_results", []):
+            extras.append(pytest_html.extras.json(result["summary"], f"Latency percentiles ({result['metric']})"))
+            extras.append(pytest_html.extras.json(result["budgets"], "Latency budgets"))
+            extras.append(pytest_html.extras.json(result["samples"], "Latency samples"))
+        report.latency = getattr(item, "latency_results", [])
+
         report.extras = extras
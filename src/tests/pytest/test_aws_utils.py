@@ -0,0 +1,142 @@
+import threading
+import time
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from src.utils import aws_utils
+from src.utils.aws_utils import iter_items, iter_log_events, lambda_report_stats, split_window
+
+GROUP = "/aws/lambda/QAFrameworkCRUD"
+
+
+@pytest.fixture
+def logs(monkeypatch):
+    client = boto3.client("logs", region_name="us-east-1",
+                          aws_access_key_id="testing", aws_secret_access_key="testing")
+    sleeps = []
+    monkeypatch.setattr(aws_utils.time, "sleep", sleeps.append)
+    with Stubber(client) as stubber:
+        yield client, stubber, sleeps
+        stubber.assert_no_pending_responses()
+
+
+def event(ms, message):
+    return {"timestamp": ms, "message": message, "logStreamName": "stream", "eventId": str(ms)}
+
+
+def test_follows_next_token_and_retries_throttling(logs):
+    client, stubber, sleeps = logs
+    params = {"logGroupName": GROUP, "startTime": 1000, "endTime": 60000, "filterPattern": "REPORT"}
+    stubber.add_response("filter_log_events", {"events": [event(1000, "a"), event(2000, "b")],
+                                               "nextToken": "t1"}, params)
+    stubber.add_client_error("filter_log_events", service_error_code="ThrottlingException",
+                             expected_params={**params, "nextToken": "t1"})
+    stubber.add_response("filter_log_events", {"events": [event(3000, "c")]}, {**params, "nextToken": "t1"})
+
+    messages = [e["message"] for e in iter_log_events(GROUP, 1, 60, filter_pattern="REPORT", client=client)]
+    assert messages == ["a", "b", "c"]
+    assert len(sleeps) == 1
+
+
+def test_other_errors_are_not_retried(logs):
+    client, stubber, _ = logs
+    stubber.add_client_error("filter_log_events", service_error_code="ResourceNotFoundException")
+    with pytest.raises(aws_utils.ClientError):
+        list(iter_log_events(GROUP, 1, 60, client=client))
+
+
+class ShardedLogs:
+    """filter_log_events stand-in: one event per second, 3 per page, from several threads."""
+
+    def __init__(self):
+        self.threads = set()
+
+    def filter_log_events(self, logGroupName, startTime, endTime, nextToken=None):
+        self.threads.add(threading.get_ident())
+        first = int(nextToken) if nextToken else startTime
+        seconds = [ms for ms in range(first, endTime + 1) if ms % 1000 == 0][:4]
+        page = {"events": [event(ms, str(ms // 1000)) for ms in seconds[:3]]}
+        if len(seconds) > 3:
+            page["nextToken"] = str(seconds[3])
+        return page
+
+
+def test_shards_are_fetched_concurrently_and_yielded_in_order():
+    assert split_window(0, 9, 3) == [(0, 2), (3, 5), (6, 9)]
+    fake = ShardedLogs()
+    messages = [e["message"] for e in iter_log_events(GROUP, 0, 99.999, shards=8, max_workers=4, client=fake)]
+    assert messages == [str(n) for n in range(100)]  # no gap or duplicate at shard edges
+    assert len(fake.threads) > 1
+
+    stream = iter_log_events(GROUP, 0, 99.999, shards=8, max_workers=4, client=fake)
+    assert next(stream)["message"] == "0"
+    stream.close()  # stops the shard threads instead of leaving them blocked
+
+
+class EndlessSegments:
+    """requests.Session stand-in for GET /items/list: endless pages; segment `failing` fails on its second."""
+    failing = 0
+
+    def __init__(self):
+        self.closed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed += 1
+
+    def get(self, url, params, timeout):
+        if params["segment"] == self.failing and params.get("cursor"):
+            raise ConnectionError("segment 0 failed")
+        cursor = int(params.get("cursor", 0))
+        page = {"items": [{"id": f"{params['segment']}-{cursor}"}], "next_cursor": str(cursor + 1)}
+        return type("Response", (), {"raise_for_status": lambda self: None, "json": lambda self: page})()
+
+
+def segment_threads():
+    return [t for t in threading.enumerate() if t.name.startswith("items-segment-")]
+
+
+def wait_for_segment_threads(timeout=5):
+    deadline = time.monotonic() + timeout
+    while segment_threads() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return segment_threads()
+
+
+def test_parallel_scan_stops_its_threads_on_error_and_early_close(monkeypatch):
+    import requests
+    sessions = []
+    monkeypatch.setattr(requests, "Session", lambda: sessions.append(EndlessSegments()) or sessions[-1])
+
+    with pytest.raises(ConnectionError):
+        for _ in iter_items("http://api/items/list", total_segments=4):
+            pass
+    assert wait_for_segment_threads() == []
+    assert all(session.closed for session in sessions)
+
+    sessions.clear()
+    monkeypatch.setattr(EndlessSegments, "failing", None)
+    items = iter_items("http://api/items/list", total_segments=4)
+    assert next(items)["id"].endswith("-0")
+    items.close()
+    assert wait_for_segment_threads() == []
+    assert len(sessions) == 4 and all(session.closed for session in sessions)
+
+
+def test_insights_report_stats(logs):
+    client, stubber, sleeps = logs
+    stubber.add_response("start_query", {"queryId": "q-1"})
+    stubber.add_response("get_query_results", {"status": "Running", "results": []}, {"queryId": "q-1"})
+    stubber.add_response("get_query_results", {"status": "Complete", "results": [[
+        {"field": "invocations", "value": "120"}, {"field": "cold_starts", "value": "3"},
+        {"field": "duration_p99", "value": "812.4"}, {"field": "init_p50", "value": "301.2"}]]},
+        {"queryId": "q-1"})
+
+    stats = lambda_report_stats("QAFrameworkCRUD", 0, 3600, client=client, poll_interval=0.5)
+    assert stats["invocations"] == 120 and stats["cold_starts"] == 3
+    assert stats["duration_p99"] == 812.4 and stats["init_p99"] is None
+    assert sleeps == [0.5]
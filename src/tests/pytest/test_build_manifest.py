@@ -0,0 +1,66 @@
+import os
+
+from src.utils import build_manifest
+from src.utils.build_manifest import BuildManifest
+
+
+def test_unchanged_inputs_reuse_fragment_without_rehashing(tmp_path, monkeypatch):
+    report = tmp_path / "results.xml"
+    report.write_text("<testsuites/>")
+    cache = str(tmp_path / "cache")
+
+    manifest = BuildManifest(cache, version="v1")
+    key = manifest.key([str(report)], history=[["pytest", 1, 1]])
+    assert manifest.get("pytest", key) is None
+    manifest.put("pytest", key, "<div>pytest</div>")
+    manifest.save()
+
+    hashed = []
+    monkeypatch.setattr(build_manifest, "file_digest", lambda path: hashed.append(path) or "changed")
+    manifest = BuildManifest(cache, version="v1")
+    assert manifest.get("pytest", manifest.key([str(report)], history=[["pytest", 1, 1]])) == "<div>pytest</div>"
+    assert hashed == []
+    assert manifest.rebuilt == []
+
+
+def test_key_changes_with_content_state_and_version(tmp_path):
+    report = tmp_path / "results.xml"
+    missing = str(tmp_path / "latency.json")
+    report.write_text("<testsuites/>")
+    manifest = BuildManifest(str(tmp_path / "cache"), version="v1")
+    key = manifest.key([str(report), missing], history_days=30)
+
+    assert manifest.key([str(report), missing], history_days=30) == key
+    assert manifest.key([str(report), missing], history_days=0) != key
+    assert BuildManifest(str(tmp_path / "cache"), version="v2").key([str(report), missing], history_days=30) != key
+
+    report.write_text("<testsuites><testsuite/></testsuites>")
+    os.utime(report, ns=(1, 1))
+    assert manifest.key([str(report), missing], history_days=30) != key
+
+
+def test_output_current_only_for_the_page_last_written(tmp_path):
+    page = tmp_path / "Dashboard.html"
+    manifest = BuildManifest(str(tmp_path / "cache"))
+    assert not manifest.output_current(str(page))
+    page.write_text("<html/>")
+    manifest.wrote_output(str(page))
+    manifest.save()
+
+    manifest = BuildManifest(str(tmp_path / "cache"))
+    assert manifest.output_current(str(page))
+    manifest.put("robot", "key", "<div/>")
+    assert not manifest.output_current(str(page))
+
+
+def test_last_only_returns_fragments_rendered_in_the_same_mode(tmp_path):
+    manifest = BuildManifest(str(tmp_path / "cache"))
+    lite = {"lite": True, "max_points": 2000}
+    manifest.put("locust", "key", "<script>qaPlot()</script>", lite)
+    manifest.save()
+
+    manifest = BuildManifest(str(tmp_path / "cache"))
+    assert manifest.built("locust") and not manifest.built("robot")
+    assert manifest.last("locust", lite) == "<script>qaPlot()</script>"
+    assert manifest.last("locust", {"lite": True, "max_points": 500}) is None
+    assert manifest.last("locust", {"lite": False, "max_points": None}) is None
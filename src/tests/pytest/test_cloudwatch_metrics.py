@@ -0,0 +1,89 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import boto3
+import pytest
+from botocore.stub import ANY, Stubber
+
+from src.utils.cloudwatch_metrics import (MetricCache, evaluate_checks, fetch, metric_specs, spec_key,
+                                          write_legacy_json)
+
+NOW = datetime(2026, 3, 1, 12, 7, 30, tzinfo=timezone.utc)
+T = [datetime(2026, 3, 1, 11, 50, tzinfo=timezone.utc) + timedelta(minutes=5 * i) for i in range(4)]
+
+
+@pytest.fixture
+def cloudwatch():
+    client = boto3.client("cloudwatch", region_name="us-east-1",
+                          aws_access_key_id="testing", aws_secret_access_key="testing")
+    with Stubber(client) as stubber:
+        yield client, stubber
+        stubber.assert_no_pending_responses()
+
+
+def result(query_id, timestamps, values):
+    return {"Id": query_id, "Timestamps": timestamps, "Values": values, "StatusCode": "Complete"}
+
+
+def test_one_paginated_request_for_every_metric_stat_and_stage(cloudwatch):
+    client, stubber = cloudwatch
+    specs = metric_specs(["ColdStartCount", "RequestsProcessed"], ["Sum", "p99"], stages=["dev", "prod"])
+    expected = {"MetricDataQueries": ANY, "StartTime": T[0], "EndTime": NOW, "ScanBy": "TimestampAscending"}
+    stubber.add_response("get_metric_data", {
+        "MetricDataResults": [result("m0", [T[0]], [1.0]), result("m2", [T[0]], [5.0])], "NextToken": "page-2"},
+        expected)
+    stubber.add_response("get_metric_data", {
+        "MetricDataResults": [result("m0", [T[1]], [2.0]), result("m4", [T[1]], [7.0])]},
+        {**expected, "NextToken": "page-2"})
+
+    results, calls = fetch(specs, NOW - timedelta(minutes=17), NOW, client=client, now=NOW)
+    assert calls == 2  # 8 queries, two pages of one request
+    assert results[spec_key(specs[0])] == [(str(T[0]), 1.0), (str(T[1]), 2.0)]
+    assert results[spec_key(specs[2])] == [(str(T[0]), 5.0)]
+    assert results[spec_key(specs[4])] == [(str(T[1]), 7.0)]  # dev+prod share the request
+    assert results[spec_key(specs[1])] == []
+
+
+def test_refresh_only_fetches_the_uncovered_range(cloudwatch, tmp_path):
+    client, stubber = cloudwatch
+    path = str(tmp_path / "cache.json")
+    specs = metric_specs(["ColdStartCount"], ["Sum"])
+    stubber.add_response("get_metric_data", {"MetricDataResults": [result("m0", [T[0], T[3]], [1.0, 1.0])]},
+                         {"MetricDataQueries": ANY, "StartTime": T[0], "EndTime": NOW, "ScanBy": ANY})
+    fetch(specs, NOW - timedelta(minutes=17), NOW, client=client, cache=MetricCache(path), now=NOW)
+
+    # 10 minutes later: the open 12:05 period and the 12:00 one (late datapoints) are fetched again
+    later = NOW + timedelta(minutes=10)
+    stubber.add_response("get_metric_data", {"MetricDataResults": [result("m0", [T[3]], [3.0])]},
+                         {"MetricDataQueries": ANY, "StartTime": T[2], "EndTime": later, "ScanBy": ANY})
+    results, calls = fetch(specs, NOW - timedelta(minutes=17), later, client=client, cache=MetricCache(path),
+                           now=later)
+    assert calls == 1
+    assert results[spec_key(specs[0])] == [(str(T[0]), 1.0), (str(T[3]), 3.0)]
+
+    # Fully covered window: no call at all
+    _, calls = fetch(specs, NOW - timedelta(minutes=17), NOW - timedelta(minutes=5), client=client,
+                     cache=MetricCache(path), now=later)
+    assert calls == 0
+
+
+def test_checks_and_dashboard_json(tmp_path):
+    specs = metric_specs(["ColdStartCount", "RequestsProcessed"], ["Sum", "p99"])
+    results = {spec_key(s): [] for s in specs}
+    results[spec_key(specs[0])] = [(str(T[0]), 2.0), (str(T[1]), 1.0)]
+    results[spec_key(specs[1])] = [(str(T[1]), 900.0)]
+
+    checks = ["ColdStartCount:Sum<=2", "RequestsProcessed:Sum>=1", "ColdStartCount:p99<1000"]
+    # Per period (default): 2 cold starts in the busiest period is within the threshold
+    assert [passed for _, passed in evaluate_checks(checks, specs, results)] == [True, False, True]
+    # Totalled over the window: 3
+    assert [passed for _, passed in evaluate_checks(checks, specs, results, "total")] == [False, False, True]
+    with pytest.raises(ValueError):
+        evaluate_checks(["ColdStartCount:Average<=2"], specs, results)
+
+    paths = {"ColdStartCount": str(tmp_path / "coldstart.json"), "RequestsProcessed": str(tmp_path / "requests.json")}
+    write_legacy_json(specs, results, paths)
+    with open(paths["ColdStartCount"]) as f:
+        assert json.load(f)["Datapoints"] == [{"Timestamp": str(T[0]), "Sum": 2.0},
+                                              {"Timestamp": str(T[1]), "Sum": 1.0,
+                                               "ExtendedStatistics": {"p99": 900.0}}]
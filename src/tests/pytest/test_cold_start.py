@@ -0,0 +1,51 @@
+import base64
+import io
+import json
+
+from src.utils import cold_start
+
+COLD_TAIL = (
+    "START RequestId: 8f5b2c1e-0000-4000-8000-000000000001 Version: $LATEST\n"
+    "END RequestId: 8f5b2c1e-0000-4000-8000-000000000001\n"
+    "REPORT RequestId: 8f5b2c1e-0000-4000-8000-000000000001\tDuration: 12.34 ms\tBilled Duration: 13 ms\t"
+    "Memory Size: 128 MB\tMax Memory Used: 71 MB\tInit Duration: 456.78 ms\t\n"
+)
+
+
+class FakeLambda:
+    """Just enough of boto3.client("lambda") for invoke_with_report."""
+
+    def __init__(self, log_tail):
+        self.log_tail = log_tail
+        self.calls = []
+
+    def invoke(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"Payload": io.BytesIO(b"{}"), "LogResult": base64.b64encode(self.log_tail.encode()).decode()}
+
+
+def test_parse_report_lines_reads_init_duration_only_on_cold_starts():
+    warm = COLD_TAIL.replace("\tInit Duration: 456.78 ms", "")
+    cold_report, warm_report = cold_start.parse_report_lines(COLD_TAIL + warm)
+    assert cold_report == {"request_id": "8f5b2c1e-0000-4000-8000-000000000001", "duration_ms": 12.34,
+                           "billed_ms": 13, "memory_mb": 128, "max_memory_mb": 71, "init_ms": 456.78}
+    assert warm_report["init_ms"] is None
+
+
+def test_invoke_with_report_uses_the_log_tail():
+    client = FakeLambda(COLD_TAIL)
+    record = cold_start.invoke_with_report(client, "QAFrameworkCRUD", {"httpMethod": "GET", "path": "/dev/"})
+    assert record["kind"] == "cold" and record["init_ms"] == 456.78
+    assert client.calls[0]["LogType"] == "Tail"
+    assert json.loads(client.calls[0]["Payload"])["path"] == "/dev/"
+
+
+def test_measure_local_starts_a_fresh_environment_per_cold_start():
+    records = cold_start.measure_local({"httpMethod": "GET", "path": "/dev/"}, containers=2, warm=2)
+    assert [r["kind"] for r in records] == ["cold", "warm", "warm"] * 2
+    assert {r["environment"] for r in records if r["kind"] == "cold"} == {0, 1}
+    assert all(r["init_ms"] > 0 for r in records if r["kind"] == "cold")
+
+    summary = cold_start.summarize_records(records)
+    assert summary["cold"]["count"] == 2 and summary["warm"]["count"] == 4
+    assert summary["cold"]["client_ms"]["p50"]["value"] > summary["warm"]["client_ms"]["p50"]["value"]
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.downsample import downsample_frame, minmax_indices
+
+
+def test_minmax_keeps_spikes_and_endpoints():
+    values = np.zeros(100000)
+    values[12345] = 7      # a run with failures
+    values[67890] = -3
+    keep = minmax_indices(values, buckets=100)
+    assert len(keep) <= 202
+    assert {0, 12345, 67890, 99999} <= set(keep.tolist())
+    assert (np.diff(keep) > 0).all()
+    assert minmax_indices([1, 2, 3], buckets=100).tolist() == [0, 1, 2]
+
+
+def test_downsample_frame_per_series():
+    frame = pd.DataFrame({"label": ["a"] * 5000 + ["b"] * 10,
+                          "p99": np.r_[np.arange(5000.0), np.arange(10.0)],
+                          "p50": np.r_[np.full(5000, np.nan), np.arange(10.0)]})
+    reduced = downsample_frame(frame, ["p99", "p50"], max_points=400, by="label")
+    assert (reduced["label"] == "b").sum() == 10
+    a = reduced[reduced["label"] == "a"]
+    assert 2 < len(a) <= 402
+    assert a["p99"].iloc[0] == 0 and a["p99"].iloc[-1] == 4999
+    assert a.index.is_monotonic_increasing
@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import generate_dashboard
+from src.utils.build_manifest import BuildManifest
+
+JUNIT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" tests="3" failures="1" errors="0" skipped="0">
+<testcase classname="test_api" name="test_a" time="0.1"/>
+<testcase classname="test_api" name="test_b" time="0.1"/>
+<testcase classname="test_api" name="test_c" time="0.1"><failure message="boom"/></testcase>
+</testsuite></testsuites>
+"""
+
+
+@pytest.fixture
+def reports(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("reports/pytest")
+    with open(generate_dashboard.PYTEST_XML, "w") as f:
+        f.write(JUNIT)
+    return tmp_path
+
+
+def opts(**overrides):
+    return {"history_db": "reports/history.sqlite3", "history_days": None, "refresh": False, "stage": "dev",
+            **overrides}
+
+
+def test_main_builds_selected_sections_then_reuses_them(reports, capsys):
+    argv = ["--sections", "pytest", "locust", "--workers", "0"]
+    assert [(name, status) for name, status, _ in generate_dashboard.main(argv)] == [
+        ("pytest", "built"), ("locust", "built")]
+    with open(generate_dashboard.DASHBOARD_HTML, encoding="utf-8") as f:
+        page = f.read()
+    assert "Total Tests: 3" in page and "Failures: 1" in page
+    assert "No Locust results found." in page
+    assert "Robot Framework" not in page
+
+    assert [status for _, status, _ in generate_dashboard.main(argv)] == ["cached", "cached"]
+    assert "up to date" in capsys.readouterr().out
+
+
+def test_fetch_runs_before_the_cache_key_is_taken(reports, monkeypatch):
+    def fake_fetch(options):
+        os.makedirs("reports/cloudwatch", exist_ok=True)
+        with open(generate_dashboard.CW_JSON, "w") as f:
+            json.dump({"Datapoints": [{"Timestamp": "2026-01-01 10:00:00+00:00", "Sum": 4.0}]}, f)
+
+    monkeypatch.setitem(generate_dashboard.SECTIONS["cloudwatch"], "fetch", fake_fetch)
+    manifest = BuildManifest("reports/.dashboard_cache")
+    sections, timings = generate_dashboard.run_sections(["cloudwatch"], opts(), manifest, workers=0)
+    assert timings[0][1] == "built"
+    assert "ColdStartCount: 4.0" in sections["cloudwatch"]
+
+    _, timings = generate_dashboard.run_sections(["cloudwatch"], opts(), manifest, workers=0)
+    assert timings[0][1] == "cached"
+
+
+def test_sections_build_in_a_process_pool(reports):
+    manifest = BuildManifest("reports/.dashboard_cache")
+    sections, timings = generate_dashboard.run_sections(["pytest", "robot"], opts(), manifest, workers=2)
+    assert [(name, status) for name, status, _ in timings] == [("pytest", "built"), ("robot", "built")]
+    assert "Total Tests: 3" in sections["pytest"]
+    assert "No Robot report found." in sections["robot"]
+    assert sorted(manifest.rebuilt) == ["pytest", "robot"]
+
+
+def test_in_process_sections_build_one_at_a_time_in_a_fresh_interpreter(reports):
+    # plotly's first import and use are not thread-safe; a fresh interpreter is where that shows
+    os.makedirs("reports/cloudwatch")
+    for path in (generate_dashboard.CW_JSON, generate_dashboard.CW_PROCESSED_JSON):  # present: no fetch
+        with open(path, "w") as f:
+            json.dump({"Datapoints": [{"Timestamp": "2026-01-01 10:00:00+00:00", "Sum": 4.0}]}, f)
+    script = ("import generate_dashboard as g\n"
+              "from src.utils.build_manifest import BuildManifest\n"
+              "opts = {'history_db': 'reports/history.sqlite3', 'history_days': None, 'refresh': False,"
+              " 'stage': 'dev'}\n"
+              "_, timings = g.run_sections(['pytest', 'robot', 'locust', 'cloudwatch'], opts,"
+              " BuildManifest('reports/.dashboard_cache'), workers=0)\n"
+              "print([status for _, status, _ in timings])\n")
+    repo_root = os.path.dirname(os.path.abspath(generate_dashboard.__file__))
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=120,
+                            env={**os.environ, "PYTHONPATH": repo_root})
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == str(["built"] * 4), result.stderr
+
+
+def test_lite_page_loads_plotly_once(reports):
+    generate_dashboard.main(["--sections", "pytest", "--workers", "0", "--lite"])
+    page_dir = os.path.dirname(generate_dashboard.DASHBOARD_HTML)
+    with open(generate_dashboard.DASHBOARD_HTML, encoding="utf-8") as f:
+        page = f.read()
+    scripts = [name for name in os.listdir(page_dir) if name.endswith(".min.js")]
+    assert len(scripts) == 1 and page.count(f'<script src="{scripts[0]}">') == 1
+    assert "qaPlot(" in page and "Total Tests: 3" in page
+    assert len(page) < 100000  # the inline build embeds a multi-MB bundle per figure
+
+
+def test_sections_cached_in_the_other_mode_are_rebuilt(reports):
+    generate_dashboard.main(["--sections", "pytest", "robot", "--workers", "0"])
+    timings = generate_dashboard.main(["--sections", "robot", "--workers", "0", "--lite"])
+    # pytest's inline-plotly fragment would undo --lite: it is rebuilt rather than reused
+    assert [(name, status) for name, status, _ in timings] == [("pytest", "built"), ("robot", "built")]
+    with open(generate_dashboard.DASHBOARD_HTML, encoding="utf-8") as f:
+        page = f.read()
+    assert "Total Tests: 3" in page and "qaPlot(" in page and len(page) < 100000
+
+    timings = generate_dashboard.main(["--sections", "robot", "--workers", "0", "--lite"])
+    assert [(name, status) for name, status, _ in timings] == [("robot", "cached")]
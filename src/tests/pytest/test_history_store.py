@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+
+from src.utils.history_store import HistoryStore, file_run_id
+
+
+@pytest.fixture
+def store():
+    with HistoryStore(":memory:") as store:
+        yield store
+
+
+def test_record_is_typed_and_deduplicated_by_run_id(store):
+    assert store.record("pytest", "run-1", {"tests": "12", "failures": 1}, "2026-01-01 10:00:00") == 2
+    assert store.record("pytest", "run-1", {"tests": 12, "failures": 1}, "2026-01-02 10:00:00") == 0
+    assert store.query("pytest") == [("2026-01-01 10:00:00", "run-1", "", "failures", 1.0),
+                                     ("2026-01-01 10:00:00", "run-1", "", "tests", 12.0)]
+    with pytest.raises(ValueError):
+        store.record("pytest", "run-2", {"tests": "?"})
+    with pytest.raises(ValueError):
+        store.record("pytest", "run-2", {"duration": 1.5})
+
+
+def test_replace_updates_a_period_recorded_while_still_open(store):
+    run_id = "datapoint:2026-01-01 10:05:00+00:00"
+    assert store.record("cloudwatch", run_id, {"ColdStartCount": 1.0}, "2026-01-01 10:06:00", replace=True) == 1
+    assert store.record("cloudwatch", run_id, {"ColdStartCount": 3.0}, "2026-01-01 10:12:00", replace=True) == 1
+    assert store.record("cloudwatch", run_id, {"ColdStartCount": 3.0}, replace=True) == 0
+    assert store.record("cloudwatch", run_id, {"RequestsProcessed": 7.0}, replace=True) == 1
+    assert store.trend("cloudwatch", ["ColdStartCount", "RequestsProcessed"]) == [
+        ("2026-01-01 10:06:00", run_id, "", 3.0, 7.0)]
+
+
+def test_trend_pivots_runs_and_filters_last_n_days(store):
+    now = datetime(2026, 3, 31, 12, 0, 0)
+    store.record("locust", "old", {"requests": 10, "failures": 1}, "2026-01-01 00:00:00")
+    store.record("locust", "new", {"requests": 20, "failures": 0}, "2026-03-30 00:00:00")
+    store.record("latency", "new", {"p99": 120.5}, "2026-03-30 00:00:00", label="test_a")
+
+    assert store.trend("locust", ["requests", "failures"]) == [
+        ("2026-01-01 00:00:00", "old", "", 10.0, 1.0), ("2026-03-30 00:00:00", "new", "", 20.0, 0.0)]
+    frame = store.trend_frame("locust", ["requests", "avg_response_time"], days=7, now=now)
+    assert frame["run_id"].tolist() == ["new"]
+    assert frame["avg_response_time"].isna().all()
+    assert store.trend("latency", ["p99"], label="test_a") == [("2026-03-30 00:00:00", "new", "test_a", 120.5)]
+
+
+def test_migrate_csv_skips_invalid_values_and_runs_once(store, tmp_path):
+    legacy = tmp_path / "robot_history.csv"
+    legacy.write_text("timestamp,total,pass,fail\n"
+                      "2025-09-09 10:46:30,?,1,0\n"
+                      "2025-09-09 10:51:38,?,?,?\n"
+                      "2025-09-10 09:00:00,5,4,1\n")
+    columns = {"total": "total", "pass": "pass", "fail": "fail"}
+    assert store.migrate_csv(str(legacy), "robot", columns) == (5, 4)
+    assert store.migrate_csv(str(legacy), "robot", columns) is None
+    assert [row[1] for row in store.trend("robot")] == ["legacy:2025-09-09 10:46:30", "legacy:2025-09-10 09:00:00"]
+
+
+def test_file_run_id_follows_content(tmp_path):
+    first, second = tmp_path / "a.xml", tmp_path / "b.xml"
+    first.write_text("<testsuites/>")
+    second.write_text("<testsuites/>")
+    assert file_run_id(first) == file_run_id(second)
+    second.write_text("<testsuites><testsuite/></testsuites>")
+    assert file_run_id(first) != file_run_id(second)
@@ -0,0 +1,271 @@
+import json
+import os
+
+import pytest
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from lambda_crud import lambda_crud_function as crud  # noqa: E402
+from src.utils.local_api import LambdaContext  # noqa: E402
+from src.utils.local_aws import LocalDynamoDB  # noqa: E402
+
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    """Point the handler at an in-memory DynamoDB stand-in."""
+    local = LocalDynamoDB()
+    monkeypatch.setitem(crud.clients, "dynamodb", local)
+    monkeypatch.setattr(crud, "BATCH_BACKOFF_BASE", 0)
+    return local
+
+
+def invoke(method, path, body=None, query=None):
+    event = {"httpMethod": method, "path": f"/{crud.STAGE}{path}"}
+    if body is not None:
+        event["body"] = json.dumps(body)
+    if query is not None:
+        event["queryStringParameters"] = query
+    response = crud.handle_request(event)
+    return response["statusCode"], json.loads(response["body"] or "null")
+
+
+# ------------------------------
+# Single-item endpoints
+# ------------------------------
+
+def test_crud_cycle_round_trips_numbers(dynamodb):
+    item = {"id": "num1", "name": "Priced", "price": 9.99, "qty": 3}
+    assert invoke("POST", "/items", item) == (200, {"message": "Item created", "item": item})
+    assert invoke("GET", "/items", query={"id": "num1"}) == (200, item)
+    assert invoke("PUT", "/items", {**item, "qty": 4})[1]["item"]["qty"] == 4
+    assert invoke("DELETE", "/items", query={"id": "num1"}) == (200, {"message": "Item num1 deleted"})
+    assert invoke("GET", "/items", query={"id": "num1"}) == (200, {})
+
+
+def test_responses_do_not_share_header_dicts(dynamodb):
+    events = [{"httpMethod": "OPTIONS", "path": "/any"}, {"httpMethod": "GET", "path": "/"},
+              {"httpMethod": "GET", "path": "/missing"},
+              {"httpMethod": "GET", "path": f"/{crud.STAGE}/items", "queryStringParameters": {"id": "x"}}]
+    for event in events:
+        crud.handle_request(event)["headers"]["X-Added"] = "once"  # e.g. a wrapper adding a header
+        assert "X-Added" not in crud.handle_request(event)["headers"]
+    assert "X-Added" not in crud.CORS_HEADERS and "X-Added" not in crud.JSON_HEADERS
+
+
+def test_emf_metrics_need_no_client(capsys):
+    buffer = crud.MetricsBuffer(mode="emf")
+    buffer.record("RequestsProcessed")
+    buffer.flush()
+    record = json.loads(capsys.readouterr().out)
+    assert record["RequestsProcessed"] == 1
+    assert record["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["FunctionName", "Stage"]]
+    assert "cloudwatch" not in crud.clients
+
+
+# ------------------------------
+# Batch endpoints
+# ------------------------------
+
+def test_batch_create_chunks_to_write_limit(dynamodb):
+    items = [{"id": f"batch{i}", "name": f"Item {i}", "qty": i} for i in range(60)]
+    status, body = invoke("POST", "/items/batch", {"items": items})
+    assert status == 200
+    assert [r["status"] for r in body["results"]] == ["created"] * 60
+    assert dynamodb.batch_calls == 3  # 25 + 25 + 10
+    assert len(dynamodb.Table(crud.TABLE_NAME).items) == 60
+
+
+def test_batch_create_reports_invalid_and_duplicate_items(dynamodb):
+    items = [{"id": "dup", "name": "first"}, {"name": "no id"}, {"id": "dup", "name": "second"}]
+    status, body = invoke("POST", "/items/batch", {"items": items})
+    assert status == 200
+    assert body["results"] == [
+        {"id": None, "status": "error", "error": "Item must be an object with an id"},
+        {"id": "dup", "status": "created"},
+    ]
+    assert dynamodb.Table(crud.TABLE_NAME).items["dup"]["name"] == "second"
+
+
+def test_batch_write_retries_unprocessed_items(dynamodb):
+    dynamodb.throttle_calls = 2
+    items = [{"id": f"retry{i}"} for i in range(10)]
+    status, body = invoke("POST", "/items/batch", items)
+    assert status == 200
+    assert all(r["status"] == "created" for r in body["results"])
+    assert dynamodb.batch_calls == 3
+
+
+def test_batch_write_gives_up_after_max_retries(dynamodb, monkeypatch):
+    monkeypatch.setattr(crud, "BATCH_MAX_RETRIES", 1)
+    dynamodb.throttle_calls = 10
+    status, body = invoke("POST", "/items/batch", {"items": [{"id": "a"}, {"id": "b"}, {"id": "c"}]})
+    assert status == 200
+    assert [r["status"] for r in body["results"]] == ["created", "created", "unprocessed"]
+
+
+def handler_invoke(method, path, body, timeout_s):
+    event = {"httpMethod": method, "path": f"/{crud.STAGE}{path}", "body": json.dumps(body)}
+    response = crud.lambda_handler(event, LambdaContext("QAFrameworkCRUD", timeout_s=timeout_s))
+    return response["statusCode"], json.loads(response["body"])
+
+
+def test_batch_retries_stop_at_the_invocation_deadline(dynamodb, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(crud.time, "sleep", sleeps.append)
+    monkeypatch.setattr(crud.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(crud, "metrics", crud.MetricsBuffer())
+    items = {"items": [{"id": f"late{i}"} for i in range(60)]}
+
+    # 0.5 s left before the margin: a 10 s backoff is skipped, every chunk is still sent once
+    monkeypatch.setattr(crud, "BATCH_BACKOFF_BASE", 10)
+    dynamodb.throttle_calls = 10
+    status, body = handler_invoke("POST", "/items/batch", items, timeout_s=crud.BATCH_DEADLINE_MARGIN + 0.5)
+    assert status == 200 and sleeps == [] and dynamodb.batch_calls == 3
+    assert [r["status"] for r in body["results"]].count("unprocessed") == 57
+    assert crud.request_deadline is None
+
+    # Deadline already reached: nothing is sent and everything comes back unprocessed
+    status, body = handler_invoke("POST", "/items/batch", items, timeout_s=crud.BATCH_DEADLINE_MARGIN)
+    assert status == 200 and dynamodb.batch_calls == 3
+    assert body["message"] == "0 items created"
+    assert {r["status"] for r in body["results"]} == {"unprocessed"}
+
+
+def test_batch_get_returns_per_item_results_in_request_order(dynamodb):
+    invoke("POST", "/items/batch", {"items": [{"id": f"get{i}", "qty": i} for i in range(150)]})
+    ids = ",".join(["get149", "missing", "get0"] + [f"get{i}" for i in range(1, 120)])
+    status, body = invoke("GET", "/items/batch", query={"ids": ids})
+    assert status == 200
+    results = body["results"]
+    assert results[0] == {"id": "get149", "status": "found", "item": {"id": "get149", "qty": 149}}
+    assert results[1] == {"id": "missing", "status": "not_found"}
+    assert results[2]["status"] == "found"
+    assert len(results) == 122
+
+
+def test_batch_get_retries_unprocessed_keys(dynamodb):
+    invoke("POST", "/items/batch", {"items": [{"id": "k1"}, {"id": "k2"}, {"id": "k3"}]})
+    dynamodb.throttle_calls = 1
+    status, body = invoke("GET", "/items/batch", query={"ids": "k1,k2,k3"})
+    assert [r["status"] for r in body["results"]] == ["found", "found", "found"]
+
+
+def test_batch_delete_accepts_query_or_body(dynamodb):
+    invoke("POST", "/items/batch", {"items": [{"id": "d1"}, {"id": "d2"}, {"id": "d3"}]})
+    status, body = invoke("DELETE", "/items/batch", query={"ids": "d1,d2"})
+    assert status == 200
+    assert [r["status"] for r in body["results"]] == ["deleted", "deleted"]
+    status, body = invoke("DELETE", "/items/batch", {"ids": ["d3"]})
+    assert body["results"] == [{"id": "d3", "status": "deleted"}]
+    assert dynamodb.Table(crud.TABLE_NAME).items == {}
+
+
+def test_batch_rejects_oversized_requests(dynamodb, monkeypatch):
+    monkeypatch.setattr(crud, "BATCH_MAX_ITEMS", 2)
+    status, body = invoke("GET", "/items/batch", query={"ids": "a,b,c"})
+    assert status == 400
+    assert "At most 2 items" in body["error"]
+
+
+# ------------------------------
+# List endpoint
+# ------------------------------
+
+def list_all(query):
+    ids, pages = [], 0
+    while True:
+        status, body = invoke("GET", "/items/list", query=query)
+        assert status == 200
+        ids += [item["id"] for item in body["items"]]
+        pages += 1
+        if not body["next_cursor"]:
+            return ids, pages
+        query = {**query, "cursor": body["next_cursor"]}
+
+
+def test_list_pages_through_every_item_once(dynamodb):
+    invoke("POST", "/items/batch", {"items": [{"id": f"list{i:03d}"} for i in range(250)]})
+    ids, pages = list_all({"limit": "100"})
+    assert sorted(ids) == [f"list{i:03d}" for i in range(250)]
+    assert pages == 3
+
+
+def test_list_parallel_segments_partition_the_table(dynamodb):
+    invoke("POST", "/items/batch", {"items": [{"id": f"seg{i}"} for i in range(200)]})
+    seen = []
+    for segment in range(4):
+        ids, _ = list_all({"limit": "30", "segment": str(segment), "total_segments": "4"})
+        seen += ids
+    assert sorted(seen) == sorted(f"seg{i}" for i in range(200))
+
+
+def test_list_caps_limit_and_rejects_bad_parameters(dynamodb, monkeypatch):
+    monkeypatch.setattr(crud, "LIST_MAX_LIMIT", 5)
+    invoke("POST", "/items/batch", {"items": [{"id": f"cap{i}"} for i in range(10)]})
+    status, body = invoke("GET", "/items/list", query={"limit": "500"})
+    assert status == 200 and body["count"] == 5
+    assert invoke("GET", "/items/list", query={"cursor": "not-a-cursor"})[0] == 400
+    assert invoke("GET", "/items/list", query={"segment": "4", "total_segments": "4"})[0] == 400
+
+
+# ------------------------------
+# Item cache
+# ------------------------------
+
+@pytest.fixture
+def item_cache(dynamodb, monkeypatch):
+    cache = crud.ItemCache(ttl=60, max_entries=3, max_bytes=10_000)
+    monkeypatch.setattr(crud, "item_cache", cache)
+    monkeypatch.setattr(crud, "metrics", crud.MetricsBuffer())
+    return cache
+
+
+def test_cache_serves_repeated_reads_without_dynamodb(dynamodb, item_cache):
+    invoke("POST", "/items", {"id": "c1", "name": "Cached"})
+    calls = dynamodb.calls
+    for _ in range(3):
+        status, body = invoke("GET", "/items", query={"id": "c1"})
+        assert status == 200 and body == {"id": "c1", "name": "Cached"}
+    assert dynamodb.calls == calls + 1
+    assert crud.metrics.counters == {"ItemCacheMisses": 1, "ItemCacheHits": 2}
+
+
+def test_cache_is_invalidated_by_put_and_delete(dynamodb, item_cache):
+    invoke("POST", "/items", {"id": "c2", "name": "Before"})
+    invoke("GET", "/items", query={"id": "c2"})
+    invoke("PUT", "/items", {"id": "c2", "name": "After"})
+    assert invoke("GET", "/items", query={"id": "c2"})[1]["name"] == "After"
+    invoke("DELETE", "/items", query={"id": "c2"})
+    assert invoke("GET", "/items", query={"id": "c2"})[1] == {}
+
+
+def test_cache_is_invalidated_by_numeric_json_ids(dynamodb, item_cache):
+    assert invoke("POST", "/items", {"id": 42, "name": "Before"})[1]["item"]["id"] == "42"
+    assert invoke("GET", "/items", query={"id": "42"})[1]["name"] == "Before"
+    invoke("PUT", "/items", {"id": 42, "name": "After"})
+    assert invoke("GET", "/items", query={"id": "42"})[1]["name"] == "After"
+    invoke("POST", "/items/batch", {"items": [{"id": 42, "name": "Batched"}]})
+    assert invoke("GET", "/items", query={"id": "42"})[1]["name"] == "Batched"
+
+
+def test_cache_evicts_least_recently_used_and_expires(dynamodb, item_cache):
+    invoke("POST", "/items/batch", {"items": [{"id": f"e{i}"} for i in range(4)]})
+    for i in range(4):
+        invoke("GET", "/items", query={"id": f"e{i}"})
+    assert list(item_cache.entries) == ["e1", "e2", "e3"]
+    assert crud.metrics.counters["ItemCacheEvictions"] == 1
+
+    item_cache.ttl = 0
+    invoke("GET", "/items", query={"id": "e0"})
+    invoke("GET", "/items", query={"id": "e0"})
+    assert "ItemCacheHits" not in crud.metrics.counters
+
+
+def test_consistent_read_bypasses_cache(dynamodb, item_cache):
+    table = dynamodb.Table(crud.TABLE_NAME)
+    invoke("POST", "/items", {"id": "c3", "name": "Fresh"})
+    invoke("GET", "/items", query={"id": "c3"})
+    table.items["c3"]["name"] = "Changed elsewhere"
+    assert invoke("GET", "/items", query={"id": "c3"})[1]["name"] == "Fresh"
+    assert invoke("GET", "/items", query={"id": "c3", "consistent": "true"})[1]["name"] == "Changed elsewhere"
+    assert invoke("GET", "/items", query={"id": "c3"})[1]["name"] == "Changed elsewhere"
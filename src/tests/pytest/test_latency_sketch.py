@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.utils.history_store import HistoryStore
+from src.utils.latency_sketch import LatencySketch, load_sketches, merge_all, save_sketches
+
+
+def lognormal(seed, size, median_ms):
+    return np.random.default_rng(seed).lognormal(np.log(median_ms), 0.6, size)
+
+
+def test_quantiles_within_relative_accuracy():
+    values = lognormal(1, 50000, 120)
+    sketch = LatencySketch(0.01)
+    sketch.add_many(values)
+    for q in (0.5, 0.95, 0.99, 0.999):
+        exact = np.quantile(values, q, method="lower")
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact
+    assert sketch.quantile(0) == values.min() and sketch.quantile(1) == values.max()
+
+    one_by_one = LatencySketch(0.01)
+    for value in values[:1000]:
+        one_by_one.add(value)
+    partial = LatencySketch(0.01)
+    partial.add_many(values[:1000])
+    assert one_by_one.bins == partial.bins
+
+
+def test_merge_equals_one_sketch_of_every_sample():
+    fast, slow = lognormal(2, 9000, 80), lognormal(3, 1000, 1500)
+    whole = LatencySketch()
+    whole.add_many(np.concatenate([fast, slow]))
+    parts = []
+    for values in (fast, slow):
+        part = LatencySketch()
+        part.add_many(values)
+        parts.append(LatencySketch.from_bytes(part.to_bytes()))
+    merged = merge_all(parts)
+    assert merged.bins == whole.bins and merged.count == 10000
+    assert merged.percentiles() == whole.percentiles()
+    with pytest.raises(ValueError):
+        merged.merge(LatencySketch(0.02))
+
+
+def test_sketches_round_trip_through_file_and_history(tmp_path):
+    sketch = LatencySketch()
+    sketch.add_many([0.0, 12.5, 250.0, 2000.0])
+    path = str(tmp_path / "results_sketches.json")
+    save_sketches(path, {"GET /items": sketch, "POST /items": LatencySketch()})
+    loaded = load_sketches(path)
+    assert loaded["GET /items"].percentiles() == sketch.percentiles()
+    assert loaded["POST /items"].quantile(0.99) is None
+
+    with HistoryStore(":memory:") as history:
+        blobs = {label: s.to_bytes() for label, s in loaded.items()}
+        assert history.record_sketches("locust_endpoint", "run-1", blobs, timestamp="2026-01-01 10:00:00") == 2
+        assert history.record_sketches("locust_endpoint", "run-1", blobs) == 0
+        rows = history.sketches("locust_endpoint", label="GET /items")
+        assert [(timestamp, run_id) for timestamp, run_id, _, _ in rows] == [("2026-01-01 10:00:00", "run-1")]
+        assert LatencySketch.from_bytes(rows[0][3]).count == 4
@@ -0,0 +1,72 @@
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from src.utils.latency_stats import check_budgets, percentile, percentile_ci, sample_latency, summarize
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ok_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("q", [0, 50, 90, 99, 100])
+def test_percentile_matches_numpy(q):
+    values = sorted(random.Random(q).expovariate(1 / 50) for _ in range(137))
+    assert percentile(values, q) == pytest.approx(np.percentile(values, q))
+
+
+def test_percentile_ci_brackets_estimate_and_covers_true_median():
+    rng = random.Random(1)
+    covered = 0
+    for _ in range(400):
+        values = sorted(rng.uniform(0, 100) for _ in range(50))
+        low, high = percentile_ci(values, 50)
+        assert low <= percentile(values, 50) <= high
+        covered += low <= 50 <= high
+    assert covered / 400 >= 0.92
+
+
+def test_percentile_ci_upper_bound_needs_enough_samples():
+    values = list(range(30))
+    low, high = percentile_ci(values, 99)
+    assert low is not None and high is None
+    assert percentile_ci(list(range(1000)), 99)[1] is not None
+
+
+def test_check_budgets_only_fails_when_interval_is_over_budget():
+    summary = summarize([100.0] * 25 + [300.0] * 5)
+    verdicts = {v["budget"]: v["verdict"] for v in check_budgets(summary, {"p50": 50})}
+    assert verdicts == {50: "exceeded"}
+    verdicts = [v["verdict"] for v in check_budgets(summary, {"p90": 200, "p50": 1000})]
+    assert verdicts == ["inconclusive", "ok"]
+
+
+def test_sample_latency_splits_connect_from_server_time(ok_server):
+    reused = sample_latency(ok_server, samples=5, warmup=1)
+    assert [s["status"] for s in reused] == [200] * 5
+    assert all(s["connect_ms"] == 0 for s in reused)
+
+    fresh = sample_latency(ok_server, samples=5, new_connection=True)
+    assert all(0 < s["connect_ms"] < s["total_ms"] for s in fresh)
+    assert all(s["server_ms"] < s["total_ms"] for s in fresh)
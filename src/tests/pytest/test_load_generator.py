@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from load_generator import OpenLoopGenerator, parse_stage, percentile_spectrum, schedule
+from src.utils.latency_sketch import LatencySketch
+
+
+def test_schedule_holds_constant_rates_and_ramps():
+    assert parse_stage("100:2") == (100.0, 100.0, 2.0)
+    assert parse_stage("0-50:10") == (0.0, 50.0, 10.0)
+    with pytest.raises(ValueError):
+        parse_stage("0:10")
+
+    offsets = list(schedule([(100, 100, 2), (0, 50, 10)]))
+    assert len(offsets) == 200 + 250
+    assert offsets[:3] == pytest.approx([0.0, 0.01, 0.02])
+    assert offsets == sorted(offsets)
+    # A linear ramp from 0 to 50/s sends a quarter of its requests in the first half
+    ramp = offsets[200:]
+    assert sum(1 for t in ramp if t < 2 + 5) == pytest.approx(62, abs=1)
+
+    poisson = list(schedule([(1000, 1000, 5)], poisson=True))
+    assert len(poisson) == pytest.approx(5000, rel=0.05)
+
+
+def test_percentile_spectrum_halves_the_remaining_distance():
+    sketch = LatencySketch()
+    sketch.add_many(range(1, 1001))
+    rows = percentile_spectrum(sketch, ticks_per_half=1)
+    assert [q for _, q, _, _ in rows[:4]] == [0.0, 0.5, 0.75, 0.875]
+    assert rows[1][0] == pytest.approx(500, rel=0.01)
+    assert rows[-1] == (1000, 1.0, 1000, float("inf"))
+
+
+async def stalling_server(stall_after, stall_s):
+    """Keep-alive HTTP server that answers at once, except for one stall of stall_s seconds."""
+    served = 0
+
+    async def handle(reader, writer):
+        nonlocal served
+        while await reader.readuntil(b"\r\n\r\n"):
+            served += 1
+            if served == stall_after:
+                await asyncio.sleep(stall_s)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def test_latency_is_measured_from_the_intended_send_time():
+    async def scenario():
+        server = await stalling_server(stall_after=50, stall_s=0.3)
+        port = server.sockets[0].getsockname()[1]
+        generator = OpenLoopGenerator(f"http://127.0.0.1:{port}/", connections=1)
+        async with server:
+            return generator, await generator.run([(200, 200, 1.0)], quiet=True)
+
+    generator, results = asyncio.run(scenario())
+    assert results["sent"] == results["completed"] == 200
+    assert results["statuses"] == {"200": 200} and not results["errors"]
+    # ~60 requests were due during the stall: a closed loop would not have sent them at all
+    assert results["latency_ms"]["p90"] > 100
+    assert results["uncorrected_latency_ms"]["p90"] < 50
+    assert generator.corrected.max >= 290
+
+
+def test_bodyless_responses_keep_the_connection():
+    responses = {b"/no-content": b"HTTP/1.1 204 No Content\r\n\r\n",
+                 b"/not-modified": b"HTTP/1.1 304 Not Modified\r\nETag: \"x\"\r\n\r\n",
+                 b"/continue": b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 204 No Content\r\n\r\n",
+                 b"/": b"HTTP/1.1 200 OK\r\nContent-Length: 1000\r\n\r\n"}  # HEAD: headers only
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        while request := await reader.readuntil(b"\r\n\r\n"):
+            writer.write(responses[request.split(b" ")[1]])
+            await writer.drain()
+
+    async def scenario():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            results = []
+            for path, method in (("/no-content", "GET"), ("/not-modified", "GET"), ("/continue", "GET"),
+                                 ("/", "HEAD")):
+                generator = OpenLoopGenerator(f"http://127.0.0.1:{port}{path}", connections=1, timeout=1.0,
+                                              method=method)
+                results.append(await generator.run([(50, 50, 0.2)], quiet=True))
+            return results
+
+    results = asyncio.run(scenario())
+    assert [r["statuses"] for r in results] == [{"204": 10}, {"304": 10}, {"204": 10}, {"200": 10}]
+    assert all(not r["errors"] and r["latency_ms"]["p99"] < 500 for r in results)
+    assert len(connections) == 4  # one kept-alive connection per run
@@ -0,0 +1,74 @@
+import http.client
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from lambda_crud import lambda_crud_function as crud  # noqa: E402
+from src.utils import local_api  # noqa: E402
+from src.utils.local_aws import LocalDynamoDB  # noqa: E402
+
+
+@pytest.fixture(params=["v1", "v2"])
+def local_server(request, monkeypatch):
+    """The emulator serving lambda_crud_function on an ephemeral port."""
+    monkeypatch.setitem(crud.clients, "dynamodb", LocalDynamoDB())
+    monkeypatch.setattr(crud, "metrics", crud.MetricsBuffer(mode="emf", flush_interval=3600))
+    handler = local_api.make_request_handler(crud.lambda_handler, "crud", request.param, crud.STAGE)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    conn.request(method, f"/{crud.STAGE}{path}", body=json.dumps(body) if body is not None else None)
+    response = conn.getresponse()
+    return response.status, dict(response.getheaders()), response.read()
+
+
+@pytest.mark.parametrize("event_format", ["v1", "v2"])
+def test_build_event_matches_handler_event_shapes(event_format):
+    event = local_api.build_event("GET", "/dev/items?id=abc", {"User-Agent": "pytest"}, b"", event_format)
+    assert crud.resolve_request(event) == ("GET", "/dev/items")
+    assert event["queryStringParameters"] == {"id": "abc"}
+
+
+def test_emulator_serves_crud_cycle(local_server):
+    assert request(local_server, "POST", "/items", {"id": "local1", "name": "Local"})[0] == 200
+    status, headers, body = request(local_server, "GET", "/items?id=local1")
+    assert status == 200
+    assert json.loads(body) == {"id": "local1", "name": "Local"}
+    assert headers["Access-Control-Allow-Origin"] == "*"
+    assert request(local_server, "GET", "/wrong-endpoint")[0] == 404
+
+
+def test_invocations_take_turns_within_a_process():
+    running, overlaps = [], []
+
+    def slow_handler(event, context):
+        running.append(1)
+        overlaps.append(len(running))
+        threading.Event().wait(0.02)
+        running.pop()
+        return {"statusCode": 200, "body": "{}"}
+
+    handler = local_api.make_request_handler(slow_handler, "slow", "v1", crud.STAGE)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        clients = [threading.Thread(target=request, args=(server, "GET", "/items")) for _ in range(8)]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert len(overlaps) == 8 and max(overlaps) == 1
@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+from prometheus_client import CollectorRegistry, generate_latest
+
+from src.utils.locust_prometheus import LocustStatsCollector, cumulative_buckets
+
+
+def entry(response_times, failures=0):
+    return SimpleNamespace(num_requests=sum(response_times.values()), num_failures=failures,
+                           response_times=response_times,
+                           total_response_time=sum(ms * n for ms, n in response_times.items()))
+
+
+def test_cumulative_buckets_count_values_up_to_each_bound():
+    assert cumulative_buckets({20: 2, 50: 1, 51: 1, 2400: 3, 20000: 1}, [25, 50, 100, 2500]) == [2, 3, 4, 7, 8]
+    assert cumulative_buckets({}, [25, 50]) == [0, 0, 0]
+
+
+def test_collector_exports_worker_merged_stats():
+    stats = SimpleNamespace(entries={("/items?id=[id]", "GET"): entry({40: 3, 120: 1}, failures=1)})
+    runner = SimpleNamespace(stats=stats, user_count=10, worker_count=4)
+    registry = CollectorRegistry()
+    registry.register(LocustStatsCollector(SimpleNamespace(runner=runner), buckets=(0.05, 0.1, 0.2)))
+    text = generate_latest(registry).decode()
+
+    assert 'locust_requests_total{endpoint="/items?id=[id]",method="GET",status="ok"} 3.0' in text
+    assert 'locust_requests_total{endpoint="/items?id=[id]",method="GET",status="fail"} 1.0' in text
+    assert 'locust_request_latency_seconds_bucket{endpoint="/items?id=[id]",le="0.05",method="GET"} 3.0' in text
+    assert 'locust_request_latency_seconds_bucket{endpoint="/items?id=[id]",le="0.1",method="GET"} 3.0' in text
+    assert 'locust_request_latency_seconds_bucket{endpoint="/items?id=[id]",le="+Inf",method="GET"} 4.0' in text
+    assert 'locust_request_latency_seconds_sum{endpoint="/items?id=[id]",method="GET"} 0.24' in text
+    assert "locust_users 10.0" in text and "locust_workers 4.0" in text
@@ -0,0 +1,49 @@
+from src.utils.locust_stats import read_stats, summarize_history, summarize_stats
+
+STATS = """Type,Name,Request Count,Failure Count,Median Response Time,Average Response Time,Min Response Time,Max Response Time,Average Content Size,Requests/s,Failures/s,50%,66%,75%,80%,90%,95%,98%,99%,99.9%,99.99%,100%
+GET,/health,900,0,10,10.0,5,40,20,30.0,0.0,10,11,12,13,15,20,25,30,40,40,40
+POST,/orders,100,3,500,500.0,100,2100,80,3.33,0.1,500,600,700,800,900,1500,2000,2100,2100,2100,2100
+GET,/never,0,0,0,0,0,0,0,0.0,0.0,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A
+,Aggregated,1000,3,11,59.0,5,2100,26,33.33,0.1,11,12,13,14,20,500,900,1500,2100,2100,2100
+"""
+
+HISTORY = """Timestamp,User Count,Type,Name,Requests/s,Failures/s,50%,66%,75%,80%,90%,95%,98%,99%,99.9%,99.99%,100%,Total Request Count,Total Failure Count,Total Median Response Time,Total Average Response Time,Total Min Response Time,Total Max Response Time,Total Average Content Size
+1700000000,0,,Aggregated,0.000000,0.000000,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,0,0,0,0.0,0,0,0
+1700000001,5,,Aggregated,4.000000,0.000000,10,11,12,13,15,20,25,30,40,40,40,4,0,10,10.0,5,40,20
+1700000002,10,GET,/health,6.000000,0.000000,10,11,12,13,15,20,25,30,40,40,40,6,0,10,10.0,5,40,20
+1700000003,10,,Aggregated,8.000000,0.500000,12,13,14,15,300,900,1500,1700,2100,2100,2100,20,1,11,60.0,5,2100,26
+"""
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content)
+    return str(path)
+
+
+def test_average_is_weighted_by_request_count(tmp_path):
+    endpoints, aggregated = read_stats(write(tmp_path, "results_stats.csv", STATS))
+    assert [e["endpoint"] for e in endpoints] == ["GET /health", "POST /orders", "GET /never"]
+    assert endpoints[2]["p99"] is None
+
+    summary = summarize_stats(endpoints, aggregated)
+    # (900 * 10 + 100 * 500) / 1000; the mean of the endpoint averages would be 170
+    assert summary["avg_response_time"] == 59.0
+    assert summary["requests"] == 1000 and summary["failures"] == 3  # Aggregated is not counted twice
+    assert (summary["p95"], summary["p99"], summary["max_response_time"]) == (500.0, 1500.0, 2100.0)
+
+
+def test_old_locust_headers(tmp_path):
+    old = STATS.replace("Request Count", "# requests").replace("Failure Count", "# failures") \
+        .replace("Average Response Time", "Average response time")
+    endpoints, _ = read_stats(write(tmp_path, "results_stats.csv", old))
+    assert summarize_stats(endpoints)["avg_response_time"] == 59.0
+
+
+def test_history_throughput_over_time(tmp_path):
+    summary, series = summarize_history(write(tmp_path, "results_stats_history.csv", HISTORY))
+    assert [row["timestamp"] for row in series] == [1700000000, 1700000001, 1700000003]
+    assert summary == {"duration_s": 2, "peak_users": 10, "peak_rps": 8.0, "mean_rps": 10.0,
+                       "peak_p95": 900.0, "peak_p99": 1700.0}
+    _, health = summarize_history(write(tmp_path, "full.csv", HISTORY), endpoint="GET /health")
+    assert [row["rps"] for row in health] == [6.0]
@@ -0,0 +1,92 @@
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.utils.history_store import HistoryStore
+from src.utils.perf_regression import check, evaluate, main, mann_whitney_greater
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def seed(history, label, values, metric="p99", suite="locust_endpoint"):
+    start = NOW - timedelta(hours=len(values))
+    history.record_many(suite, [(f"run-{i}", start + timedelta(hours=i + 1), label, {metric: value})
+                                for i, value in enumerate(values)])
+
+
+def test_mann_whitney_matches_exact_counts():
+    # 3 recent values above all 20 baseline values: only 1 of C(23, 3) orderings is as extreme
+    recent = np.array([[30.0, 31.0, 32.0], [1.0, 2.0, np.nan]])
+    baseline = np.vstack([np.arange(20.0), np.arange(20.0)])
+    u, p = mann_whitney_greater(recent, baseline)
+    assert u[0] == 60 and np.isclose(p[0], 1 / 1771)
+    assert u[1] == 4 and p[1] > 0.9  # ties count half
+
+
+def test_spike_shift_and_noise():
+    rng = np.random.default_rng(0)
+    noisy = 200 + rng.normal(0, 10, (3, 23))
+    noisy[1, 0] = 420            # current run doubled
+    noisy[2, :3] += 60           # last three runs all ~30% slower
+    constant = np.full((1, 23), 100.0)
+    short = np.full((1, 23), np.nan)
+    short[0, :6] = 100.0         # 3 baseline runs only
+    results = evaluate(np.vstack([noisy, constant, short]))
+    assert results["status"].tolist() == ["ok", "regression", "regression", "ok", "insufficient"]
+    assert results["robust_z"][1] > 3.5 and results["mw_p"][2] < 0.01
+
+
+def test_gate_writes_verdict_and_fails_on_regression(tmp_path):
+    db = str(tmp_path / "history.sqlite3")
+    rng = np.random.default_rng(1)
+    with HistoryStore(db) as history:
+        seed(history, "GET /items", list(300 + rng.normal(0, 15, 20)) + [650.0])
+        seed(history, "POST /items", list(300 + rng.normal(0, 15, 21)))
+        history.record("locust_endpoint", "old", {"p99": 900.0}, timestamp=NOW - timedelta(days=10),
+                       label="GET /retired")
+        report = check(history, now=NOW)
+    assert report["verdict"] == "regression" and report["counts"]["regression"] == 1
+    regression = next(s for s in report["series"] if s["status"] == "regression")
+    assert (regression["label"], regression["metric"], regression["current"]) == ("GET /items", "p99", 650.0)
+    assert "GET /retired" not in {s["label"] for s in report["series"]}  # older than --max-age-hours
+
+    output = str(tmp_path / "regression.json")
+    assert main(["--history-db", db, "--output", output, "--days", "0", "--max-age-hours", "0"]) == 1
+    with open(output) as f:
+        assert json.load(f)["verdict"] == "regression"
+    assert main(["--history-db", db, "--output", output, "--suites", "latency"]) == 0
+
+
+def test_regressed_runs_stay_out_of_the_baseline_until_accepted(tmp_path):
+    db = str(tmp_path / "history.sqlite3")
+    output = str(tmp_path / "regression.json")
+    gate = ["--history-db", db, "--output", output, "--days", "0", "--max-age-hours", "0"]
+    rng = np.random.default_rng(2)
+    with HistoryStore(db) as history:
+        seed(history, "GET /items", list(300 + rng.normal(0, 15, 20)))
+    assert main(gate) == 0
+
+    # An intended 2x slowdown: every later run fails, and none of them moves the baseline
+    for i in range(12):
+        with HistoryStore(db) as history:
+            history.record("locust_endpoint", f"slow-{i}", {"p99": 600.0 + i}, label="GET /items",
+                           timestamp=NOW + timedelta(hours=i + 1))
+        assert main(gate) == 1
+    with open(output) as f:
+        series = json.load(f)["series"][0]
+    assert series["baseline_median"] < 350 and series["baseline_runs"] == 18
+    with HistoryStore(db) as history:
+        assert list(history.flags("locust_endpoint").values()) == ["regression"] * 12
+
+    assert main(gate + ["--accept"]) == 0
+    with HistoryStore(db) as history:
+        assert history.flags("locust_endpoint")[("slow-11", "GET /items")] == "accepted"
+        report = check(history, days=0, max_age_hours=0, now=NOW)
+        assert report["series"][0]["status"] == "insufficient"  # the old runs no longer count
+        for i in range(12, 20):
+            history.record("locust_endpoint", f"slow-{i}", {"p99": 600.0 + i % 3}, label="GET /items",
+                           timestamp=NOW + timedelta(hours=i + 1))
+    assert main(gate) == 0
+    with open(output) as f:
+        assert json.load(f)["series"][0]["status"] == "ok"
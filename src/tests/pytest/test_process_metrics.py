@@ -0,0 +1,71 @@
+import gc
+import os
+import socket
+
+import pytest
+from flask import Flask
+from prometheus_client import CollectorRegistry, Histogram, generate_latest
+from prometheus_flask_exporter import PrometheusMetrics
+
+from src.utils.monitoring.process_metrics import GCPauseTimer, instrument_app, listen_queue_depths
+
+
+@pytest.fixture
+def instrumented_app(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    app = Flask(__name__)
+    metrics = PrometheusMetrics(app, registry=CollectorRegistry())
+    callbacks = list(gc.callbacks)
+    instrument_app(app, metrics)
+
+    @app.route("/")
+    def index():
+        return "ok"
+
+    yield app, metrics.registry
+    gc.callbacks[:] = callbacks
+
+
+def test_scrape_samples_the_process_and_request_metrics(instrumented_app):
+    app, registry = instrumented_app
+    client = app.test_client()
+    assert client.get("/").status_code == 200
+    first = generate_latest(registry).decode()
+    second = generate_latest(registry).decode()
+    pid = os.getpid()
+
+    assert f'app_process_cpu_seconds_total{{mode="user",pid="{pid}"}}' in first
+    assert f'app_memory_bytes{{pid="{pid}"}}' in first
+    assert f'app_open_fds{{pid="{pid}"}}' in first and f'app_threads{{pid="{pid}"}}' in first
+    # CPU percent needs a previous scrape to compare against
+    assert "app_cpu_percent{" not in first and f'app_cpu_percent{{pid="{pid}"}}' in second
+    assert "app_requests_in_progress 0.0" in second
+
+
+def test_gc_pauses_are_timed_per_generation(instrumented_app):
+    _, registry = instrumented_app
+    gc.collect()
+    text = generate_latest(registry).decode()
+    assert f'app_gc_pause_seconds_count{{generation="2",pid="{os.getpid()}"}}' in text
+
+    registry = CollectorRegistry()
+    timer = GCPauseTimer(Histogram("pauses", "GC pauses", ["generation", "pid"], registry=registry))
+    timer("start", {"generation": 1})
+    timer("stop", {"generation": 1})
+    assert registry.get_sample_value("pauses_count", {"generation": "1", "pid": str(os.getpid())}) == 1
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/net/tcp"), reason="reads /proc/net/tcp (Linux)")
+def test_listen_queue_depth_counts_unaccepted_connections():
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen(16)
+        port = server.getsockname()[1]
+        clients = [socket.create_connection(("127.0.0.1", port)) for _ in range(3)]
+        try:
+            assert listen_queue_depths()[port] == 3
+            server.accept()[0].close()
+            assert listen_queue_depths()[port] == 2
+        finally:
+            for client in clients:
+                client.close()
@@ -0,0 +1,80 @@
+from src.utils.report_parsers import iter_robot_tests, parse_junit, parse_robot
+
+ROBOT_7 = """<?xml version="1.0" encoding="UTF-8"?>
+<robot generator="Robot 7.3.2" schemaversion="5">
+<suite id="s1" name="Api Tests">
+<suite id="s1-s1" name="Crud">
+<test id="s1-s1-t1" name="Create Item">
+<kw name="POST On Session"><msg level="INFO">big log message</msg>
+<status status="FAIL" start="2025-09-11T14:29:26.1" elapsed="0.5">keyword failure</status></kw>
+<status status="FAIL" start="2025-09-11T14:29:26.1" elapsed="0.75">Expected 200 but got 500</status>
+</test>
+<test id="s1-s1-t2" name="Read Item">
+<status status="SKIP" start="2025-09-11T14:29:27.0" elapsed="0"/>
+</test>
+<status status="FAIL" start="2025-09-11T14:29:26.0" elapsed="1.0"/>
+</suite>
+<test id="s1-t1" name="Health">
+<status status="PASS" start="2025-09-11T14:29:25.9" elapsed="0.1"/>
+</test>
+<status status="FAIL" start="2025-09-11T14:29:25.8" elapsed="1.2"/>
+</suite>
+<statistics><total><stat pass="1" fail="1" skip="1">All Tests</stat></total></statistics>
+</robot>
+"""
+
+ROBOT_6 = """<?xml version="1.0" encoding="UTF-8"?>
+<robot generator="Robot 6.1">
+<suite id="s1" name="Api Tests">
+<test id="s1-t1" name="Health">
+<status status="PASS" starttime="20250911 14:29:25.900" endtime="20250911 14:29:26.150"/>
+</test>
+</suite>
+</robot>
+"""
+
+JUNIT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites>
+<testsuite name="gw0" tests="2" failures="1" errors="0" skipped="0">
+<testcase classname="test_api" name="test_a" time="0.5"><system-out>lots of output</system-out></testcase>
+<testcase classname="test_api" name="test_b" time="1.0"><failure message="assert 404 == 200">traceback</failure></testcase>
+</testsuite>
+<testsuite name="outer">
+<testsuite name="gw1">
+<testcase classname="test_api" name="test_c" time="0.1"><skipped message="no CORS"/></testcase>
+<testcase classname="test_api" name="test_d" time="0.2"><error>setup failed
+more lines</error></testcase>
+</testsuite>
+</testsuite>
+</testsuites>
+"""
+
+
+def test_parse_robot_keeps_only_test_level_status(tmp_path):
+    path = tmp_path / "output.xml"
+    path.write_text(ROBOT_7)
+    summary, tests = parse_robot(str(path))
+    assert summary == {"total": 3, "pass": 1, "fail": 1, "skip": 1}
+    assert tests[0] == {"name": "Create Item", "suite": "Api Tests.Crud", "status": "FAIL",
+                        "message": "Expected 200 but got 500", "elapsed_s": 0.75}
+    assert [(t["name"], t["suite"]) for t in tests[1:]] == [("Read Item", "Api Tests.Crud"), ("Health", "Api Tests")]
+
+
+def test_robot_6_elapsed_from_start_and_end_times(tmp_path):
+    path = tmp_path / "output.xml"
+    path.write_text(ROBOT_6)
+    (test,) = iter_robot_tests(str(path))
+    assert test["status"] == "PASS"
+    assert abs(test["elapsed_s"] - 0.25) < 1e-9
+
+
+def test_parse_junit_sums_every_testsuite(tmp_path):
+    path = tmp_path / "results.xml"
+    path.write_text(JUNIT)
+    summary, cases = parse_junit(str(path))
+    assert summary == {"tests": 4, "failures": 1, "errors": 1, "skipped": 1, "suites": 2}
+    assert [(c["suite"], c["name"], c["status"]) for c in cases] == [
+        ("gw0", "test_a", "passed"), ("gw0", "test_b", "failed"),
+        ("gw1", "test_c", "skipped"), ("gw1", "test_d", "error")]
+    assert cases[1]["message"] == "assert 404 == 200"
+    assert cases[3]["message"] == "setup failed"
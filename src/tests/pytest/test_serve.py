@@ -0,0 +1,24 @@
+import os
+
+from src.utils.monitoring.serve import child_exit, gunicorn_options, prepare_multiprocess_dir
+
+
+def test_multiprocess_dir_is_emptied_and_exported(tmp_path, monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    (tmp_path / "counter_123.db").write_bytes(b"stale")
+    (tmp_path / "notes.txt").write_text("kept")
+
+    assert prepare_multiprocess_dir(str(tmp_path)) == str(tmp_path)
+    assert os.environ["PROMETHEUS_MULTIPROC_DIR"] == str(tmp_path)
+    assert sorted(os.listdir(tmp_path)) == ["notes.txt"]
+
+
+def test_gunicorn_options_pick_the_worker_class():
+    sync = gunicorn_options(port=5051, workers=3)
+    assert sync["bind"] == "0.0.0.0:5051" and sync["workers"] == 3
+    assert sync["worker_class"] == "sync" and sync["accesslog"] is None
+    assert sync["child_exit"] is child_exit
+
+    threaded = gunicorn_options(workers=2, threads=4, access_log=True)
+    assert threaded["worker_class"] == "gthread" and threaded["threads"] == 4 and threaded["accesslog"] == "-"
+    assert gunicorn_options()["workers"] == (os.cpu_count() or 1) * 2 + 1
@@ -1,6 +1,32 @@
 import boto3
 import json
+import queue
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# ---------- Clients ----------
+# One client per service for the whole process: creating a client costs tens of ms
+# (endpoint and model loading), and botocore clients are safe to share across threads.
+_clients = {}
+_clients_lock = threading.Lock()
+CLIENT_CONFIG = Config(max_pool_connections=32)
+
+
+def get_client(service):
+    """Memoized boto3 client for a service."""
+    client = _clients.get(service)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(service)
+            if client is None:
+                client = _clients[service] = boto3.client(service, config=CLIENT_CONFIG)
+    return client
+
 
 # ---------- Lambda Utilities ----------
 def invoke_lambda(function_name, payload=None, invocation_type="RequestResponse"):
@@ -11,8 +37,7 @@ def invoke_lambda(function_name, payload=None, invocation_type="RequestResponse"
     :param invocation_type: "RequestResponse" or "Event"
     :return: response dict
     """
-    client = boto3.client("lambda")
-    response = client.invoke(
+    response = get_client("lambda").invoke(
         FunctionName=function_name,
         InvocationType=invocation_type,
         Payload=json.dumps(payload or {})
@@ -34,29 +59,251 @@ def call_api(endpoint_url, method="GET", headers=None, body=None):
         raise ValueError("Unsupported HTTP method")
 
 
+def iter_items(list_url, page_size=100, total_segments=1, timeout=30):
+    """
+    Yield every item from the CRUD API's GET /items/list, following next_cursor.
+    :param list_url: e.g. API_ENDPOINTS["items"] + "/list"
+    :param page_size: items per request (the API caps this at 1000)
+    :param total_segments: > 1 scans that many segments concurrently (parallel scan)
+    At most one page per segment is held in memory at a time.
+    """
+    import requests
+
+    def pages(session, segment):
+        params = {"limit": page_size}
+        if total_segments > 1:
+            params.update(segment=segment, total_segments=total_segments)
+        while True:
+            response = session.get(list_url, params=params, timeout=timeout)
+            response.raise_for_status()
+            page = response.json()
+            yield page["items"]
+            if not page.get("next_cursor"):
+                return
+            params["cursor"] = page["next_cursor"]
+
+    if total_segments <= 1:
+        with requests.Session() as session:
+            for page in pages(session, 0):
+                yield from page
+        return
+
+    # One thread per segment; the bounded queue keeps producers at most a page ahead.
+    # Puts are timed so producers exit once the consumer stops (error or early close)
+    results = queue.Queue(maxsize=total_segments)
+    done = object()
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def scan_segment(segment):
+        try:
+            with requests.Session() as session:
+                for page in pages(session, segment):
+                    if stop.is_set():
+                        return
+                    put(page)
+        except Exception as e:
+            put(e)
+        finally:
+            put(done)
+
+    threads = [threading.Thread(target=scan_segment, args=(segment,), name=f"items-segment-{segment}", daemon=True)
+               for segment in range(total_segments)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        remaining = total_segments
+        while remaining:
+            page = results.get()
+            if page is done:
+                remaining -= 1
+            elif isinstance(page, Exception):
+                raise page
+            else:
+                yield from page
+    finally:
+        stop.set()
+
+
 # ---------- CloudWatch Utilities ----------
-def get_lambda_logs(log_group, start_time, end_time):
+# Log retrieval: filter_log_events pages through nextToken (up to 10,000 events or
+# 1 MB per page). Long windows are split into time shards fetched concurrently;
+# each shard hands its pages to the caller through a small bounded queue, in time
+# order, so memory stays at a few pages per shard whatever the window. Throttled
+# calls back off exponentially with full jitter.
+THROTTLING_CODES = {"ThrottlingException", "TooManyRequestsException", "LimitExceededException",
+                    "ServiceUnavailableException", "RequestLimitExceeded"}
+MAX_RETRIES = 6
+QUEUED_PAGES = 2
+
+
+def call_with_backoff(method, retries=MAX_RETRIES, base=0.2, cap=10.0, **kwargs):
+    """Call a boto3 client method, retrying throttling errors with exponential backoff and full jitter."""
+    for attempt in range(retries + 1):
+        try:
+            return method(**kwargs)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in THROTTLING_CODES or attempt == retries:
+                raise
+            time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+
+def split_window(start_ms, end_ms, shards):
+    """Split [start_ms, end_ms] (inclusive, like filter_log_events) into up to `shards` contiguous ranges."""
+    shards = max(1, min(shards, end_ms - start_ms + 1))
+    edges = [start_ms + (end_ms - start_ms + 1) * i // shards for i in range(shards + 1)]
+    return [(lo, hi - 1) for lo, hi in zip(edges[:-1], edges[1:])]
+
+
+def iter_log_pages(client, log_group, start_ms, end_ms, filter_pattern=None, page_size=None):
+    """Yield each page (list of events) of filter_log_events for one time range, following nextToken."""
+    kwargs = {"logGroupName": log_group, "startTime": start_ms, "endTime": end_ms}
+    if filter_pattern:
+        kwargs["filterPattern"] = filter_pattern
+    if page_size:
+        kwargs["limit"] = page_size
+    while True:
+        response = call_with_backoff(client.filter_log_events, **kwargs)
+        yield response.get("events", [])
+        token = response.get("nextToken")
+        if not token or token == kwargs.get("nextToken"):
+            return
+        kwargs["nextToken"] = token
+
+
+def iter_log_events(log_group, start_time, end_time, filter_pattern=None, shards=1, max_workers=4,
+                    page_size=None, client=None):
     """
-    Fetch logs from CloudWatch for a Lambda.
+    Stream every log event of a log group between two epoch times (seconds), oldest shard first.
+    :param filter_pattern: CloudWatch Logs filter pattern applied server-side, e.g. '"REPORT RequestId"'
+    :param shards: split the window into this many time ranges fetched concurrently
+    :param max_workers: at most this many shards are fetched at the same time
+    :return: generator of events (dicts with timestamp, message, logStreamName, ...)
     """
-    client = boto3.client("logs")
-    events = client.filter_log_events(
-        logGroupName=log_group,
-        startTime=int(start_time * 1000),
-        endTime=int(end_time * 1000),
-    )
-    return [event["message"] for event in events["events"]]
+    client = client or get_client("logs")
+    ranges = split_window(int(start_time * 1000), int(end_time * 1000), shards)
+    if len(ranges) == 1:
+        for page in iter_log_pages(client, log_group, *ranges[0], filter_pattern, page_size):
+            yield from page
+        return
+
+    done = object()
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=QUEUED_PAGES) for _ in ranges]
+
+    def put(results, item):
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def fetch_shard(index):
+        try:
+            for page in iter_log_pages(client, log_group, *ranges[index], filter_pattern, page_size):
+                if stop.is_set():
+                    return
+                put(queues[index], page)
+        except Exception as e:
+            put(queues[index], e)
+        finally:
+            put(queues[index], done)
+
+    # Shards start in order, so the one being read is always running or finished
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="logs-shard")
+    try:
+        for index in range(len(ranges)):
+            executor.submit(fetch_shard, index)
+        for results in queues:
+            while True:
+                page = results.get()
+                if page is done:
+                    break
+                if isinstance(page, Exception):
+                    raise page
+                yield from page
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_lambda_logs(log_group, start_time, end_time, filter_pattern=None, shards=1, max_workers=4):
+    """
+    Stream log messages from CloudWatch for a Lambda (all pages; see iter_log_events).
+    :return: generator of message strings
+    """
+    for event in iter_log_events(log_group, start_time, end_time, filter_pattern, shards, max_workers):
+        yield event["message"]
+
+
+# CloudWatch Logs Insights aggregates server-side: one query returns REPORT-line
+# percentiles instead of downloading every log line.
+LAMBDA_REPORT_QUERY = """filter @type = "REPORT"
+| stats count(*) as invocations, count(@initDuration) as cold_starts,
+    pct(@duration, 50) as duration_p50, pct(@duration, 90) as duration_p90, pct(@duration, 99) as duration_p99,
+    pct(@initDuration, 50) as init_p50, pct(@initDuration, 99) as init_p99,
+    max(@maxMemoryUsed) / 1000 / 1000 as max_memory_mb"""
+
+
+def run_insights_query(log_groups, query, start_time, end_time, limit=None, poll_interval=1.0, timeout=300,
+                       client=None):
+    """
+    Run a CloudWatch Logs Insights query and wait for it.
+    :param log_groups: log group name or list of names
+    :param start_time, end_time: epoch seconds
+    :return: list of result rows as {field: value} dicts (values are strings, as Insights returns them)
+    """
+    client = client or get_client("logs")
+    kwargs = {"logGroupNames": [log_groups] if isinstance(log_groups, str) else list(log_groups),
+              "startTime": int(start_time), "endTime": int(end_time), "queryString": query}
+    if limit:
+        kwargs["limit"] = limit
+    query_id = call_with_backoff(client.start_query, **kwargs)["queryId"]
+    deadline = time.monotonic() + timeout
+    while True:
+        response = call_with_backoff(client.get_query_results, queryId=query_id)
+        status = response["status"]
+        if status == "Complete":
+            return [{field["field"]: field.get("value") for field in row if field["field"] != "@ptr"}
+                    for row in response.get("results", [])]
+        if status in ("Failed", "Cancelled", "Timeout", "Unknown"):
+            raise RuntimeError(f"Logs Insights query {query_id} ended with status {status}")
+        if time.monotonic() > deadline:
+            call_with_backoff(client.stop_query, queryId=query_id)
+            raise TimeoutError(f"Logs Insights query {query_id} still {status} after {timeout} s")
+        time.sleep(poll_interval)
+
+
+def lambda_report_stats(function_name, start_time, end_time, **kwargs):
+    """
+    Invocation count, cold starts and Duration / Init Duration percentiles (ms) of a Lambda's
+    REPORT lines, aggregated by Logs Insights.
+    :return: dict of floats (None where Insights returned no value, e.g. no cold start)
+    """
+    rows = run_insights_query(f"/aws/lambda/{function_name}", LAMBDA_REPORT_QUERY, start_time, end_time, **kwargs)
+    stats = rows[0] if rows else {}
+    return {name: float(stats[name]) if stats.get(name) not in (None, "") else None
+            for name in ("invocations", "cold_starts", "duration_p50", "duration_p90", "duration_p99",
+                         "init_p50", "init_p99", "max_memory_mb")}
 
 
 def get_cloudwatch_metrics(namespace, metric_name, function_name, minutes=5):
     """
     Fetch recent CloudWatch metrics for Lambda.
     """
-    client = boto3.client("cloudwatch")
     end = int(time.time())
     start = end - (minutes * 60)
 
-    response = client.get_metric_statistics(
+    response = get_client("cloudwatch").get_metric_statistics(
         Namespace=namespace,
         MetricName=metric_name,
         Dimensions=[{"Name": "FunctionName", "Value": function_name}],
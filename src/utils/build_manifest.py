@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+
+from src.utils.history_store import file_digest
+
+# ---------- Incremental build manifest ----------
+# generate_dashboard.py builds the page from independent sections (PyTest,
+# Robot, Locust, CloudWatch). The manifest records, per section, a key over
+# the content hashes of its input files plus any extra state (history window,
+# history row counts, script version) and caches the section's rendered HTML
+# fragment. A section whose key is unchanged is not re-parsed or re-rendered.
+#
+# Input files are only re-hashed when their size or mtime changed, so checking
+# an unchanged 1 GB output.xml costs one stat() call.
+
+DEFAULT_DIR = "reports/.dashboard_cache"
+MANIFEST_VERSION = 1
+
+
+class BuildManifest:
+    """Content-hash manifest plus cached HTML fragments, one per dashboard section."""
+
+    def __init__(self, cache_dir=DEFAULT_DIR, version=""):
+        """
+        :param cache_dir: where manifest.json and the <section>.html fragments live
+        :param version: mixed into every key, e.g. a hash of the generating script,
+                        so code changes invalidate every cached fragment
+        """
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, "manifest.json")
+        self.version = version
+        self.data = {"version": MANIFEST_VERSION, "files": {}, "sections": {}, "output": None}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.data = data
+        except (OSError, ValueError):
+            pass
+        self.rebuilt = []
+
+    # ---------- Inputs ----------
+    def fingerprint(self, path):
+        """
+        {"size", "mtime_ns", "sha1"} for a file, or None if it does not exist.
+        The stored sha1 is reused while size and mtime are unchanged.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.data["files"].pop(path, None)
+            return None
+        known = self.data["files"].get(path)
+        if known and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+            return known
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": file_digest(path)}
+        self.data["files"][path] = entry
+        return entry
+
+    def key(self, inputs, **state):
+        """
+        Section key over the content of `inputs` (file paths; missing files count as absent)
+        and any JSON-serialisable extra state.
+        """
+        digest = hashlib.sha1(self.version.encode())
+        for path in inputs:
+            entry = self.fingerprint(path)
+            digest.update(f"{path}\0{entry['sha1'] if entry else '-'}\0".encode())
+        digest.update(json.dumps(state, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    # ---------- Fragments ----------
+    def _fragment_path(self, name):
+        return os.path.join(self.cache_dir, f"{name}.html")
+
+    def get(self, name, key):
+        """Cached HTML fragment for a section if it was built with this key, else None."""
+        if self.data["sections"].get(name) != key:
+            return None
+        try:
+            with open(self._fragment_path(name), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def built(self, name):
+        """True if a fragment of the section has been cached, whatever its key or mode."""
+        return name in self.data["sections"]
+
+    def last(self, name, mode=None):
+        """
+        The most recently cached HTML of a section whatever its key, provided it was rendered
+        in `mode` (fragments of different render modes cannot share a page), else None.
+        """
+        key = self.data["sections"].get(name)
+        if not key or self.data.get("modes", {}).get(name) != mode:
+            return None
+        return self.get(name, key)
+
+    def put(self, name, key, html, mode=None):
+        """Cache a freshly rendered section under its key, recording the render mode it was built in."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._fragment_path(name), "w", encoding="utf-8") as f:
+            f.write(html)
+        self.data["sections"][name] = key
+        self.data.setdefault("modes", {})[name] = mode
+        self.rebuilt.append(name)
+
+    # ---------- Output ----------
+    def output_current(self, path):
+        """True if `path` is the page this manifest last wrote and no section was rebuilt since."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return not self.rebuilt and self.data["output"] == [path, st.st_size, st.st_mtime_ns]
+
+    def wrote_output(self, path):
+        st = os.stat(path)
+        self.data["output"] = [path, st.st_size, st.st_mtime_ns]
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.data, f, indent=1)
+        os.replace(tmp, self.path)
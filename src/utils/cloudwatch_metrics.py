@@ -0,0 +1,268 @@
+import argparse
+import json
+import operator
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# ---------- Batched CloudWatch metrics ----------
+# One GetMetricData request covers every (metric, statistic, stage) combination,
+# up to 500 queries per request, and is followed through NextToken pages.
+# Results are cached on disk per query with the time range they cover. A refresh
+# only asks for the part of the window that is not cached yet, plus the last two
+# periods, which may still have been receiving datapoints when they were fetched.
+#
+#   PYTHONPATH=. python src/utils/cloudwatch_metrics.py --minutes 10 \
+#       --check "ColdStartCount:Sum<=2" --check "RequestsProcessed:Sum>=1" --retries 3
+#
+# Checks compare the highest single-period value of the window (lowest for Minimum);
+# --check-window total sums Sum and SampleCount over the whole window instead.
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+NAMESPACE = "QAFramework/Serverless"
+FUNCTION_NAME = "helloLambda"
+METRICS = ["ColdStartCount", "RequestsProcessed"]
+STATS = ["Sum", "p50", "p99"]
+CACHE_PATH = "reports/cloudwatch/metric_cache.json"
+# Files in get_metric_statistics format read by generate_dashboard.py
+LEGACY_JSON = {"ColdStartCount": "reports/cloudwatch/coldstart.json",
+               "RequestsProcessed": "reports/cloudwatch/requests.json"}
+MAX_QUERIES = 500  # per GetMetricData request
+
+CHECK_PATTERN = re.compile(r"^(?P<metric>\w+):(?P<stat>\w+)(?P<op><=|>=|==|<|>)(?P<threshold>-?[\d.]+)$")
+OPERATORS = {"<=": operator.le, ">=": operator.ge, "==": operator.eq, "<": operator.lt, ">": operator.gt}
+
+
+def metric_specs(metrics=METRICS, stats=STATS, stages=("dev",), namespace=NAMESPACE,
+                 function_name=FUNCTION_NAME, period=300):
+    """One query spec per metric x statistic x stage."""
+    return [{"namespace": namespace, "metric": metric, "stat": stat, "period": period,
+             "dimensions": {"FunctionName": function_name, "Stage": stage}}
+            for stage in stages for metric in metrics for stat in stats]
+
+
+def spec_key(spec):
+    dims = ",".join(f"{k}={v}" for k, v in sorted(spec["dimensions"].items()))
+    return f"{spec['namespace']}|{spec['metric']}|{dims}|{spec['stat']}|{spec['period']}"
+
+
+def align(moment, period):
+    """Round a datetime down to a multiple of `period` seconds."""
+    seconds = int(moment.timestamp())
+    return datetime.fromtimestamp(seconds - seconds % period, timezone.utc)
+
+
+def get_metric_data(client, specs, start, end):
+    """
+    Fetch every spec over [start, end) with as few GetMetricData calls as possible.
+    :return: ({spec key: {timestamp str: value}}, number of API calls)
+    """
+    results, calls = {}, 0
+    for offset in range(0, len(specs), MAX_QUERIES):
+        chunk = specs[offset:offset + MAX_QUERIES]
+        ids = {f"m{i}": spec_key(spec) for i, spec in enumerate(chunk)}
+        queries = [{"Id": query_id, "ReturnData": True, "MetricStat": {
+            "Metric": {"Namespace": spec["namespace"], "MetricName": spec["metric"],
+                       "Dimensions": [{"Name": k, "Value": v} for k, v in spec["dimensions"].items()]},
+            "Period": spec["period"], "Stat": spec["stat"]}}
+            for query_id, spec in zip(ids, chunk)]
+        kwargs = {"MetricDataQueries": queries, "StartTime": start, "EndTime": end, "ScanBy": "TimestampAscending"}
+        while True:
+            response = client.get_metric_data(**kwargs)
+            calls += 1
+            for result in response["MetricDataResults"]:
+                points = results.setdefault(ids[result["Id"]], {})
+                points.update((str(ts), value) for ts, value in zip(result["Timestamps"], result["Values"]))
+            if not response.get("NextToken"):
+                break
+            kwargs["NextToken"] = response["NextToken"]
+    return results, calls
+
+
+class MetricCache:
+    """Datapoints per query key plus the contiguous [start, end) range already fetched."""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.data = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.data = json.load(f)
+
+    def missing(self, key, start, end):
+        """The range to fetch so that [start, end) is covered, or None if it already is."""
+        entry = self.data.get(key)
+        if not entry:
+            return start, end
+        covered_start = datetime.fromisoformat(entry["start"])
+        covered_end = datetime.fromisoformat(entry["end"])
+        before, after = start < covered_start, end > covered_end
+        if (before and after) or end < covered_start or start > covered_end:
+            return start, end
+        if before:
+            return start, covered_start
+        if after:
+            return covered_end, end
+        return None
+
+    def merge(self, key, points, start, end):
+        entry = self.data.get(key)
+        if not entry or start > datetime.fromisoformat(entry["end"]) or end < datetime.fromisoformat(entry["start"]):
+            # Only one contiguous range is tracked; a disjoint fetch replaces it
+            entry = self.data[key] = {"start": start.isoformat(), "end": end.isoformat(), "points": {}}
+        entry["points"].update(points)
+        entry["start"] = min(datetime.fromisoformat(entry["start"]), start).isoformat()
+        entry["end"] = max(datetime.fromisoformat(entry["end"]), end).isoformat()
+
+    def points(self, key, start, end):
+        """[(timestamp str, value)] within [start, end), oldest first."""
+        entry = self.data.get(key, {"points": {}})
+        return sorted((ts, value) for ts, value in entry["points"].items()
+                      if start <= datetime.fromisoformat(ts) < end)
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(self.data, f, indent=1)
+
+
+def fetch(specs, start, end, client=None, cache=None, now=None):
+    """
+    Datapoints for every spec over [start, end), fetching only what the cache lacks.
+    Specs missing the same range share one batched request.
+    :return: ({spec key: [(timestamp str, value)]}, number of API calls)
+    """
+    cache = cache if cache is not None else MetricCache(None)
+    now = now or datetime.now(timezone.utc)
+    groups = {}
+    for spec in specs:
+        period = spec["period"]
+        span = cache.missing(spec_key(spec), align(start, period), end)
+        if span is not None:
+            groups.setdefault(span + (period,), []).append(spec)
+
+    if groups and client is None:
+        import boto3
+        client = boto3.client("cloudwatch")
+    calls = 0
+    for (span_start, span_end, period), group in groups.items():
+        data, n = get_metric_data(client, group, span_start, span_end)
+        calls += n
+        # The open period and the one before it (late datapoints) are not marked as covered
+        settled = min(span_end, align(now, period) - timedelta(seconds=period))
+        for spec in group:
+            cache.merge(spec_key(spec), data.get(spec_key(spec), {}), span_start, max(settled, span_start))
+    cache.save()
+    return {spec_key(spec): cache.points(spec_key(spec), align(start, spec["period"]), end) for spec in specs}, calls
+
+
+def aggregate(stat, values, window="period"):
+    """
+    One number for a window: the highest period (lowest for Minimum), or with window="total"
+    the total over the window for Sum/SampleCount.
+    """
+    if not values:
+        return 0.0
+    if window == "total" and stat in ("Sum", "SampleCount"):
+        return float(sum(values))
+    return float(min(values) if stat == "Minimum" else max(values))
+
+
+def evaluate_checks(checks, specs, results, window="period"):
+    """
+    :param checks: strings such as "ColdStartCount:Sum<=2"
+    :param window: "period" checks the highest single period; "total" checks Sum/SampleCount totalled
+                   over the window, which spans 2-3 periods once its start is aligned
+    :return: list of (description, passed), one per check and stage
+    """
+    outcomes = []
+    for check in checks:
+        match = CHECK_PATTERN.match(check.replace(" ", ""))
+        if not match:
+            raise ValueError(f"Bad check {check!r}; expected METRIC:STAT<=N")
+        wanted = [s for s in specs if s["metric"] == match["metric"] and s["stat"] == match["stat"]]
+        if not wanted:
+            raise ValueError(f"Check {check!r} needs --metrics {match['metric']} --stats {match['stat']}")
+        for spec in wanted:
+            value = aggregate(spec["stat"], [v for _, v in results[spec_key(spec)]], window)
+            passed = OPERATORS[match["op"]](value, float(match["threshold"]))
+            outcomes.append((f"{check} [Stage={spec['dimensions']['Stage']}]: {value:g}", passed))
+    return outcomes
+
+
+def write_legacy_json(specs, results, paths=LEGACY_JSON):
+    """
+    Write get_metric_statistics-shaped JSON (Sum plus ExtendedStatistics for percentiles)
+    for the dashboard, one file per metric of the first stage.
+    """
+    stage = specs[0]["dimensions"]["Stage"]
+    for metric, path in paths.items():
+        if not any(spec["metric"] == metric for spec in specs):
+            continue
+        datapoints = {}
+        for spec in specs:
+            if spec["metric"] != metric or spec["dimensions"]["Stage"] != stage:
+                continue
+            for ts, value in results[spec_key(spec)]:
+                point = datapoints.setdefault(ts, {"Timestamp": ts})
+                if spec["stat"].startswith("p"):
+                    point.setdefault("ExtendedStatistics", {})[spec["stat"]] = value
+                else:
+                    point[spec["stat"]] = value
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"Label": metric, "Datapoints": [datapoints[ts] for ts in sorted(datapoints)]}, f)
+
+
+if __name__ == "__main__":
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    parser = argparse.ArgumentParser(description="Fetch CloudWatch metrics with one batched GetMetricData request")
+    parser.add_argument("--metrics", nargs="+", default=METRICS)
+    parser.add_argument("--stats", nargs="+", default=STATS, help="Sum, Average, Maximum, p50, p99, ...")
+    parser.add_argument("--stages", nargs="+", default=["dev"])
+    parser.add_argument("--namespace", default=NAMESPACE)
+    parser.add_argument("--function-name", default=FUNCTION_NAME)
+    parser.add_argument("--period", type=int, default=300)
+    parser.add_argument("--minutes", type=int, default=360, help="Window ending now")
+    parser.add_argument("--cache", default=CACHE_PATH, help="Datapoint cache ('' to disable)")
+    parser.add_argument("--check", action="append", default=[], metavar="METRIC:STAT<=N",
+                        help="Threshold on the highest period of the window (see --check-window)")
+    parser.add_argument("--check-window", choices=["period", "total"], default="period",
+                        help="Check each period (default) or Sum/SampleCount totalled over the whole window")
+    parser.add_argument("--retries", type=int, default=1, help="Attempts before failing the checks")
+    parser.add_argument("--retry-wait", type=int, default=30, help="Seconds between attempts")
+    parser.add_argument("--no-legacy-json", action="store_true",
+                        help="Do not write reports/cloudwatch/{coldstart,requests}.json for the dashboard")
+    args = parser.parse_args()
+
+    specs = metric_specs(args.metrics, args.stats, args.stages, args.namespace, args.function_name, args.period)
+    cache = MetricCache(args.cache or None)
+    total_calls = 0
+    for attempt in range(1, args.retries + 1):
+        end = datetime.now(timezone.utc)
+        results, calls = fetch(specs, end - timedelta(minutes=args.minutes), end, cache=cache)
+        total_calls += calls
+        print(f"Attempt {attempt}: {len(specs)} queries, {calls} GetMetricData call(s)")
+        if not args.no_legacy_json:
+            write_legacy_json(specs, results)
+        outcomes = evaluate_checks(args.check, specs, results, args.check_window)
+        for description, passed in outcomes:
+            print(f"{'✅' if passed else '❌'} {description}")
+        if all(passed for _, passed in outcomes):
+            break
+        if attempt < args.retries:
+            print(f"⏳ Retrying in {args.retry_wait}s...")
+            time.sleep(args.retry_wait)
+    else:
+        print(f"❌ Checks failed after {args.retries} attempt(s) ({total_calls} API calls)")
+        sys.exit(1)
+    # get_metric_statistics takes Statistics or ExtendedStatistics, not both, and one metric per call
+    per_metric = any(not s.startswith("p") for s in args.stats) + any(s.startswith("p") for s in args.stats)
+    print(f"API calls: {total_calls} GetMetricData (get_metric_statistics: "
+          f"{len(args.metrics) * len(args.stages) * per_metric * attempt})")
@@ -0,0 +1,257 @@
+import argparse
+import base64
+import importlib
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+# ---------- Cold-start measurement ----------
+# Forces new execution environments and reads Init Duration from the Lambda REPORT
+# log lines, giving a cold-vs-warm latency distribution.
+#
+# Local mode (offline): each "container" is a fresh interpreter that imports the
+# handler, with the AWS clients swapped for the local stand-ins, then serves events.
+# Like Lambda, it writes START/END/REPORT lines to its log.
+# AWS mode: a new COLD_START_NONCE environment variable makes Lambda discard warm
+# environments. Each invoke returns the tail of its log (LogType="Tail").
+#
+#   PYTHONPATH=. python src/utils/cold_start.py --local --containers 10 --warm 5
+#   PYTHONPATH=. python src/utils/cold_start.py --function QAFrameworkCRUD --containers 5
+#   PYTHONPATH=. python src/utils/cold_start.py --function QAFrameworkCRUD --from-logs 60
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_HANDLER = "lambda_crud.lambda_crud_function:lambda_handler"
+DEFAULT_OUTPUT = "reports/cloudwatch/cold_start.json"
+
+REPORT_PATTERN = re.compile(
+    r"REPORT RequestId: (?P<request_id>\S+)\s+Duration: (?P<duration_ms>[\d.]+) ms\s+"
+    r"Billed Duration: (?P<billed_ms>\d+) ms\s+Memory Size: (?P<memory_mb>\d+) MB\s+"
+    r"Max Memory Used: (?P<max_memory_mb>\d+) MB(?:\s+Init Duration: (?P<init_ms>[\d.]+) ms)?")
+
+RUNTIME = "import sys; from src.utils.cold_start import run_runtime; run_runtime(*sys.argv[1:])"
+
+
+def parse_report_lines(log_text):
+    """
+    Parse Lambda REPORT lines from log output.
+    :return: list of dicts with request_id, duration_ms, billed_ms, memory_mb, max_memory_mb
+             and init_ms (None unless the invocation was a cold start)
+    """
+    reports = []
+    for match in REPORT_PATTERN.finditer(log_text):
+        report = match.groupdict()
+        reports.append({
+            "request_id": report["request_id"],
+            "duration_ms": float(report["duration_ms"]),
+            "billed_ms": int(report["billed_ms"]),
+            "memory_mb": int(report["memory_mb"]),
+            "max_memory_mb": int(report["max_memory_mb"]),
+            "init_ms": float(report["init_ms"]) if report["init_ms"] else None
+        })
+    return reports
+
+
+# ---------- Local execution environments ----------
+def _max_memory_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+
+
+def run_runtime(handler_spec, log_path, memory_mb="128"):
+    """
+    Body of one local execution environment: import the handler (timed as Init Duration),
+    then answer JSON events from stdin, one per line, with JSON results on stdout.
+    Handler output and the START/END/REPORT lines go to log_path, like a log stream.
+    """
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", buffering=1)
+    log = open(log_path, "a", buffering=1)
+    os.dup2(log.fileno(), sys.stdout.fileno())
+    os.dup2(log.fileno(), sys.stderr.fileno())
+
+    module_name, _, function_name = handler_spec.partition(":")
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    handler = getattr(module, function_name or "lambda_handler")
+    init_ms = (time.perf_counter() - start) * 1000
+
+    # Imported after the timed init so the emulator's own imports are not counted
+    from src.utils.local_api import LambdaContext, use_local_aws
+    use_local_aws(module)
+    function_name = module.__name__.rsplit(".", 1)[-1]
+
+    for line in sys.stdin:
+        context = LambdaContext(function_name, memory_mb=int(memory_mb))
+        print(f"START RequestId: {context.aws_request_id} Version: $LATEST", flush=True)
+        start = time.perf_counter()
+        try:
+            result = handler(json.loads(line), context)
+        except Exception as e:
+            result = {"errorMessage": str(e), "errorType": type(e).__name__}
+        duration_ms = (time.perf_counter() - start) * 1000
+        init = f"\tInit Duration: {init_ms:.2f} ms" if init_ms is not None else ""
+        print(f"END RequestId: {context.aws_request_id}", flush=True)
+        print(f"REPORT RequestId: {context.aws_request_id}\tDuration: {duration_ms:.2f} ms\t"
+              f"Billed Duration: {math.ceil(duration_ms)} ms\tMemory Size: {memory_mb} MB\t"
+              f"Max Memory Used: {_max_memory_mb()} MB{init}", flush=True)
+        init_ms = None
+        protocol.write(json.dumps(result, default=str) + "\n")
+
+
+def measure_local(event, containers=10, warm=5, handler_spec=DEFAULT_HANDLER, root=REPO_ROOT):
+    """
+    Start `containers` fresh local environments and invoke each 1 + `warm` times.
+    :return: list of invocation records (kind "cold" or "warm") with client_ms, the
+             time the caller waited including process start and init for cold ones
+    """
+    env = {**os.environ, "AWS_DEFAULT_REGION": os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
+           "PYTHONPATH": os.pathsep.join(filter(None, [root, REPO_ROOT, os.getenv("PYTHONPATH")]))}
+    payload = json.dumps(event) + "\n"
+    records = []
+    with tempfile.TemporaryDirectory(prefix="qa_cold_start_") as log_dir:
+        for n in range(containers):
+            log_path = os.path.join(log_dir, f"container-{n}.log")
+            client_ms = []
+            start = time.perf_counter()
+            process = subprocess.Popen([sys.executable, "-c", RUNTIME, handler_spec, log_path],
+                                       cwd=root, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+            try:
+                for _ in range(1 + warm):
+                    process.stdin.write(payload)
+                    process.stdin.flush()
+                    if not process.stdout.readline():
+                        raise RuntimeError(f"Local runtime exited early, see log:\n{open(log_path).read()}")
+                    client_ms.append((time.perf_counter() - start) * 1000)
+                    start = time.perf_counter()
+            finally:
+                process.stdin.close()
+                process.wait(timeout=30)
+
+            with open(log_path) as f:
+                reports = parse_report_lines(f.read())
+            for report, waited in zip(reports, client_ms):
+                records.append({**report, "kind": "cold" if report["init_ms"] is not None else "warm",
+                                "client_ms": waited, "environment": n})
+    return records
+
+
+# ---------- AWS execution environments ----------
+def force_new_environment(client, function_name):
+    """Change an environment variable so the next invoke cannot reuse a warm environment."""
+    config = client.get_function_configuration(FunctionName=function_name)
+    variables = {**config.get("Environment", {}).get("Variables", {}), "COLD_START_NONCE": uuid.uuid4().hex}
+    client.update_function_configuration(FunctionName=function_name, Environment={"Variables": variables})
+    client.get_waiter("function_updated").wait(FunctionName=function_name)
+
+
+def invoke_with_report(client, function_name, event):
+    """Invoke $LATEST synchronously and parse the REPORT line from the returned log tail."""
+    start = time.perf_counter()
+    response = client.invoke(FunctionName=function_name, Payload=json.dumps(event), LogType="Tail")
+    response["Payload"].read()
+    client_ms = (time.perf_counter() - start) * 1000
+    reports = parse_report_lines(base64.b64decode(response.get("LogResult", "")).decode("utf-8", "replace"))
+    if not reports:
+        raise RuntimeError(f"No REPORT line in the log tail of {function_name}")
+    report = reports[-1]
+    return {**report, "kind": "cold" if report["init_ms"] is not None else "warm", "client_ms": client_ms}
+
+
+def measure_aws(function_name, event, containers=5, warm=5):
+    """Force `containers` new environments of $LATEST and invoke each 1 + `warm` times."""
+    import boto3
+    client = boto3.client("lambda")
+    records = []
+    for n in range(containers):
+        force_new_environment(client, function_name)
+        for _ in range(1 + warm):
+            records.append({**invoke_with_report(client, function_name, event), "environment": n})
+    return records
+
+
+def reports_from_logs(function_name, minutes=60):
+    """REPORT lines of real traffic from CloudWatch Logs; client_ms is unknown (None)."""
+    from src.utils.aws_utils import get_lambda_logs
+    end = time.time()
+    messages = get_lambda_logs(f"/aws/lambda/{function_name}", end - minutes * 60, end,
+                               filter_pattern='"REPORT RequestId"', shards=max(1, minutes // 15))
+    return [{**report, "kind": "cold" if report["init_ms"] is not None else "warm", "client_ms": None}
+            for report in parse_report_lines("\n".join(messages))]
+
+
+# ---------- Results ----------
+def summarize_records(records):
+    """Cold vs warm distributions of init, handler duration and caller-observed latency."""
+    from src.utils.latency_stats import summarize
+    summary = {}
+    for kind in ("cold", "warm"):
+        subset = [r for r in records if r["kind"] == kind]
+        summary[kind] = {
+            "count": len(subset),
+            "duration_ms": summarize([r["duration_ms"] for r in subset]),
+            "client_ms": summarize([r["client_ms"] for r in subset if r["client_ms"] is not None])
+        }
+    summary["cold"]["init_ms"] = summarize([r["init_ms"] for r in records if r["init_ms"] is not None])
+    return summary
+
+
+def write_results(records, mode, target, path=DEFAULT_OUTPUT):
+    results = {"timestamp": time.strftime("%Y-%m-%d %H:%M:%S"), "mode": mode, "target": target,
+               "summary": summarize_records(records), "invocations": records}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def format_summary(summary):
+    lines = []
+    for kind, label in (("cold", "cold"), ("warm", "warm")):
+        stats = summary[kind]
+        line = f"{label}: {stats['count']:4d} invocations"
+        for name in ("init_ms", "duration_ms", "client_ms"):
+            series = stats.get(name)
+            if series and series.get("count"):
+                line += f"  {name} p50={series['p50']['value']:8.2f} p99={series['p99']['value']:8.2f}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    parser = argparse.ArgumentParser(description="Cold-start vs warm latency of a Lambda handler")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--local", action="store_true", help="Fresh local interpreters with the AWS stand-ins")
+    target.add_argument("--function", help="Deployed function name ($LATEST is reconfigured to force cold starts)")
+    parser.add_argument("--handler", default=DEFAULT_HANDLER, help="module:function for --local")
+    parser.add_argument("--containers", type=int, default=10, help="New execution environments to start")
+    parser.add_argument("--warm", type=int, default=5, help="Warm invocations per environment")
+    parser.add_argument("--event", default="root", help="Event name from event.json")
+    parser.add_argument("--from-logs", type=int, metavar="MINUTES",
+                        help="With --function: only harvest REPORT lines from the last MINUTES of logs")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    with open(os.path.join(REPO_ROOT, "event.json")) as f:
+        event = json.load(f)[args.event]
+
+    if args.local:
+        records = measure_local(event, args.containers, args.warm, args.handler)
+        results = write_results(records, "local", args.handler, args.output)
+    elif args.from_logs:
+        results = write_results(reports_from_logs(args.function, args.from_logs), "logs", args.function, args.output)
+    else:
+        records = measure_aws(args.function, event, args.containers, args.warm)
+        results = write_results(records, "aws", args.function, args.output)
+    print(format_summary(results["summary"]))
+    print(f"Results written to {args.output}")
@@ -1,3 +1,5 @@
+import os
+
 # ---------- AWS General ----------
 AWS_REGION = "us-east-1"
 
@@ -7,9 +9,13 @@ LAMBDA_FUNCTIONS = {
 }
 
 # ---------- API Gateway ----------
+# Set API_BASE_URL to point every suite somewhere else, e.g. the local emulator:
+#   python src/utils/local_api.py  ->  API_BASE_URL=http://127.0.0.1:3000/dev
+API_BASE_URL = os.getenv("API_BASE_URL", "https://hp0emdwj90.execute-api.us-east-1.amazonaws.com/dev").rstrip("/")
+
 API_ENDPOINTS = {
-    "health_check": "https://hp0emdwj90.execute-api.us-east-1.amazonaws.com/dev",
-    "items": "https://hp0emdwj90.execute-api.us-east-1.amazonaws.com/dev/items"
+    "health_check": API_BASE_URL,
+    "items": f"{API_BASE_URL}/items"
 }
 
 # ---------- CloudWatch ----------
@@ -0,0 +1,48 @@
+import numpy as np
+
+# ---------- Trend downsampling ----------
+# Min/max decimation for long histories. The series is split into equal-count
+# buckets and each bucket keeps its minimum and maximum, so every spike (a run
+# with failures, a latency outlier) survives. This is the same idea as LTTB,
+# but simpler and guaranteed to keep extremes. A plot of N points drawn from
+# 100k runs looks the same at dashboard width.
+
+
+def minmax_indices(values, buckets):
+    """
+    Sorted row indices that keep the first and last point plus the min and max of each bucket.
+    :param values: 1-D numeric sequence (NaN allowed)
+    :param buckets: number of equal-count buckets between the first and last point
+    """
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    if n <= 2 * buckets + 2:
+        return np.arange(n)
+    keep = [0, n - 1]
+    edges = np.linspace(1, n - 1, buckets + 1).astype(int)
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        segment = y[lo:hi]
+        if not len(segment):
+            continue
+        if np.isnan(segment).all():
+            keep.append(lo)
+            continue
+        keep += [lo + int(np.nanargmin(segment)), lo + int(np.nanargmax(segment))]
+    return np.unique(keep)
+
+
+def downsample_frame(frame, columns, max_points, by=None):
+    """
+    Reduce a trend DataFrame to about `max_points` rows per series, keeping the min and
+    max of every column in each bucket; rows stay in their original order.
+    :param by: column that splits the frame into separate series (e.g. one per test)
+    """
+    if by is not None:
+        import pandas as pd
+        groups = [downsample_frame(group, columns, max_points) for _, group in frame.groupby(by, sort=False)]
+        return pd.concat(groups) if groups else frame
+    if len(frame) <= max_points:
+        return frame
+    buckets = max(1, max_points // (2 * len(columns)))
+    keep = np.unique(np.concatenate([minmax_indices(frame[c].to_numpy(dtype=float), buckets) for c in columns]))
+    return frame.iloc[keep]
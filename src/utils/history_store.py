@@ -0,0 +1,293 @@
+import csv
+import hashlib
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+# ---------- Metrics history store ----------
+# One SQLite file replaces the per-suite *_history.csv files. A run is keyed on
+# (run_id, suite, label) with its timestamp; its metrics are stored long-form,
+# one typed value per row. Re-recording a run_id adds nothing, and trend reads
+# only touch the (suite, timestamp) index range for the requested window instead
+# of reloading every CSV.
+
+DEFAULT_PATH = "reports/history.sqlite3"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# suite -> metric -> type; record() rejects anything else
+SCHEMAS = {
+    "pytest": {"tests": int, "failures": int, "errors": int, "skipped": int},
+    "robot": {"total": int, "pass": int, "fail": int, "skip": int},
+    # avg_response_time is request-weighted; p50/p95/p99 are the Aggregated row's
+    "locust": {"requests": int, "failures": int, "avg_response_time": float, "max_response_time": float,
+               "p50": float, "p95": float, "p99": float, "rps": float, "peak_rps": float, "peak_users": int},
+    # label = "METHOD name"
+    "locust_endpoint": {"requests": int, "failures": int, "avg_response_time": float, "p95": float, "p99": float},
+    "cloudwatch": {"ColdStartCount": float, "RequestsProcessed": float},
+    # label = test name
+    "latency": {"samples": int, "p50": float, "p90": float, "p99": float},
+    # label = mode (local / aws / logs)
+    "cold_start": {"cold_starts": int, "init_p50": float, "cold_client_p50": float, "warm_client_p50": float,
+                   "cold_duration_p50": float, "warm_duration_p50": float},
+}
+
+# Legacy CSV -> (suite, {csv column: metric}), migrated once by migrate_csvs()
+LEGACY_CSVS = {
+    "reports/pytest_history.csv": ("pytest", {c: c for c in SCHEMAS["pytest"]}),
+    "reports/robot_history.csv": ("robot", {c: c for c in ("total", "pass", "fail")}),
+    "reports/locust_history.csv": ("locust", {c: c for c in ("requests", "failures", "avg_response_time")}),
+    "reports/cw_coldstart_history.csv": ("cloudwatch", {"ColdStartCount": "ColdStartCount"}),
+    "reports/cw_processed_history.csv": ("cloudwatch", {"RequestsProcessed": "RequestsProcessed"}),
+}
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_pk INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    label TEXT NOT NULL DEFAULT '',
+    timestamp TEXT NOT NULL,
+    UNIQUE (run_id, suite, label)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_suite_time ON runs (suite, timestamp);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_pk INTEGER NOT NULL REFERENCES runs (run_pk),
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_pk, metric)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sketches (
+    run_pk INTEGER PRIMARY KEY REFERENCES runs (run_pk),
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_flags (
+    run_pk INTEGER PRIMARY KEY REFERENCES runs (run_pk),
+    flag TEXT NOT NULL,
+    flagged_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS migrations (
+    source TEXT PRIMARY KEY,
+    migrated_at TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    skipped INTEGER NOT NULL
+);
+"""
+
+
+def file_digest(path):
+    """sha1 of a file's content, read in 1 MB blocks."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_run_id(path):
+    """Run id from a report file's content, so rebuilding the dashboard from the same report adds nothing."""
+    return file_digest(path)[:16]
+
+
+def coerce(suite, metric, value):
+    """Convert a raw value to the schema type; ValueError for unknown metrics or values such as "?"."""
+    if suite not in SCHEMAS or metric not in SCHEMAS[suite]:
+        raise ValueError(f"Unknown metric {suite}.{metric}")
+    kind = SCHEMAS[suite][metric]
+    return kind(float(value)) if kind is int else kind(value)
+
+
+def valid_metrics(suite, metrics):
+    """The subset of metrics that fit the schema, coerced; values such as "?" or "" are dropped."""
+    valid = {}
+    for metric, value in metrics.items():
+        try:
+            valid[metric] = coerce(suite, metric, value)
+        except (TypeError, ValueError):
+            pass
+    return valid
+
+
+class HistoryStore:
+    """Typed metrics history in SQLite; runs are append-only unless recorded with replace=True."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA_SQL)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, suite, run_id, metrics, timestamp=None, label="", replace=False):
+        """
+        Store one run's metrics for a suite.
+        :param metrics: dict metric -> value, validated against SCHEMAS[suite]
+        :param timestamp: datetime or "YYYY-MM-DD HH:MM:SS" (default: now); ignored if the run exists
+        :param replace: overwrite values this run_id already recorded (e.g. a CloudWatch period that
+                        was still open when first read); by default they are kept
+        :return: number of new (or, with replace, changed) values; 0 when nothing changed
+        """
+        return self.record_many(suite, [(run_id, timestamp, label, metrics)], replace)
+
+    def record_many(self, suite, runs, replace=False):
+        """Bulk record(): runs is an iterable of (run_id, timestamp, label, metrics) in one transaction."""
+        now = datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self.db:
+            before = self.db.total_changes
+            rows = []
+            for run_id, timestamp, label, metrics in runs:
+                values = [(metric, coerce(suite, metric, value)) for metric, value in metrics.items()]
+                run_pk = self._run_pk(suite, run_id, timestamp or now, label)
+                rows.extend((run_pk, metric, value) for metric, value in values)
+            runs_added = self.db.total_changes - before
+            if replace:
+                self.db.executemany("INSERT INTO metrics VALUES (?, ?, ?) ON CONFLICT (run_pk, metric) "
+                                    "DO UPDATE SET value = excluded.value WHERE value != excluded.value", rows)
+            else:
+                self.db.executemany("INSERT OR IGNORE INTO metrics VALUES (?, ?, ?)", rows)
+            return self.db.total_changes - before - runs_added
+
+    def _run_pk(self, suite, run_id, timestamp, label):
+        """run_pk of (run_id, suite, label), inserting the run if it is new (inside a transaction)."""
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.strftime(TIMESTAMP_FORMAT)
+        key = (str(run_id), suite, label or "")
+        cursor = self.db.execute("INSERT OR IGNORE INTO runs (run_id, suite, label, timestamp) "
+                                 "VALUES (?, ?, ?, ?)", key + (timestamp,))
+        return cursor.lastrowid if cursor.rowcount else self.db.execute(
+            "SELECT run_pk FROM runs WHERE run_id = ? AND suite = ? AND label = ?", key).fetchone()[0]
+
+    def record_sketches(self, suite, run_id, sketches, timestamp=None):
+        """
+        Store one serialized latency sketch per label for a run (see latency_sketch.LatencySketch.to_bytes).
+        :param sketches: dict label -> bytes
+        :return: number of new sketches; 0 when this run_id already recorded them
+        """
+        timestamp = timestamp or datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self.db:
+            before = self.db.total_changes
+            rows = [(self._run_pk(suite, run_id, timestamp, label), data) for label, data in sketches.items()]
+            runs_added = self.db.total_changes - before
+            self.db.executemany("INSERT OR IGNORE INTO sketches VALUES (?, ?)", rows)
+            return self.db.total_changes - before - runs_added
+
+    def flag_runs(self, suite, runs, flag):
+        """
+        Mark recorded runs, replacing an earlier flag (see perf_regression: "regression", "accepted").
+        :param runs: iterable of (run_id, label); runs not recorded for this suite are ignored
+        :return: number of runs flagged
+        """
+        now = datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self.db:
+            before = self.db.total_changes
+            self.db.executemany("INSERT INTO run_flags SELECT run_pk, ?, ? FROM runs "
+                                "WHERE run_id = ? AND suite = ? AND label = ? ON CONFLICT (run_pk) "
+                                "DO UPDATE SET flag = excluded.flag, flagged_at = excluded.flagged_at",
+                                [(flag, now, str(run_id), suite, label or "") for run_id, label in set(runs)])
+            return self.db.total_changes - before
+
+    def flags(self, suite):
+        """{(run_id, label): flag} of a suite's flagged runs."""
+        return {(run_id, label): flag for run_id, label, flag in self.db.execute(
+            "SELECT r.run_id, r.label, f.flag FROM runs r JOIN run_flags f ON f.run_pk = r.run_pk "
+            "WHERE r.suite = ?", (suite,))}
+
+    def sketches(self, suite, days=None, label=None, now=None):
+        """Rows (timestamp, run_id, label, data) of a suite's stored sketches, oldest first."""
+        where, params = self._where(suite, None, days, label, now)
+        return self.db.execute("SELECT r.timestamp, r.run_id, r.label, s.data "
+                               "FROM runs r JOIN sketches s ON s.run_pk = r.run_pk"
+                               + where + " ORDER BY r.timestamp, r.run_pk", params).fetchall()
+
+    def state(self, *suites):
+        """[suite, runs, last run_pk] per suite: changes whenever any run is added, so it can key a cache."""
+        return [[suite] + list(self.db.execute("SELECT COUNT(*), MAX(run_pk) FROM runs WHERE suite = ?",
+                                               (suite,)).fetchone()) for suite in suites]
+
+    def _where(self, suite, metrics, days, label, now):
+        sql = " WHERE r.suite = ?"
+        params = [suite]
+        if days:
+            since = (now or datetime.now()) - timedelta(days=days)
+            sql += " AND r.timestamp >= ?"
+            params.append(since.strftime(TIMESTAMP_FORMAT))
+        if label is not None:
+            sql += " AND r.label = ?"
+            params.append(label)
+        if metrics:
+            sql += f" AND m.metric IN ({', '.join('?' * len(metrics))})"
+            params += list(metrics)
+        return sql, params
+
+    def query(self, suite, metrics=None, days=None, label=None, now=None):
+        """
+        Rows (timestamp, run_id, label, metric, value) for a suite, oldest first.
+        :param metrics: restrict to these metric names
+        :param days: only the last N days; the filter is applied on the (suite, timestamp) index
+        """
+        where, params = self._where(suite, metrics, days, label, now)
+        return self.db.execute("SELECT r.timestamp, r.run_id, r.label, m.metric, m.value "
+                               "FROM runs r JOIN metrics m ON m.run_pk = r.run_pk"
+                               + where + " ORDER BY r.timestamp, r.run_pk", params).fetchall()
+
+    def trend(self, suite, metrics=None, days=None, label=None, now=None):
+        """
+        One row per run: (timestamp, run_id, label, *metrics), oldest first, pivoted in SQL.
+        Metrics a run did not record are None.
+        """
+        metrics = list(metrics or SCHEMAS[suite])
+        columns = ", ".join("MAX(CASE WHEN m.metric = ? THEN m.value END)" for _ in metrics)
+        where, params = self._where(suite, metrics, days, label, now)
+        return self.db.execute(f"SELECT r.timestamp, r.run_id, r.label, {columns} "
+                               f"FROM runs r JOIN metrics m ON m.run_pk = r.run_pk{where} "
+                               "GROUP BY r.timestamp, r.run_pk ORDER BY r.timestamp, r.run_pk",
+                               metrics + params).fetchall()
+
+    def trend_frame(self, suite, metrics=None, days=None, label=None, now=None):
+        """trend() as a DataFrame with timestamp, run_id, label and one column per metric."""
+        import pandas as pd
+        metrics = list(metrics or SCHEMAS[suite])
+        return pd.DataFrame.from_records(self.trend(suite, metrics, days, label, now),
+                                         columns=["timestamp", "run_id", "label"] + metrics)
+
+    def migrate_csv(self, path, suite, column_map):
+        """
+        Import a legacy history CSV once (tracked in the migrations table).
+        Values that do not fit the schema (e.g. "?") are skipped and counted.
+        :return: (rows imported, values skipped), or None if already migrated / missing
+        """
+        source = os.path.normpath(path)
+        if not os.path.exists(path) or self.db.execute(
+                "SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone():
+            return None
+        runs, skipped = [], 0
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                metrics = valid_metrics(suite, {metric: row.get(column) for column, metric in column_map.items()})
+                skipped += len(column_map) - len(metrics)
+                if metrics and row.get("timestamp"):
+                    runs.append((f"legacy:{row['timestamp']}", row["timestamp"], "", metrics))
+        inserted = self.record_many(suite, runs)
+        with self.db:
+            self.db.execute("INSERT INTO migrations VALUES (?, ?, ?, ?)",
+                            (source, datetime.now().strftime(TIMESTAMP_FORMAT), inserted, skipped))
+        return inserted, skipped
+
+    def migrate_csvs(self, legacy=LEGACY_CSVS):
+        """One-time import of every legacy *_history.csv; returns {path: (rows, skipped)} for new migrations."""
+        results = {}
+        for path, (suite, column_map) in legacy.items():
+            result = self.migrate_csv(path, suite, column_map)
+            if result is not None:
+                results[path] = result
+        return results
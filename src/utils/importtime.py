@@ -0,0 +1,52 @@
+import argparse
+import os
+import subprocess
+import sys
+
+
+# ---------- Import-time profiling ----------
+# Wraps `python -X importtime` so cold-start init cost can be read per module.
+
+def profile_imports(module, cwd=".", env=None, python=sys.executable):
+    """
+    Import a module in a fresh interpreter and return its -X importtime rows.
+    :param module: dotted module path, e.g. "lambda_crud.lambda_crud_function"
+    :param env: extra environment variables for the interpreter
+    :return: list of dicts with module, self_us, cumulative_us and depth (0 = top level)
+    """
+    env = {**os.environ, **(env or {}),
+           "PYTHONPATH": os.pathsep.join(filter(None, [cwd, os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2
+        })
+    return rows
+
+
+def format_report(rows, top=15):
+    """Top-level imports by cumulative time, then the most expensive modules by self time."""
+    total = sum(r["cumulative_us"] for r in rows if r["depth"] == 0)
+    lines = [f"Total import time: {total / 1000:.1f} ms", "", "Top-level imports (cumulative):"]
+    for r in sorted((r for r in rows if r["depth"] == 0), key=lambda r: -r["cumulative_us"])[:top]:
+        lines.append(f"  {r['cumulative_us'] / 1000:9.1f} ms  {r['module']}")
+    lines += ["", "Most expensive modules (self):"]
+    for r in sorted(rows, key=lambda r: -r["self_us"])[:top]:
+        lines.append(f"  {r['self_us'] / 1000:9.1f} ms  {r['module']}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-module import time for a handler module")
+    parser.add_argument("module", help="e.g. lambda_crud.lambda_crud_function")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    print(format_report(profile_imports(args.module), args.top))
@@ -0,0 +1,170 @@
+import base64
+import json
+import math
+import os
+import struct
+import zlib
+
+# ---------- Mergeable latency sketch ----------
+# DDSketch (Masson et al., VLDB 2019): values are counted in logarithmic buckets
+# where bucket i covers (gamma^(i-1), gamma^i] with gamma = (1 + a) / (1 - a).
+# Any quantile is then returned within relative error a of the exact value.
+# Merging two sketches adds their bucket counts, so the result is exactly what
+# one sketch fed both streams would hold. Per-endpoint sketches can be combined
+# across workers, runs and time windows, which fixed percentile columns
+# (Locust's 95%/99%) cannot.
+#
+# With a = 1% a sketch of 1 ms - 60 s latencies has at most ~550 buckets; it
+# serializes to a few hundred bytes, whatever the sample count.
+
+DEFAULT_ACCURACY = 0.01
+MIN_VALUE = 1e-3  # ms; smaller values (and 0) go to the zero bucket
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<BdQdddii")  # version, accuracy, zero count, min, max, sum, first key, bucket count
+
+
+class LatencySketch:
+    """DDSketch of latencies in ms: add values, merge sketches, read quantiles."""
+
+    def __init__(self, accuracy=DEFAULT_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value, weight=1):
+        """Count one latency (ms). Cheap enough for a per-request listener: one log and a dict update."""
+        if value > MIN_VALUE:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + weight
+        else:
+            self.zero_count += weight
+        self.count += weight
+        self.sum += value * weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def add_many(self, values):
+        """Count an array of latencies (ms) at numpy speed."""
+        import numpy as np
+        values = np.asarray(values, dtype=float)
+        if not values.size:
+            return
+        positive = values[values > MIN_VALUE]
+        keys, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype(np.int64), return_counts=True)
+        for key, n in zip(keys.tolist(), counts.tolist()):
+            self.bins[key] = self.bins.get(key, 0) + n
+        self.zero_count += int(values.size - positive.size)
+        self.count += int(values.size)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other):
+        """Add another sketch's counts into this one (same accuracy only); returns self."""
+        if other.accuracy != self.accuracy:
+            raise ValueError(f"Cannot merge sketches with accuracy {self.accuracy} and {other.accuracy}")
+        for key, n in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """
+        Latency (ms) at quantile q in [0, 1], within the sketch's relative accuracy.
+        q = 0 and q = 1 return the exact min and max; None when the sketch is empty.
+        """
+        if not self.count:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError(f"quantile must be in [0, 1], got {q}")
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def percentiles(self, percentiles=(50, 95, 99)):
+        """{"p50": ms, ...} for the given percentiles."""
+        return {f"p{p:g}": self.quantile(p / 100.0) for p in percentiles}
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    # ---------- Serialization ----------
+    def to_bytes(self):
+        """Compact binary form: a fixed header and the dense bucket counts from the lowest key, zlib-compressed."""
+        first = min(self.bins) if self.bins else 0
+        size = max(self.bins) - first + 1 if self.bins else 0
+        counts = [0] * size
+        for key, n in self.bins.items():
+            counts[key - first] = n
+        header = _HEADER.pack(FORMAT_VERSION, self.accuracy, self.zero_count,
+                              self.min if self.count else 0.0, self.max if self.count else 0.0,
+                              self.sum, first, size)
+        return zlib.compress(header + struct.pack(f"<{size}Q", *counts))
+
+    @classmethod
+    def from_bytes(cls, data):
+        raw = zlib.decompress(data)
+        version, accuracy, zero_count, low, high, total, first, size = _HEADER.unpack_from(raw)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported sketch format version {version}")
+        sketch = cls(accuracy)
+        counts = struct.unpack_from(f"<{size}Q", raw, _HEADER.size)
+        sketch.bins = {first + i: n for i, n in enumerate(counts) if n}
+        sketch.zero_count = zero_count
+        sketch.count = zero_count + sum(counts)
+        sketch.sum = total
+        if sketch.count:
+            sketch.min, sketch.max = low, high
+        return sketch
+
+
+def merge_all(sketches, accuracy=DEFAULT_ACCURACY):
+    """One sketch holding every sketch in the iterable (an empty one if there are none)."""
+    merged = LatencySketch(accuracy)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
+
+
+# ---------- Sketch files ----------
+# One JSON file per run: {"version": 1, "sketches": {"GET /items": "<base64>", ...}}
+def save_sketches(path, sketches):
+    """Write {label: LatencySketch} to a JSON file (atomic replace)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    payload = {"version": FORMAT_VERSION,
+               "sketches": {label: base64.b64encode(s.to_bytes()).decode("ascii") for label, s in sketches.items()}}
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def load_sketches(path):
+    """{label: LatencySketch} from a file written by save_sketches()."""
+    with open(path) as f:
+        payload = json.load(f)
+    return {label: LatencySketch.from_bytes(base64.b64decode(data)) for label, data in payload["sketches"].items()}
@@ -0,0 +1,155 @@
+import http.client
+import math
+import statistics
+import time
+from urllib.parse import urlsplit
+
+# ---------- Latency sampling ----------
+# Times N requests with perf_counter_ns, splitting connection setup (TCP + TLS)
+# from time to first byte, so percentile budgets can be asserted on a sample
+# instead of a single time.time() measurement.
+
+def sample_latency(url, samples=30, method="GET", body=None, headers=None,
+                   new_connection=False, warmup=0, timeout=10):
+    """
+    Send `samples` requests to a URL and time each one.
+    :param new_connection: open a fresh connection per request (measures connect every time);
+                           otherwise one keep-alive connection is reused
+    :param warmup: requests sent first and discarded
+    :return: list of dicts with connect_ms (0 when reused), server_ms (request sent to
+             response headers received), total_ms and status
+    """
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    conn = None
+    results = []
+    try:
+        for i in range(warmup + samples):
+            start = time.perf_counter_ns()
+            connect_ns = 0
+            if conn is None or new_connection:
+                if conn is not None:
+                    conn.close()
+                conn = connection_class(parts.hostname, parts.port, timeout=timeout)
+                conn.connect()
+                connect_ns = time.perf_counter_ns() - start
+            sent = time.perf_counter_ns()
+            try:
+                conn.request(method, target, body=body, headers=headers or {})
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server closed an idle keep-alive connection: reconnect and count it
+                conn.close()
+                start = time.perf_counter_ns()
+                conn.connect()
+                connect_ns = time.perf_counter_ns() - start
+                sent = time.perf_counter_ns()
+                conn.request(method, target, body=body, headers=headers or {})
+                response = conn.getresponse()
+            first_byte = time.perf_counter_ns()
+            response.read()
+            done = time.perf_counter_ns()
+            if response.will_close:
+                conn.close()
+                conn = None
+            if i >= warmup:
+                results.append({
+                    "connect_ms": connect_ns / 1e6,
+                    "server_ms": (first_byte - sent) / 1e6,
+                    "total_ms": (done - start) / 1e6,
+                    "status": response.status
+                })
+    finally:
+        if conn is not None:
+            conn.close()
+    return results
+
+
+# ---------- Percentiles ----------
+def percentile(sorted_values, q):
+    """Linearly interpolated percentile (same as numpy's default) of an already sorted list; q in [0, 100]."""
+    if not sorted_values:
+        raise ValueError("percentile of an empty sample")
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _binomial_cdf(n, p):
+    """P(B <= k) for k = 0..n, B ~ Binomial(n, p), computed in log space so large n does not overflow."""
+    if p <= 0 or p >= 1:
+        return [1.0] * (n + 1) if p <= 0 else [0.0] * n + [1.0]
+    log_p, log_q = math.log(p), math.log1p(-p)
+    cdf, total = [], 0.0
+    for k in range(n + 1):
+        total += math.exp(math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+                          + k * log_p + (n - k) * log_q)
+        cdf.append(min(total, 1.0))
+    return cdf
+
+
+def percentile_ci(sorted_values, q, confidence=0.95):
+    """
+    Distribution-free confidence interval for a percentile from order statistics.
+    The number of samples below the true q-th percentile is Binomial(n, q/100), so
+    [x_(l), x_(u)] covers it with probability P(l <= B < u).
+    :return: (low, high); either is None when the sample is too small to bound that side,
+             e.g. the upper bound of p99 needs several hundred samples
+    """
+    n = len(sorted_values)
+    alpha = (1 - confidence) / 2
+    cdf = _binomial_cdf(n, q / 100.0)
+    # Largest l with P(B <= l - 1) <= alpha; smallest u with P(B >= u) <= alpha (1-based ranks)
+    lower = max((l for l in range(1, n + 1) if cdf[l - 1] <= alpha), default=None)
+    upper = min((u for u in range(1, n + 1) if 1 - cdf[u - 1] <= alpha), default=None)
+    return (sorted_values[lower - 1] if lower else None,
+            sorted_values[upper - 1] if upper else None)
+
+
+def summarize(values, percentiles=(50, 90, 99), confidence=0.95):
+    """
+    Percentiles with confidence intervals for one latency series (ms).
+    :return: dict with count, mean, min, max and p50/p90/p99 -> {"value", "ci_low", "ci_high"}
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+    summary = {"count": len(ordered), "mean": statistics.fmean(ordered), "min": ordered[0], "max": ordered[-1]}
+    for q in percentiles:
+        low, high = percentile_ci(ordered, q, confidence)
+        summary[f"p{q:g}"] = {"value": percentile(ordered, q), "ci_low": low, "ci_high": high}
+    return summary
+
+
+def summarize_samples(samples, percentiles=(50, 90, 99), confidence=0.95):
+    """Summaries of total, server and connect time for sample_latency() output."""
+    return {
+        "total_ms": summarize([s["total_ms"] for s in samples], percentiles, confidence),
+        "server_ms": summarize([s["server_ms"] for s in samples], percentiles, confidence),
+        # Only requests that opened a connection say anything about connect time
+        "connect_ms": summarize([s["connect_ms"] for s in samples if s["connect_ms"]], percentiles, confidence),
+        "confidence": confidence
+    }
+
+
+def check_budgets(summary, budgets):
+    """
+    Compare percentiles against budgets in ms, e.g. {"p50": 800, "p99": 2000}.
+    A budget is "exceeded" only when the whole confidence interval lies above it, and
+    "inconclusive" when the estimate is over budget but the interval still includes it.
+    :return: list of dicts with percentile, budget, value, ci_low and verdict ("ok", "inconclusive", "exceeded")
+    """
+    verdicts = []
+    for name, budget in budgets.items():
+        stats = summary[name]
+        if stats["ci_low"] is not None and stats["ci_low"] > budget:
+            verdict = "exceeded"
+        elif stats["value"] > budget:
+            verdict = "inconclusive"
+        else:
+            verdict = "ok"
+        verdicts.append({"percentile": name, "budget": budget, "value": stats["value"],
+                         "ci_low": stats["ci_low"], "verdict": verdict})
+    return verdicts
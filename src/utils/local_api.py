@@ -0,0 +1,233 @@
+import argparse
+import base64
+import importlib
+import json
+import logging
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# ---------- Local API Gateway + Lambda emulator ----------
+# Serves a Lambda handler over HTTP on localhost: each request is turned into an
+# API Gateway REST (v1) or HTTP API (v2) proxy event, the handler is called in-process
+# and its proxy response is written back. DynamoDB and CloudWatch are replaced by the
+# stand-ins in local_aws, so pytest, Robot and Locust can run offline. Like a
+# Lambda execution environment, a process runs one invocation at a time (the
+# handler's module state is not thread-safe); --workers adds processes:
+#
+#   python src/utils/local_api.py --port 3000 --workers 4
+#   API_BASE_URL=http://127.0.0.1:3000/dev pytest src/tests/pytest
+
+DEFAULT_HANDLER = "lambda_crud.lambda_crud_function:lambda_handler"
+
+logger = logging.getLogger("local_api")
+
+
+class LambdaContext:
+    """The subset of the Lambda context object handlers usually touch."""
+
+    def __init__(self, function_name, timeout_s=30, memory_mb=128):
+        self.function_name = function_name
+        self.function_version = "$LATEST"
+        self.memory_limit_in_mb = memory_mb
+        self.aws_request_id = str(uuid.uuid4())
+        self.log_group_name = f"/aws/lambda/{function_name}"
+        self._deadline = time.monotonic() + timeout_s
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def build_event(method, raw_path, headers, body, event_format="v1", stage="dev"):
+    """Build an API Gateway proxy event for one HTTP request."""
+    url = urlsplit(raw_path)
+    query = parse_qs(url.query, keep_blank_values=True)
+    text = body.decode("utf-8") if body else None
+    request_id = str(uuid.uuid4())
+
+    if event_format == "v2":
+        return {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": url.path,
+            "rawQueryString": url.query,
+            "headers": {k.lower(): v for k, v in headers.items()},
+            "queryStringParameters": {k: ",".join(v) for k, v in query.items()} or None,
+            "requestContext": {
+                "http": {"method": method, "path": url.path, "protocol": "HTTP/1.1",
+                         "sourceIp": "127.0.0.1", "userAgent": headers.get("User-Agent", "")},
+                "requestId": request_id,
+                "stage": "$default",
+                "timeEpoch": int(time.time() * 1000)
+            },
+            "body": text,
+            "isBase64Encoded": False
+        }
+
+    return {
+        "resource": "/{proxy+}",
+        "path": url.path,
+        "httpMethod": method,
+        "headers": dict(headers),
+        "multiValueHeaders": {k: headers.get_all(k) for k in headers.keys()} if hasattr(headers, "get_all") else {},
+        "queryStringParameters": {k: v[-1] for k, v in query.items()} or None,
+        "multiValueQueryStringParameters": query or None,
+        "requestContext": {"httpMethod": method, "path": url.path, "stage": stage, "requestId": request_id},
+        "body": text,
+        "isBase64Encoded": False
+    }
+
+
+def parse_response(result):
+    """Return (status, headers, body bytes) from a Lambda proxy response."""
+    if not isinstance(result, dict) or "statusCode" not in result:
+        # HTTP API v2 accepts a bare value and wraps it as JSON
+        return 200, {"Content-Type": "application/json"}, json.dumps(result).encode()
+    body = result.get("body") or ""
+    body = base64.b64decode(body) if result.get("isBase64Encoded") else body.encode()
+    return int(result["statusCode"]), dict(result.get("headers") or {}), body
+
+
+def load_handler(spec):
+    module_name, _, function_name = spec.partition(":")
+    module = importlib.import_module(module_name)
+    return module, getattr(module, function_name or "lambda_handler")
+
+
+def use_local_aws(module, db_path=None, latency_ms=0):
+    """Swap the handler's AWS clients for the in-memory / SQLite stand-ins."""
+    from src.utils.local_aws import LocalCloudWatch, LocalDynamoDB
+    if hasattr(module, "clients"):
+        module.clients["dynamodb"] = LocalDynamoDB(latency_ms=latency_ms, path=db_path)
+        module.clients["cloudwatch"] = LocalCloudWatch(latency_ms=latency_ms)
+    if hasattr(module, "MetricsBuffer"):
+        # Buffer metrics into the local CloudWatch stand-in instead of printing EMF per request
+        module.metrics = module.MetricsBuffer(mode="api")
+
+
+def make_request_handler(handler, function_name, event_format, stage):
+    # Connections are served by threads, but invocations take turns, as in one Lambda environment
+    invoke_lock = threading.Lock()
+
+    class LambdaProxyHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so load tests reuse connections
+        # Headers and body go out in separate writes; without TCP_NODELAY the body waits
+        # for the client's delayed ACK (~40 ms) on every reused connection
+        disable_nagle_algorithm = True
+
+        def handle_one(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            event = build_event(self.command, self.path, self.headers, body, event_format, stage)
+            try:
+                with invoke_lock:
+                    result = handler(event, LambdaContext(function_name))
+                status, headers, payload = parse_response(result)
+            except Exception as e:
+                logger.exception("Handler raised")
+                status, headers = 502, {"Content-Type": "application/json"}
+                payload = json.dumps({"message": "Internal server error", "error": str(e)}).encode()
+
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_OPTIONS = handle_one
+
+        def log_message(self, fmt, *args):
+            logger.debug("%s - %s", self.address_string(), fmt % args)
+
+    return LambdaProxyHandler
+
+
+def serve(host="127.0.0.1", port=3000, workers=1, handler_spec=DEFAULT_HANDLER, event_format="v1",
+          db_path=None, latency_ms=0, log_level=logging.WARNING):
+    """Serve the handler until interrupted; workers > 1 forks processes sharing one socket."""
+    if workers > 1 and not hasattr(os, "fork"):
+        logger.warning("Multiple workers need os.fork; falling back to one process")
+        workers = 1
+    cleanup_db = False
+    if workers > 1 and db_path is None:
+        # Workers are separate processes, so they need a shared store for consistent CRUD
+        fd, db_path = tempfile.mkstemp(prefix="qa_local_api_", suffix=".sqlite3")
+        os.close(fd)
+        cleanup_db = True
+
+    module, handler = load_handler(handler_spec)
+    logging.getLogger().setLevel(log_level)  # handlers set the root level to INFO on import
+    stage = getattr(module, "STAGE", os.getenv("STAGE", "dev"))
+    function_name = module.__name__.rsplit(".", 1)[-1]
+    server = ThreadingHTTPServer((host, port), make_request_handler(handler, function_name, event_format, stage))
+    server.daemon_threads = True
+    print(f"Local API listening on http://{host}:{server.server_port}/{stage} "
+          f"({workers} worker(s), {event_format} events)")
+    print(f"  export API_BASE_URL=http://{host}:{server.server_port}/{stage}")
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    # SIGTERM stops the forked workers too (background jobs ignore SIGINT)
+    signal.signal(signal.SIGTERM, stop)
+    children = []
+    try:
+        if workers == 1:
+            use_local_aws(module, db_path, latency_ms)
+            server.serve_forever()
+            return
+        # Non-blocking accept, so workers that lose the race for a connection go back to select()
+        server.socket.setblocking(False)
+        for _ in range(workers):
+            pid = os.fork()
+            if pid == 0:
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                use_local_aws(module, db_path, latency_ms)
+                server.serve_forever()
+                os._exit(0)
+            children.append(pid)
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        server.server_close()
+        if cleanup_db:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+
+
+if __name__ == "__main__":
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+    parser = argparse.ArgumentParser(description="Run a Lambda handler behind a local API Gateway emulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (fork-based)")
+    parser.add_argument("--handler", default=DEFAULT_HANDLER, help="module:function")
+    parser.add_argument("--event-format", choices=["v1", "v2"], default="v1",
+                        help="API Gateway REST (v1) or HTTP API (v2) proxy events")
+    parser.add_argument("--db", default=None, help="SQLite file for the DynamoDB stand-in (default: in memory)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Simulated AWS round-trip per call")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    log_level = logging.DEBUG if args.verbose else logging.WARNING
+    logging.basicConfig(level=log_level)
+    serve(args.host, args.port, args.workers, args.handler, args.event_format, args.db, args.latency_ms, log_level)
@@ -0,0 +1,243 @@
+import bisect
+import copy
+import functools
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+
+# ---------- Local AWS stand-ins ----------
+# In-memory replacements for the boto3 clients used by the Lambda handlers, so
+# benchmarks and tests can run offline. latency_ms simulates the network round-trip.
+
+class LocalCloudWatch:
+    """Stand-in for boto3.client("cloudwatch") that counts calls and sums each metric."""
+
+    def __init__(self, latency_ms=0):
+        self.latency_ms = latency_ms
+        self.calls = 0
+        self.totals = {}  # (Namespace, MetricName) -> summed Value
+
+    def put_metric_data(self, Namespace, MetricData):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        self.calls += 1
+        for datum in MetricData:
+            key = (Namespace, datum["MetricName"])
+            self.totals[key] = self.totals.get(key, 0) + datum.get("Value", 1)
+        return {}
+
+
+class LocalTable:
+    """In-memory table keyed on "id"; items are stored as plain Python values."""
+
+    def __init__(self):
+        self.items = {}
+        self._scan_order = {}  # TotalSegments -> per-segment sorted ids, rebuilt after writes
+
+    def _get(self, item_id):
+        return self.items.get(item_id)
+
+    def _put(self, item):
+        if item["id"] not in self.items:
+            self._scan_order.clear()
+        self.items[item["id"]] = copy.deepcopy(item)
+
+    def _delete(self, item_id):
+        if self.items.pop(item_id, None) is not None:
+            self._scan_order.clear()
+
+    def _scan(self, limit=None, start_after=None, segment=0, total_segments=1):
+        """Page through items in a stable order; ids are hashed into segments like a parallel scan."""
+        if total_segments not in self._scan_order:
+            segments = [[] for _ in range(total_segments)]
+            for item_id in self.items:
+                segments[segment_of(item_id, total_segments)].append(item_id)
+            self._scan_order[total_segments] = [sorted(ids) for ids in segments]
+        order = self._scan_order[total_segments][segment]
+
+        start = bisect.bisect_right(order, start_after) if start_after is not None else 0
+        end = len(order) if limit is None else min(start + limit, len(order))
+        last_id = order[end - 1] if end < len(order) else None
+        return [self.items[item_id] for item_id in order[start:end]], last_id
+
+
+def segment_of(item_id, total_segments):
+    return zlib.crc32(str(item_id).encode()) % total_segments
+
+
+class SqliteTable:
+    """Table stored in a SQLite file so several emulator worker processes share one dataset."""
+
+    def __init__(self, path, name):
+        self.path = path
+        self.sql_table = "items_" + "".join(c if c.isalnum() else "_" for c in name)
+        self.local = threading.local()
+
+    @property
+    def db(self):
+        # One connection per thread (and per process, since workers connect after forking)
+        if getattr(self.local, "db", None) is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.create_function("segment_of", 2, segment_of, deterministic=True)
+            db.execute(f"CREATE TABLE IF NOT EXISTS {self.sql_table} (id TEXT PRIMARY KEY, item TEXT NOT NULL)")
+            self.local.db = db
+        return self.local.db
+
+    @functools.cached_property
+    def types(self):
+        from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+        return TypeSerializer(), TypeDeserializer()
+
+    def _dumps(self, item):
+        # Stored in attribute-value form so numbers and sets keep their DynamoDB types
+        return json.dumps({k: self.types[0].serialize(v) for k, v in item.items()})
+
+    def _loads(self, raw):
+        return {k: self.types[1].deserialize(v) for k, v in json.loads(raw).items()}
+
+    def _get(self, item_id):
+        row = self.db.execute(f"SELECT item FROM {self.sql_table} WHERE id = ?", (str(item_id),)).fetchone()
+        return self._loads(row[0]) if row else None
+
+    def _put(self, item):
+        self.db.execute(f"INSERT OR REPLACE INTO {self.sql_table} (id, item) VALUES (?, ?)",
+                        (str(item["id"]), self._dumps(item)))
+
+    def _delete(self, item_id):
+        self.db.execute(f"DELETE FROM {self.sql_table} WHERE id = ?", (str(item_id),))
+
+    def _scan(self, limit=None, start_after=None, segment=0, total_segments=1):
+        query = f"SELECT id, item FROM {self.sql_table} WHERE id > ?"
+        params = [str(start_after) if start_after is not None else ""]
+        if total_segments > 1:
+            query += " AND segment_of(id, ?) = ?"
+            params += [total_segments, segment]
+        query += " ORDER BY id LIMIT ?"
+        params.append(-1 if limit is None else limit + 1)
+        rows = self.db.execute(query, params).fetchall()
+        more = limit is not None and len(rows) > limit
+        rows = rows[:limit] if more else rows
+        return [self._loads(item) for _, item in rows], rows[-1][0] if more else None
+
+
+class LocalDynamoDB:
+    """Stand-in for boto3.client("dynamodb") covering the calls the CRUD handler makes.
+
+    Requests and responses use DynamoDB's attribute-value format like the real client,
+    and the batch calls enforce the real per-call limits. throttle_calls makes the next
+    N batch calls leave all but the first request unprocessed, the way DynamoDB does
+    when a partition is throttled. With path set, tables live in that SQLite file.
+    """
+
+    MAX_WRITES = 25
+    MAX_KEYS = 100
+
+    def __init__(self, latency_ms=0, throttle_calls=0, path=None):
+        self.path = path
+        self.latency_ms = latency_ms
+        self.throttle_calls = throttle_calls
+        self.tables = {}
+        self.calls = 0
+        self.batch_calls = 0
+
+    def Table(self, name):
+        if name not in self.tables:
+            self.tables[name] = SqliteTable(self.path, name) if self.path else LocalTable()
+        return self.tables[name]
+
+    def _round_trip(self):
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+
+    def _batch_round_trip(self):
+        self._round_trip()
+        self.batch_calls += 1
+        if self.throttle_calls:
+            self.throttle_calls -= 1
+            return True
+        return False
+
+    @functools.cached_property
+    def deserializer(self):
+        # boto3 is imported on first use, like the handler does, so cold-start timings stay honest
+        from boto3.dynamodb.types import TypeDeserializer
+        return TypeDeserializer()
+
+    @functools.cached_property
+    def serializer(self):
+        from boto3.dynamodb.types import TypeSerializer
+        return TypeSerializer()
+
+    def _to_python(self, attributes):
+        return {k: self.deserializer.deserialize(v) for k, v in attributes.items()}
+
+    def _to_attributes(self, item):
+        return {k: self.serializer.serialize(v) for k, v in item.items()}
+
+    def put_item(self, TableName, Item):
+        self._round_trip()
+        self.Table(TableName)._put(self._to_python(Item))
+        return {}
+
+    def get_item(self, TableName, Key, ConsistentRead=False):
+        self._round_trip()
+        item = self.Table(TableName)._get(self._to_python(Key)["id"])
+        return {"Item": self._to_attributes(item)} if item is not None else {}
+
+    def delete_item(self, TableName, Key):
+        self._round_trip()
+        self.Table(TableName)._delete(self._to_python(Key)["id"])
+        return {}
+
+    def scan(self, TableName, Limit=None, ExclusiveStartKey=None, Segment=0, TotalSegments=1):
+        self._round_trip()
+        start_after = self._to_python(ExclusiveStartKey)["id"] if ExclusiveStartKey else None
+        items, last_id = self.Table(TableName)._scan(Limit, start_after, Segment, TotalSegments)
+        response = {"Items": [self._to_attributes(item) for item in items],
+                    "Count": len(items), "ScannedCount": len(items)}
+        if last_id is not None:
+            response["LastEvaluatedKey"] = self._to_attributes({"id": last_id})
+        return response
+
+    def batch_write_item(self, RequestItems):
+        throttled = self._batch_round_trip()
+        unprocessed = {}
+        for name, requests in RequestItems.items():
+            if len(requests) > self.MAX_WRITES:
+                raise ValueError(f"Too many items requested for the BatchWriteItem call: {len(requests)}")
+            ids = [self.deserializer.deserialize(
+                       r["PutRequest"]["Item"]["id"] if "PutRequest" in r else r["DeleteRequest"]["Key"]["id"])
+                   for r in requests]
+            if len(set(ids)) != len(ids):
+                raise ValueError("Provided list of item keys contains duplicates")
+            if throttled:
+                requests, unprocessed[name] = requests[:1], requests[1:]
+            table = self.Table(name)
+            for request in requests:
+                if "PutRequest" in request:
+                    table._put(self._to_python(request["PutRequest"]["Item"]))
+                else:
+                    table._delete(self._to_python(request["DeleteRequest"]["Key"])["id"])
+        return {"UnprocessedItems": {k: v for k, v in unprocessed.items() if v}}
+
+    def batch_get_item(self, RequestItems):
+        throttled = self._batch_round_trip()
+        responses, unprocessed = {}, {}
+        for name, request in RequestItems.items():
+            keys = request["Keys"]
+            if len(keys) > self.MAX_KEYS:
+                raise ValueError(f"Too many items requested for the BatchGetItem call: {len(keys)}")
+            if throttled:
+                keys, rest = keys[:1], keys[1:]
+                if rest:
+                    unprocessed[name] = {**request, "Keys": rest}
+            table = self.Table(name)
+            items = [table._get(self._to_python(key)["id"]) for key in keys]
+            responses[name] = [self._to_attributes(item) for item in items if item is not None]
+        return {"Responses": responses, "UnprocessedKeys": unprocessed}
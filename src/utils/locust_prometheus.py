@@ -0,0 +1,77 @@
+from bisect import bisect_left
+
+# ---------- Locust -> Prometheus exporter ----------
+# Exports Locust's own request statistics at scrape time instead of updating
+# prometheus_client metrics from a per-request listener. Locust already counts
+# every request and response time. Under --master/--worker, the workers send
+# theirs to the master in their periodic reports and the master merges them into
+# environment.runner.stats. So one exporter on the master covers every worker,
+# and the request hot path pays nothing for metrics.
+#
+# The latency histogram is built from StatsEntry.response_times, Locust's
+# {rounded ms: count} map (exact below 100 ms, then 2 significant digits), into
+# buckets sized for API latencies rather than prometheus_client's defaults.
+# Metric names and labels are unchanged, so existing Grafana queries keep working.
+
+DEFAULT_PORT = 9646
+# Seconds; dense from 25 ms to 2 s, where API Gateway + Lambda latencies fall
+API_LATENCY_BUCKETS = (0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.75,
+                       1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+
+
+def cumulative_buckets(response_times, bounds_ms):
+    """
+    Prometheus-style cumulative counts of a {response time ms: count} map.
+    :return: list with one count per bound (value <= bound), then the total for +Inf
+    """
+    counts = [0] * (len(bounds_ms) + 1)
+    for value, n in response_times.items():
+        counts[bisect_left(bounds_ms, value)] += n
+    total = 0
+    for i, n in enumerate(counts):
+        total += n
+        counts[i] = total
+    return counts
+
+
+class LocustStatsCollector:
+    """prometheus_client collector reading a Locust environment's stats when scraped."""
+
+    def __init__(self, environment, buckets=API_LATENCY_BUCKETS):
+        self.environment = environment
+        self.buckets = tuple(buckets)
+        self.bounds_ms = [b * 1000 for b in self.buckets]
+
+    def collect(self):
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+        runner = self.environment.runner
+        requests = CounterMetricFamily("locust_requests", "Total number of requests",
+                                       labels=["method", "endpoint", "status"])
+        latency = HistogramMetricFamily("locust_request_latency_seconds", "Request latency",
+                                        labels=["method", "endpoint"])
+        if runner is not None:
+            # A copy: the runner keeps adding entries while this scrape iterates
+            for (name, method), entry in list(runner.stats.entries.items()):
+                requests.add_metric([method, name, "ok"], entry.num_requests - entry.num_failures)
+                requests.add_metric([method, name, "fail"], entry.num_failures)
+                counts = cumulative_buckets(entry.response_times, self.bounds_ms)
+                labels = [f"{b:g}" for b in self.buckets] + ["+Inf"]
+                latency.add_metric([method, name], list(zip(labels, counts)), entry.total_response_time / 1000.0)
+        yield requests
+        yield latency
+        users = GaugeMetricFamily("locust_users", "Running simulated users")
+        users.add_metric([], runner.user_count if runner is not None else 0)
+        yield users
+        if hasattr(runner, "worker_count"):
+            workers = GaugeMetricFamily("locust_workers", "Connected workers")
+            workers.add_metric([], runner.worker_count)
+            yield workers
+
+
+def start_exporter(environment, port=DEFAULT_PORT, addr="0.0.0.0", buckets=API_LATENCY_BUCKETS):
+    """Serve the environment's stats on http://addr:port/metrics; returns the registry."""
+    from prometheus_client import CollectorRegistry, start_http_server
+    registry = CollectorRegistry()
+    registry.register(LocustStatsCollector(environment, buckets))
+    start_http_server(port, addr, registry=registry)
+    return registry
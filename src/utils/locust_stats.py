@@ -0,0 +1,120 @@
+import csv
+
+# ---------- Locust CSV ingestion ----------
+# results_stats.csv has one row per endpoint plus an "Aggregated" row with the
+# run's final counts and response-time percentiles. results_stats_history.csv
+# has one row per second (per endpoint too with --csv-full-history). Its
+# percentiles cover a recent window rather than the whole run, and the Total
+# columns are cumulative.
+#
+# Averages across endpoints are weighted by request count. An unweighted mean of
+# per-endpoint averages lets a rarely hit endpoint count as much as the busiest one.
+
+PERCENTILES = ["50%", "66%", "75%", "80%", "90%", "95%", "98%", "99%", "99.9%", "99.99%", "100%"]
+AGGREGATED = "Aggregated"
+
+
+def _number(value):
+    """float, or None for "", "N/A" and other non-numeric cells."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _endpoint(row):
+    return f"{row.get('Type') or ''} {row['Name']}".strip()
+
+
+def read_stats(path):
+    """
+    Per-endpoint rows of results_stats.csv (old "# requests" headers included).
+    :return: (list of endpoint dicts, Aggregated row dict or None); each dict has endpoint,
+             requests, failures, avg_ms, min_ms, max_ms, rps and p50/p95/p99
+    """
+    endpoints, aggregated = [], None
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            row = {key.strip(): value for key, value in row.items() if key}
+            requests = _number(row.get("Request Count", row.get("# requests")))
+            failures = _number(row.get("Failure Count", row.get("# failures")))
+            stats = {
+                "endpoint": _endpoint(row),
+                "requests": int(requests or 0),
+                "failures": int(failures or 0),
+                "avg_ms": _number(row.get("Average Response Time", row.get("Average response time"))),
+                "min_ms": _number(row.get("Min Response Time", row.get("Min response time"))),
+                "max_ms": _number(row.get("Max Response Time", row.get("Max response time"))),
+                "rps": _number(row.get("Requests/s")),
+                "p50": _number(row.get("50%")),
+                "p95": _number(row.get("95%")),
+                "p99": _number(row.get("99%")),
+            }
+            if row["Name"] == AGGREGATED:
+                aggregated = stats
+            else:
+                endpoints.append(stats)
+    return endpoints, aggregated
+
+
+def summarize_stats(endpoints, aggregated=None):
+    """
+    Run summary: request-weighted average response time, and the Aggregated row's
+    p50/p95/p99 (percentiles cannot be combined from per-endpoint percentiles).
+    """
+    requests = sum(e["requests"] for e in endpoints)
+    weighted = [(e["avg_ms"], e["requests"]) for e in endpoints if e["avg_ms"] is not None]
+    total_weight = sum(n for _, n in weighted)
+    summary = {
+        "requests": requests,
+        "failures": sum(e["failures"] for e in endpoints),
+        "avg_response_time": round(sum(avg * n for avg, n in weighted) / total_weight, 2) if total_weight else None,
+        "max_response_time": max((e["max_ms"] for e in endpoints if e["max_ms"] is not None), default=None),
+    }
+    if aggregated:
+        summary.update(p50=aggregated["p50"], p95=aggregated["p95"], p99=aggregated["p99"], rps=aggregated["rps"])
+    return summary
+
+
+def iter_stats_history(path):
+    """
+    Stream results_stats_history.csv one row at a time.
+    :return: generator of dicts with timestamp, users, endpoint, rps, failures_per_s,
+             p50/p95/p99 (None before the first response), total_requests, total_failures
+    """
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            yield {
+                "timestamp": int(_number(row["Timestamp"]) or 0),
+                "users": int(_number(row.get("User Count")) or 0),
+                "endpoint": _endpoint(row),
+                "rps": _number(row.get("Requests/s")) or 0.0,
+                "failures_per_s": _number(row.get("Failures/s")) or 0.0,
+                "p50": _number(row.get("50%")),
+                "p95": _number(row.get("95%")),
+                "p99": _number(row.get("99%")),
+                "total_requests": int(_number(row.get("Total Request Count")) or 0),
+                "total_failures": int(_number(row.get("Total Failure Count")) or 0),
+            }
+
+
+def summarize_history(path, endpoint=AGGREGATED):
+    """
+    Throughput over time for one series of the stats history (the Aggregated row by default).
+    :return: (summary with duration_s, peak_users, peak_rps, mean_rps, peak_p95 and peak_p99,
+              list of the series' rows from iter_stats_history)
+    """
+    series = [row for row in iter_stats_history(path) if row["endpoint"] == endpoint]
+    if not series:
+        return {}, []
+    active = [row for row in series if row["total_requests"]]
+    duration = series[-1]["timestamp"] - active[0]["timestamp"] if active else 0
+    summary = {
+        "duration_s": duration,
+        "peak_users": max(row["users"] for row in series),
+        "peak_rps": max(row["rps"] for row in series),
+        "mean_rps": round(series[-1]["total_requests"] / duration, 3) if duration else None,
+        "peak_p95": max((row["p95"] for row in series if row["p95"] is not None), default=None),
+        "peak_p99": max((row["p99"] for row in series if row["p99"] is not None), default=None),
+    }
+    return summary, series
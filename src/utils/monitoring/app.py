@@ -1,28 +1,38 @@
+import os
+import sys
+
 from flask import Flask
 from prometheus_flask_exporter import PrometheusMetrics
-from prometheus_client import Counter, Gauge
-import psutil
-import threading, time
+from prometheus_client import Counter
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from src.utils.monitoring.process_metrics import instrument_app, multiprocess_dir  # noqa: E402
 
 app = Flask(__name__)
 
-# Enable default Flask metrics (HTTP request counts, latency histograms, etc.)
-metrics = PrometheusMetrics(app)
+# Request latency histogram buckets in seconds; METRICS_BUCKETS="0.001,0.01,0.1" overrides them
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+LATENCY_BUCKETS = tuple(sorted(float(b) for b in os.environ["METRICS_BUCKETS"].split(","))) \
+    if os.environ.get("METRICS_BUCKETS") else DEFAULT_LATENCY_BUCKETS
+
+# Enable default Flask metrics (HTTP request counts, latency histograms, etc.), per route template.
+# With PROMETHEUS_MULTIPROC_DIR set (multi-worker servers, see serve.py), workers write them to that
+# directory and the /metrics endpoint added by instrument_app merges every worker's values.
+if multiprocess_dir():
+    from prometheus_flask_exporter.multiprocess import GunicornPrometheusMetrics
+    metrics = GunicornPrometheusMetrics(app, group_by="url_rule", buckets=LATENCY_BUCKETS)
+else:
+    metrics = PrometheusMetrics(app, group_by="url_rule", buckets=LATENCY_BUCKETS)
 
 # Custom counter
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP Requests')
 
-# Custom Gauges for CPU & Memory (work cross-platform)
-CPU_USAGE = Gauge("app_cpu_percent", "Application CPU usage percent")
-MEM_USAGE = Gauge("app_memory_bytes", "Application memory usage in bytes")
-
-def track_usage():
-    process = psutil.Process()
-    process.cpu_percent(interval=None)  # prime the counter
-    while True:
-        CPU_USAGE.set(process.cpu_percent(interval=1))   # stable readings
-        MEM_USAGE.set(process.memory_info().rss)
-        time.sleep(1)
+# Per-worker CPU, memory, FDs, threads, GC pauses and request queue depth, sampled at scrape time.
+# Set up at import, so it also runs when a WSGI server imports the app.
+instrument_app(app, metrics)
 
 
 @app.route("/")
@@ -31,6 +41,6 @@ def index():
     return "Hello, QA Framework Monitoring!"
 
 if __name__ == "__main__":
-    print("🚀 Flask app starting with psutil-based CPU & memory metrics")
-    threading.Thread(target=track_usage, daemon=True).start()
+    # Flask's single-process development server; serve.py runs the app under gunicorn
+    print("🚀 Flask app starting with scrape-time process metrics")
     app.run(host="0.0.0.0", port=5050)
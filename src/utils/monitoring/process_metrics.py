@@ -0,0 +1,200 @@
+import gc
+import os
+import time
+
+import psutil
+
+# ---------- Process metrics for the monitoring app ----------
+# Samples when Prometheus scrapes, with no background thread. Idle cost is zero
+# and each scrape costs a few /proc reads per worker.
+#
+# Under a multi-worker server (gunicorn with PROMETHEUS_MULTIPROC_DIR set), a
+# scrape is served by one worker. That worker reads CPU, RSS, FDs and threads for
+# every worker (its parent's children) through psutil, so /metrics covers all of
+# them, labelled by pid. Two values only exist inside each worker: GC pauses
+# (gc.callbacks) and requests in progress. Those are prometheus_client metrics,
+# which in multiprocess mode are written to the shared directory and merged by
+# MultiProcessCollector.
+#
+# Request queue depth is the accept queue of the listening socket, read from
+# /proc/net/tcp (Linux). It holds connections no worker has picked up yet.
+
+MULTIPROC_ENV = ("PROMETHEUS_MULTIPROC_DIR", "prometheus_multiproc_dir")
+# Seconds; gen-0 collections take tens of microseconds, full ones can take 100+ ms
+GC_PAUSE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+TCP_LISTEN = "0A"
+
+
+def multiprocess_dir():
+    """The prometheus_client multiprocess directory, or None in single-process mode."""
+    for name in MULTIPROC_ENV:
+        if os.environ.get(name):
+            return os.environ[name]
+    return None
+
+
+def worker_processes():
+    """
+    The processes serving the app: under a multi-worker server, the children of this process's parent
+    running the same command line (the master's workers); otherwise just this process.
+    """
+    me = psutil.Process()
+    if multiprocess_dir():
+        try:
+            cmdline = me.cmdline()
+            workers = [p for p in me.parent().children() if p.pid == me.pid or p.cmdline() == cmdline]
+            if workers:
+                return workers
+        except (psutil.Error, AttributeError):
+            pass
+    return [me]
+
+
+def listen_queue_depths():
+    """
+    Accept-queue depth of the listening TCP sockets this process holds (Linux only).
+    :return: {port: connections waiting}; {} where /proc is unavailable
+    """
+    inodes = set()
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return {}
+    for fd in fds:
+        try:
+            target = os.readlink(f"/proc/self/fd/{fd}")
+        except OSError:
+            continue  # closed since the listing
+        if target.startswith("socket:["):
+            inodes.add(target[8:-1])
+    depths = {}
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table) as f:
+                next(f)
+                for line in f:
+                    # sl local_address rem_address st tx_queue:rx_queue tr:when retrnsmt uid timeout inode
+                    fields = line.split()
+                    if fields[3] == TCP_LISTEN and fields[9] in inodes:
+                        # For a listening socket, rx_queue is the accept queue length
+                        depths[int(fields[1].rsplit(":", 1)[1], 16)] = int(fields[4].split(":")[1], 16)
+        except OSError:
+            continue
+    return depths
+
+
+class ProcessMetricsCollector:
+    """prometheus_client collector sampling every worker process when scraped."""
+
+    def __init__(self):
+        # Kept across scrapes so cpu_percent() measures since the previous scrape
+        self.processes = {}
+
+    def collect(self):
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+        cpu_seconds = CounterMetricFamily("app_process_cpu_seconds", "Worker CPU time", labels=["pid", "mode"])
+        cpu_percent = GaugeMetricFamily("app_cpu_percent", "Worker CPU usage percent since the previous scrape",
+                                        labels=["pid"])
+        memory = GaugeMetricFamily("app_memory_bytes", "Worker resident memory in bytes", labels=["pid"])
+        fds = GaugeMetricFamily("app_open_fds", "Worker open file descriptors (handles on Windows)", labels=["pid"])
+        threads = GaugeMetricFamily("app_threads", "Worker threads", labels=["pid"])
+
+        previous, self.processes = self.processes, {}
+        for proc in worker_processes():
+            proc = previous.get(proc.pid, proc)
+            try:
+                with proc.oneshot():
+                    times = proc.cpu_times()
+                    percent = proc.cpu_percent(interval=None)
+                    rss = proc.memory_info().rss
+                    handles = proc.num_fds() if hasattr(proc, "num_fds") else proc.num_handles()
+                    thread_count = proc.num_threads()
+            except psutil.Error:
+                continue  # exited since the listing
+            self.processes[proc.pid] = proc
+            pid = str(proc.pid)
+            cpu_seconds.add_metric([pid, "user"], times.user)
+            cpu_seconds.add_metric([pid, "system"], times.system)
+            if proc.pid in previous:  # the first cpu_percent() call has nothing to compare against
+                cpu_percent.add_metric([pid], percent)
+            memory.add_metric([pid], rss)
+            fds.add_metric([pid], handles)
+            threads.add_metric([pid], thread_count)
+        yield from (cpu_seconds, cpu_percent, memory, fds, threads)
+
+        waiting = GaugeMetricFamily("app_listen_queue_depth", "Connections waiting to be accepted by a worker",
+                                    labels=["port"])
+        for port, queued in sorted(listen_queue_depths().items()):
+            waiting.add_metric([str(port)], queued)
+        yield waiting
+
+
+class GCPauseTimer:
+    """gc.callbacks hook timing each collection into a histogram labelled by generation and pid."""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.started = 0.0
+        self.children = {}
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self.started = time.perf_counter()
+            return
+        pause = time.perf_counter() - self.started
+        # Keyed by pid too: a forked worker inherits the hook but must report under its own pid
+        key = (info["generation"], os.getpid())
+        child = self.children.get(key)
+        if child is None:
+            child = self.children[key] = self.histogram.labels(str(key[0]), str(key[1]))
+        child.observe(pause)
+
+
+def instrument_app(app, metrics, path="/metrics", gc_buckets=GC_PAUSE_BUCKETS):
+    """
+    Add per-worker process metrics to a Flask app.
+    :param app: the Flask app
+    :param metrics: its prometheus_flask_exporter PrometheusMetrics; in multiprocess mode, a
+        GunicornPrometheusMetrics, and the merged /metrics endpoint is registered here
+    :param path: the metrics endpoint in multiprocess mode
+    :param gc_buckets: histogram buckets for GC pauses, in seconds
+    :return: the ProcessMetricsCollector
+    """
+    from flask import g
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Gauge, Histogram, generate_latest
+    from prometheus_client.multiprocess import MultiProcessCollector
+    multiprocess = multiprocess_dir() is not None
+    # In multiprocess mode these live in the shared directory and MultiProcessCollector exports them
+    metric_registry = None if multiprocess else metrics.registry
+    in_progress = Gauge("app_requests_in_progress", "Requests being handled by the worker",
+                        multiprocess_mode="liveall", registry=metric_registry)
+    gc_pauses = Histogram("app_gc_pause_seconds", "Garbage collection pauses", ["generation", "pid"],
+                          buckets=gc_buckets, registry=metric_registry)
+    gc.callbacks.append(GCPauseTimer(gc_pauses))
+
+    @app.before_request
+    def _start_request():
+        in_progress.inc()
+        g.in_progress_counted = True
+
+    @app.teardown_request
+    def _finish_request(exc):
+        # teardown also runs for requests that never reached before_request (e.g. a failed earlier hook)
+        if g.pop("in_progress_counted", False):
+            in_progress.dec()
+
+    collector = ProcessMetricsCollector()
+    if not multiprocess:
+        metrics.registry.register(collector)
+        return collector
+
+    # prometheus_flask_exporter's own multiprocess endpoint builds a bare registry per scrape
+    @app.route(path, endpoint="prometheus_metrics")
+    @metrics.do_not_track()
+    def prometheus_metrics():
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        registry.register(collector)
+        return generate_latest(registry), 200, {"Content-Type": CONTENT_TYPE_LATEST}
+
+    return collector
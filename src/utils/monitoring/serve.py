@@ -0,0 +1,114 @@
+import argparse
+import glob
+import os
+import sys
+import tempfile
+
+# ---------- Production serving mode for the monitoring app ----------
+# Runs src/utils/monitoring/app.py under gunicorn, with pre-forked workers and
+# optional threads per worker, in place of Flask's single-process development
+# server, so that load tests measure the app and not the dev server.
+#
+# Metrics stay correct across workers through prometheus_client's multiprocess
+# mode. Before the workers fork, PROMETHEUS_MULTIPROC_DIR is created and emptied
+# (leftover files would be merged into this run). Each worker imports the app and
+# writes its values there, and /metrics merges them. A worker that exits is marked
+# dead, so its live gauges disappear. Per-route latency histogram buckets are
+# passed to the workers through METRICS_BUCKETS.
+#
+# gunicorn is Unix-only; on Windows use the development server (python app.py).
+#
+#   python src/utils/monitoring/serve.py --workers 4 --port 5050
+#   python src/utils/monitoring/serve.py --workers 2 --threads 4 --buckets 0.001,0.005,0.025,0.1,0.5
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+DEFAULT_PORT = 5050
+
+
+def default_workers():
+    """gunicorn's recommended worker count: 2 per CPU, plus one."""
+    return (os.cpu_count() or 1) * 2 + 1
+
+
+def prepare_multiprocess_dir(path=None):
+    """
+    Create (or empty) the prometheus_client multiprocess directory and export it to the workers.
+    :param path: the directory; default PROMETHEUS_MULTIPROC_DIR, else a new temporary directory
+    :return: the directory
+    """
+    path = path or os.environ.get("PROMETHEUS_MULTIPROC_DIR") or tempfile.mkdtemp(prefix="prometheus_multiproc_")
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    return path
+
+
+def child_exit(server, worker):
+    """gunicorn hook: drop the exited worker's live gauges (e.g. app_requests_in_progress)."""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def gunicorn_options(host="0.0.0.0", port=DEFAULT_PORT, workers=None, threads=1, backlog=2048, timeout=30,
+                     access_log=False):
+    """gunicorn settings; threads > 1 selects the gthread worker, otherwise one request at a time per worker."""
+    return {
+        "bind": f"{host}:{port}",
+        "workers": workers or default_workers(),
+        "threads": threads,
+        "worker_class": "gthread" if threads > 1 else "sync",
+        "backlog": backlog,
+        "timeout": timeout,
+        "accesslog": "-" if access_log else None,
+        "child_exit": child_exit,
+    }
+
+
+def serve(buckets=None, metrics_dir=None, **options):
+    """
+    Serve the monitoring app under gunicorn until interrupted.
+    :param buckets: request latency histogram buckets in seconds (default: the app's DEFAULT_LATENCY_BUCKETS)
+    :param metrics_dir: the prometheus_client multiprocess directory (see prepare_multiprocess_dir)
+    :param options: gunicorn_options() arguments
+    """
+    from gunicorn.app.base import BaseApplication
+
+    if buckets:
+        os.environ["METRICS_BUCKETS"] = ",".join(f"{b:g}" for b in buckets)
+    path = prepare_multiprocess_dir(metrics_dir)
+    settings = gunicorn_options(**options)
+
+    class MonitoringApplication(BaseApplication):
+        def load_config(self):
+            for key, value in settings.items():
+                if value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            # Imported in each worker after the fork, with the multiprocess environment in place
+            if REPO_ROOT not in sys.path:
+                sys.path.insert(0, REPO_ROOT)
+            from src.utils.monitoring.app import app
+            return app
+
+    print(f"🚀 Monitoring app on http://{settings['bind']} ({settings['workers']} worker(s) x "
+          f"{settings['threads']} thread(s), metrics in {path})")
+    MonitoringApplication().run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the monitoring app under gunicorn")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--threads", type=int, default=1, help="Threads per worker (gthread worker when > 1)")
+    parser.add_argument("--backlog", type=int, default=2048, help="Listen backlog")
+    parser.add_argument("--timeout", type=int, default=30, help="Seconds before a silent worker is restarted")
+    parser.add_argument("--buckets", type=lambda s: [float(b) for b in s.split(",")],
+                        help="Request latency histogram buckets in seconds, comma-separated")
+    parser.add_argument("--metrics-dir", help="prometheus_client multiprocess directory (emptied at start)")
+    parser.add_argument("--access-log", action="store_true")
+    args = parser.parse_args()
+    serve(args.buckets, args.metrics_dir, host=args.host, port=args.port, workers=args.workers,
+          threads=args.threads, backlog=args.backlog, timeout=args.timeout, access_log=args.access_log)
@@ -0,0 +1,269 @@
+import argparse
+import json
+import os
+import sys
+import warnings
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+# ---------- Performance regression gate ----------
+# Compares the newest value of every gated series in the dashboard history
+# (suite, label, metric; e.g. locust_endpoint / "GET /items" / p99) against a
+# baseline of the runs before it. Two checks per series, vectorized over all
+# series at once:
+# - spike: robust z-score of the current run against the baseline median and
+#   MAD (scaled to a normal sigma), so one noisy baseline run does not move it;
+# - shift: one-sided Mann-Whitney U test of the last few runs against the
+#   baseline (exact null distribution), a rank test for a sustained step change.
+# Either one counts only if the relative change is also above --min-change, so a
+# statistically clear but negligible slowdown does not fail the build.
+#
+# The gate flags the runs it judged in the history store: a regressed run stays
+# out of later baselines (it is still judged while it is the newest run), so the
+# baseline is not dragged up by the builds it failed. An intended slowdown is
+# accepted with --accept: the current runs are flagged "accepted" and become the
+# start of their series' baseline; older runs no longer count, and those series
+# are "insufficient" until --min-baseline new runs have been recorded.
+#
+#   PYTHONPATH=. python src/utils/perf_regression.py --output reports/regression.json
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_OUTPUT = "reports/regression.json"
+MAD_TO_SIGMA = 1.4826
+
+# suite -> metrics where higher is worse (latencies in ms)
+GATED_METRICS = {
+    "locust": ["avg_response_time", "p95", "p99"],
+    "locust_endpoint": ["avg_response_time", "p95", "p99"],
+    "latency": ["p50", "p90", "p99"],
+    "cold_start": ["init_p50", "cold_client_p50", "warm_client_p50", "cold_duration_p50", "warm_duration_p50"],
+}
+SERIES_KEY = ["suite", "label", "metric"]
+
+
+def load_history(history, metrics=GATED_METRICS, days=None, now=None):
+    """
+    Long-form DataFrame (suite, label, metric, timestamp, run_id, value, flag) of the gated metrics,
+    oldest first; flag is the run's HistoryStore.flag_runs() flag or None.
+    """
+    import pandas as pd
+    frames = []
+    for suite, names in metrics.items():
+        rows = history.query(suite, names, days=days, now=now)
+        if rows:
+            frame = pd.DataFrame.from_records(rows, columns=["timestamp", "run_id", "label", "metric", "value"])
+            frame.insert(0, "suite", suite)
+            flags = history.flags(suite)
+            frame["flag"] = [flags.get(run) for run in zip(frame["run_id"], frame["label"])]
+            frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=SERIES_KEY + ["timestamp", "run_id", "value", "flag"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def baseline_runs_only(frame):
+    """
+    Drop the runs that must not count towards a baseline: runs flagged "regression" (except the
+    newest run of a series, which is the one being judged) and runs older than the series' last
+    "accepted" run.
+    """
+    frame = frame.assign(epoch=(frame["flag"] == "accepted").astype(int))
+    groups = frame.groupby(SERIES_KEY, sort=False)
+    newest = groups.cumcount(ascending=False) == 0
+    # accepted runs up to and including each row; the last epoch starts at the last accepted run
+    keep = groups["epoch"].cumsum() == groups["epoch"].transform("sum")
+    keep &= (frame["flag"] != "regression") | newest
+    return frame[keep].drop(columns="epoch").reset_index(drop=True)
+
+
+def window_matrix(frame, runs):
+    """
+    The last `runs` values of every series as one matrix, newest first.
+    :return: (DataFrame of series keys plus current run_id/timestamp, float array (series, runs) NaN-padded)
+    """
+    groups = frame.groupby(SERIES_KEY, sort=True)
+    series = groups.ngroup().to_numpy()
+    age = groups.cumcount(ascending=False).to_numpy()
+    keep = age < runs
+    matrix = np.full((groups.ngroups, runs), np.nan)
+    matrix[series[keep], age[keep]] = frame["value"].to_numpy(dtype=float)[keep]
+    newest = age == 0
+    current = frame.loc[newest, SERIES_KEY + ["run_id", "timestamp"]].iloc[np.argsort(series[newest])]
+    return current.reset_index(drop=True), matrix
+
+
+@lru_cache(maxsize=None)
+def _u_distribution(k, n):
+    """Number of orderings giving each Mann-Whitney U = 0..k*n for samples of size k and n (no ties)."""
+    if k == 0 or n == 0:
+        return np.ones(1)
+    counts = np.zeros(k * n + 1)
+    smaller = _u_distribution(k - 1, n)   # largest value is in the k sample: it beats all n
+    counts[n:n + len(smaller)] += smaller
+    fewer = _u_distribution(k, n - 1)     # largest value is in the n sample
+    counts[:len(fewer)] += fewer
+    return counts
+
+
+def mann_whitney_greater(recent, baseline):
+    """
+    One-sided Mann-Whitney U test per row: are the `recent` values stochastically larger than `baseline`?
+    :param recent: array (series, k), baseline: array (series, n); NaN marks missing runs
+    :return: (U statistic, exact p-value P(U_null >= U)); p is NaN when either sample is empty
+    """
+    r, b = recent[:, :, None], baseline[:, None, :]
+    u = np.sum(r > b, axis=(1, 2)) + 0.5 * np.sum(r == b, axis=(1, 2))
+    k = np.sum(~np.isnan(recent), axis=1)
+    n = np.sum(~np.isnan(baseline), axis=1)
+    p = np.full(len(u), np.nan)
+    for size in set(zip(k.tolist(), n.tolist())):
+        if 0 in size:
+            continue
+        rows = (k == size[0]) & (n == size[1])
+        counts = _u_distribution(*size)
+        tail = np.cumsum(counts[::-1])[::-1] / counts.sum()  # tail[i] = P(U >= i)
+        p[rows] = tail[np.floor(u[rows]).astype(int)]  # ties rounded down: conservative
+    return u, p
+
+
+def evaluate(matrix, recent=3, min_baseline=5, z_threshold=3.5, min_change=0.2, alpha=0.01):
+    """
+    Spike and shift checks for every row of a window_matrix() (column 0 = current run).
+    The baseline is every run older than the `recent` window.
+    :return: dict of arrays: current, baseline_median, baseline_mad, robust_z, change, recent_change,
+             mw_p, baseline_runs and status ("regression", "improvement", "ok", "insufficient")
+    """
+    current = matrix[:, 0]
+    window, baseline = matrix[:, :recent], matrix[:, recent:]
+    n = np.sum(~np.isnan(baseline), axis=1)
+    enough = n >= max(min_baseline, 1)
+    baseline = np.where(enough[:, None], baseline, np.nan)
+
+    with np.errstate(all="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows: series without a baseline
+        median = np.nanmedian(baseline, axis=1)
+        mad = MAD_TO_SIGMA * np.nanmedian(np.abs(baseline - median[:, None]), axis=1)
+        delta = current - median
+        # A constant baseline (MAD 0) makes any change infinitely many sigmas away; --min-change still applies
+        z = np.where(mad > 0, delta / mad, np.sign(delta) * np.inf)
+        z = np.where(delta == 0, 0.0, z)
+        scale = np.abs(median)
+        change = np.where(scale > 0, delta / scale, np.nan)
+        recent_change = np.where(scale > 0, (np.nanmedian(window, axis=1) - median) / scale, np.nan)
+    _, p = mann_whitney_greater(window, baseline)
+
+    spike = (z > z_threshold) & (change > min_change)
+    shift = (p < alpha) & (recent_change > min_change)
+    improved = (z < -z_threshold) & (change < -min_change)
+    status = np.where(~enough | np.isnan(current), "insufficient",
+                      np.where(spike | shift, "regression", np.where(improved, "improvement", "ok")))
+    return {"current": current, "baseline_median": median, "baseline_mad": mad, "robust_z": z,
+            "change": change, "recent_change": recent_change, "mw_p": p, "baseline_runs": n, "status": status}
+
+
+def check(history, metrics=GATED_METRICS, days=90, baseline_runs=20, recent=3, min_baseline=5,
+          z_threshold=3.5, min_change=0.2, alpha=0.01, max_age_hours=24, now=None):
+    """
+    Regression verdict over the history store.
+    :param max_age_hours: only judge series whose newest run is this recent (0 = all), so series
+                          that stopped being measured are not re-judged on every build
+    :return: dict with verdict ("regression" or "ok"), parameters, counts and one entry per judged series
+    """
+    from src.utils.history_store import TIMESTAMP_FORMAT
+    now = now or datetime.now()
+    frame = baseline_runs_only(load_history(history, metrics, days, now))
+    keys, matrix = window_matrix(frame, recent + baseline_runs)
+    if max_age_hours:
+        since = (now - timedelta(hours=max_age_hours)).strftime(TIMESTAMP_FORMAT)
+        fresh = (keys["timestamp"] >= since).to_numpy()
+        keys, matrix = keys[fresh].reset_index(drop=True), matrix[fresh]
+    results = evaluate(matrix, recent, min_baseline, z_threshold, min_change, alpha)
+
+    series = []
+    for i, key in enumerate(keys.itertuples(index=False)):
+        entry = {"suite": key.suite, "label": key.label, "metric": key.metric, "run_id": key.run_id,
+                 "timestamp": key.timestamp, "status": str(results["status"][i]),
+                 "baseline_runs": int(results["baseline_runs"][i])}
+        for name in ("current", "baseline_median", "baseline_mad", "robust_z", "change", "recent_change", "mw_p"):
+            value = float(results[name][i])
+            entry[name] = round(value, 4) if np.isfinite(value) else (None if np.isnan(value) else str(value))
+        series.append(entry)
+    statuses = [s["status"] for s in series]
+    return {
+        "verdict": "regression" if "regression" in statuses else "ok",
+        "generated_at": now.strftime(TIMESTAMP_FORMAT),
+        "parameters": {"days": days, "baseline_runs": baseline_runs, "recent": recent, "min_baseline": min_baseline,
+                       "z_threshold": z_threshold, "min_change": min_change, "alpha": alpha,
+                       "max_age_hours": max_age_hours},
+        "counts": {status: statuses.count(status) for status in ("regression", "improvement", "ok", "insufficient")},
+        "series": series,
+    }
+
+
+def flag_judged_runs(history, report, accept=False):
+    """
+    Record the verdict in the history store: with accept, every judged run is flagged "accepted"
+    (a new baseline); otherwise the runs of regressed series are flagged "regression".
+    :return: number of runs flagged
+    """
+    runs = {}
+    for s in report["series"]:
+        if accept or s["status"] == "regression":
+            runs.setdefault(s["suite"], set()).add((s["run_id"], s["label"]))
+    flag = "accepted" if accept else "regression"
+    return sum(history.flag_runs(suite, suite_runs, flag) for suite, suite_runs in runs.items())
+
+
+def format_report(report):
+    lines = [f"Performance regression gate: {report['verdict'].upper()} "
+             + ", ".join(f"{n} {status}" for status, n in report["counts"].items())]
+    for s in report["series"]:
+        if s["status"] in ("regression", "improvement"):
+            change = f"{s['change']:+.0%}" if isinstance(s["change"], float) else "n/a"
+            lines.append(f"  {s['status']:<11} {s['suite']}/{s['label'] or '-'}/{s['metric']}: "
+                         f"{s['current']} vs median {s['baseline_median']} ({change}, z={s['robust_z']}, "
+                         f"Mann-Whitney p={s['mw_p']}, {s['baseline_runs']} baseline runs)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    from src.utils.history_store import DEFAULT_PATH, HistoryStore
+
+    parser = argparse.ArgumentParser(description="Fail on performance regressions against the dashboard history")
+    parser.add_argument("--history-db", default=DEFAULT_PATH)
+    parser.add_argument("--suites", nargs="+", choices=sorted(GATED_METRICS), help="Default: all gated suites")
+    parser.add_argument("--days", type=int, default=90, help="History window read for baselines")
+    parser.add_argument("--baseline-runs", type=int, default=20, help="Runs before the recent window in the baseline")
+    parser.add_argument("--recent", type=int, default=3, help="Newest runs tested for a sustained shift")
+    parser.add_argument("--min-baseline", type=int, default=5, help="Fewer baseline runs: series not judged")
+    parser.add_argument("--z", type=float, default=3.5, help="Robust z-score of the current run that counts as a spike")
+    parser.add_argument("--min-change", type=float, default=0.2, help="Minimum relative slowdown (0.2 = 20%%)")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Mann-Whitney significance level")
+    parser.add_argument("--max-age-hours", type=float, default=24, help="Only judge series measured this recently")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Machine-readable verdict (JSON)")
+    parser.add_argument("--accept", action="store_true",
+                        help="Accept the current numbers as the new baseline instead of failing on them")
+    args = parser.parse_args(argv)
+
+    metrics = {suite: GATED_METRICS[suite] for suite in (args.suites or GATED_METRICS)}
+    with HistoryStore(args.history_db) as history:
+        report = check(history, metrics, args.days, args.baseline_runs, args.recent, args.min_baseline,
+                       args.z, args.min_change, args.alpha, args.max_age_hours)
+        flagged = flag_judged_runs(history, report, args.accept)
+    report["accepted"] = args.accept
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(format_report(report))
+    if args.accept:
+        print(f"Accepted {flagged} run(s) as the new baseline")
+    print(f"Verdict written to {args.output}")
+    return 1 if report["verdict"] == "regression" and not args.accept else 0
+
+
+if __name__ == "__main__":
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+# ---------- Streaming report parsers ----------
+# Robot output.xml and JUnit XML are read with iterparse. Every finished element is
+# cleared and detached from its parent, so memory use depends on how deeply the XML
+# nests, not on file size. For each test only the name, status, message and elapsed
+# time are kept.
+
+ROBOT_TIME_FORMAT = "%Y%m%d %H:%M:%S.%f"  # starttime/endtime before Robot 7
+JUNIT_OUTCOMES = {"failure": "failed", "error": "error", "skipped": "skipped"}
+
+
+def _stream(path):
+    """Yield (event, element, parent) and drop each element once its end event has been handled."""
+    stack = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            yield event, elem, stack[-2] if len(stack) > 1 else None
+            continue
+        stack.pop()
+        parent = stack[-1] if stack else None
+        yield event, elem, parent
+        elem.clear()
+        if parent is not None:
+            parent.remove(elem)  # the finished child is the parent's last one, so this is O(1)
+
+
+def _robot_elapsed(status):
+    if status.get("elapsed") is not None:
+        return float(status.get("elapsed"))
+    start, end = status.get("starttime"), status.get("endtime")
+    if not start or not end or "N/A" in (start, end):
+        return None
+    return (datetime.strptime(end, ROBOT_TIME_FORMAT) - datetime.strptime(start, ROBOT_TIME_FORMAT)).total_seconds()
+
+
+def iter_robot_tests(path):
+    """
+    Stream the tests of a Robot Framework output.xml (Robot 4-7 schemas).
+    :return: generator of dicts with name, suite (dotted suite path), status, message and elapsed_s
+    """
+    suites, test = [], None
+    for event, elem, parent in _stream(path):
+        if event == "start":
+            if elem.tag == "suite":
+                suites.append(elem.get("name", ""))
+            elif elem.tag == "test":
+                test = {"name": elem.get("name", "Unknown"), "suite": ".".join(suites),
+                        "status": "?", "message": "", "elapsed_s": None}
+        elif elem.tag == "status" and parent is not None and parent.tag == "test" and test is not None:
+            test.update(status=elem.get("status", "?"), message=(elem.text or "").strip(),
+                        elapsed_s=_robot_elapsed(elem))
+        elif elem.tag == "test" and test is not None:
+            yield test
+            test = None
+        elif elem.tag == "suite" and suites:
+            suites.pop()
+
+
+def parse_robot(path):
+    """
+    Robot results summary plus per-test details.
+    :return: (summary dict with total/pass/fail/skip, list of test dicts)
+    """
+    tests = list(iter_robot_tests(path))
+    summary = {"total": len(tests),
+               "pass": sum(t["status"] == "PASS" for t in tests),
+               "fail": sum(t["status"] == "FAIL" for t in tests),
+               "skip": sum(t["status"] in ("SKIP", "NOT RUN") for t in tests)}
+    return summary, tests
+
+
+def iter_junit(path):
+    """
+    Stream a JUnit XML file with any number of (nested) testsuite elements.
+    :return: generator of ("testcase", dict) with suite, classname, name, time_s, status
+             (passed/failed/error/skipped) and message, and ("testsuite", dict) with
+             the suite's name, attributes, testcase counts and whether it holds nested suites
+    """
+    suites, case = [], None
+    for event, elem, parent in _stream(path):
+        if event == "start":
+            if elem.tag == "testsuite":
+                if suites:
+                    suites[-1]["nested"] = True
+                suites.append({"name": elem.get("name", ""), "attrib": dict(elem.attrib), "nested": False,
+                               "tests": 0, "failures": 0, "errors": 0, "skipped": 0})
+            elif elem.tag == "testcase":
+                case = {"suite": suites[-1]["name"] if suites else "", "classname": elem.get("classname", ""),
+                        "name": elem.get("name", "Unknown"), "time_s": float(elem.get("time") or 0),
+                        "status": "passed", "message": ""}
+        elif elem.tag in JUNIT_OUTCOMES and parent is not None and parent.tag == "testcase" and case is not None:
+            # Keep the most severe outcome if a testcase reports several
+            if case["status"] in ("passed", "skipped"):
+                text = (elem.text or "").strip()
+                case.update(status=JUNIT_OUTCOMES[elem.tag],
+                            message=elem.get("message") or (text.splitlines()[0] if text else ""))
+        elif elem.tag == "testcase" and case is not None:
+            if suites:
+                counts = suites[-1]
+                counts["tests"] += 1
+                key = {"failed": "failures", "error": "errors", "skipped": "skipped"}.get(case["status"])
+                if key:
+                    counts[key] += 1
+            yield "testcase", case
+            case = None
+        elif elem.tag == "testsuite" and suites:
+            yield "testsuite", suites.pop()
+
+
+def parse_junit(path):
+    """
+    JUnit summary summed over every innermost testsuite (so nested totals are not counted
+    twice), plus the testcases. A suite's own tests/failures/errors/skipped attributes are
+    used when present, otherwise its testcases are counted.
+    :return: (summary dict with tests/failures/errors/skipped/suites, list of testcase dicts)
+    """
+    summary = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0, "suites": 0}
+    cases = []
+    for kind, item in iter_junit(path):
+        if kind == "testcase":
+            cases.append(item)
+        elif not item["nested"]:
+            summary["suites"] += 1
+            for key in ("tests", "failures", "errors", "skipped"):
+                value = item["attrib"].get(key)
+                summary[key] += int(value) if value not in (None, "") else item[key]
+    return summary, cases